@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Measure how many lines of subprocess output per second resmoke.py's LoggerPipe can log.
+
+Compares logging every line as a separate LogRecord with logging each chunk of output read from
+the pipe as a single batched LogRecord.
+"""
+
+import io
+import logging
+import optparse
+import os
+import sys
+import time
+
+# Get relative imports to work when the package is not installed on the PYTHONPATH.
+if __name__ == "__main__" and __package__ is None:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from buildscripts.resmokelib.core import pipe
+from buildscripts.resmokelib.logging import flush
+from buildscripts.resmokelib.logging import formatters
+from buildscripts.resmokelib.logging import handlers
+from buildscripts.resmokelib.logging import loggers
+
+_LOG_FORMAT = "[%(name)s] %(message)s"
+
+_SAMPLE_LINE = (b"2020-01-01T00:00:00.000+0000 D1 COMMAND  [conn1] run command test.$cmd"
+                b" { insert: \"coll\", ordered: true, lsid: { id: UUID(\"0\") }, $db: \"test\" }")
+
+
+class _DiscardingBufferedHandler(handlers.BufferedHandler):
+    """A BufferedHandler like the buildlogger handlers which discards the buffered records."""
+
+    def process_record(self, record):
+        return (record.created, self.format(record))
+
+    def process_batched_record(self, record):
+        return [(record.created, msg) for msg in self.format(record).split("\n")]
+
+    def _flush_buffer_with_lock(self, buf, close_called):
+        pass
+
+
+def _make_handler(handler_kind):
+    if handler_kind == "file":
+        handler = logging.FileHandler(os.devnull, mode="w")
+    else:
+        handler = _DiscardingBufferedHandler(capacity=2000, interval_secs=10)
+    handler.setFormatter(formatters.ISO8601Formatter(fmt=_LOG_FORMAT))
+    return handler
+
+
+def _run(logger_cls, handler_kind, output, num_lines):
+    """Return the number of lines per second logged by a LoggerPipe reading 'output'."""
+    logger = logger_cls("MongoDFixture:job0:primary")
+    logger.propagate = False
+    handler = _make_handler(handler_kind)
+    logger.addHandler(handler)
+
+    start = time.perf_counter()
+    logger_pipe = pipe.LoggerPipe(logger, logging.INFO, io.BufferedReader(io.BytesIO(output)))
+    logger_pipe.wait_until_started()
+    logger_pipe.wait_until_finished()
+    handler.close()
+    elapsed = time.perf_counter() - start
+
+    return num_lines / elapsed
+
+
+def main():
+    """Execute Main program."""
+    usage = "usage: %prog [options]"
+    parser = optparse.OptionParser(description=__doc__, usage=usage)
+    parser.add_option("-n", "--numLines", dest="num_lines", default=500000, type="int",
+                      help="The number of lines of output to log. Defaults to 500000.")
+    parser.add_option(
+        "--handler", dest="handler", default="file", type="choice", choices=("file", "buffered"),
+        help=("The kind of handler to log to. 'file' writes to {}, 'buffered' discards the records"
+              " buffered like the buildlogger handlers do. Defaults to 'file'.".format(
+                  os.devnull)))
+
+    (options, _) = parser.parse_args()
+
+    output = b"\n".join([_SAMPLE_LINE] * options.num_lines) + b"\n"
+
+    flush.start_thread()
+    try:
+        # logging.Logger doesn't define log_lines(), so the LoggerPipe logs every line separately.
+        per_line = _run(logging.Logger, options.handler, output, options.num_lines)
+        batched = _run(loggers.BaseLogger, options.handler, output, options.num_lines)
+    finally:
+        flush.stop_thread()
+
+    print("LogRecord per line:  {:12,.0f} lines/second".format(per_line))
+    print("LogRecord per chunk: {:12,.0f} lines/second".format(batched))
+    print("Speedup:             {:12.2f}x".format(batched / per_line))
+
+
+if __name__ == "__main__":
+    main()
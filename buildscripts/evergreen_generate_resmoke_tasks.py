@@ -34,6 +34,7 @@ if __name__ == "__main__" and __package__ is None:
 
 import buildscripts.resmokelib.parser as _parser  # pylint: disable=wrong-import-position
 import buildscripts.resmokelib.suitesconfig as suitesconfig  # pylint: disable=wrong-import-position
+import buildscripts.resmokelib.testing.runtimes as runtimes  # pylint: disable=wrong-import-position
 import buildscripts.util.read_config as read_config  # pylint: disable=wrong-import-position
 import buildscripts.util.taskname as taskname  # pylint: disable=wrong-import-position
 import buildscripts.util.teststats as teststats  # pylint: disable=wrong-import-position
@@ -730,8 +731,12 @@ class GenerateSubSuites(object):
     def calculate_suites(self, start_date, end_date):
         """Divide tests into suites based on statistics for the provided period."""
         try:
-            evg_stats = self.get_evg_stats(self.config_options.project, start_date, end_date,
-                                           self.config_options.task, self.config_options.variant)
+            if self.config_options.runtime_history_dir:
+                evg_stats = self.get_local_stats(self.config_options.runtime_history_dir)
+            else:
+                evg_stats = self.get_evg_stats(self.config_options.project, start_date, end_date,
+                                               self.config_options.task,
+                                               self.config_options.variant)
             if not evg_stats:
                 LOGGER.debug("No test history, using fallback suites")
                 # This is probably a new suite, since there is no test history, just use the
@@ -759,6 +764,11 @@ class GenerateSubSuites(object):
             before_date=end_date.strftime("%Y-%m-%d"), tasks=[task], variants=[variant],
             group_by="test", group_num_days=days)
 
+    def get_local_stats(self, runtime_history_dir):
+        """Collect test execution statistics from the history written by resmoke.py."""
+        history = runtimes.RuntimeHistory(runtime_history_dir)
+        return history.as_test_stats(self.config_options.suite)
+
     def calculate_suites_from_evg_stats(self, data, execution_time_secs):
         """Divide tests into suites that can be run in less than the specified execution time."""
         test_stats = teststats.TestStats(data)
@@ -47,9 +47,11 @@ class Resmoke(object):  # pylint: disable=too-many-instance-attributes
         self._exec_logger = None
         self._resmoke_logger = None
         self._archive = None
+        self._fixture_pool = None
         self._jasper_server = None
         self._interrupted = False
         self._exit_code = 0
+        self._failed_tests = None
 
     def configure_from_command_line(self):
         """Configure this instance using the command line arguments."""
@@ -79,8 +81,13 @@ class Resmoke(object):  # pylint: disable=too-many-instance-attributes
 
         if logging.buildlogger.is_log_output_incomplete():
             self._exit_on_incomplete_logging()
+        elif logging.spill.STATS.bytes_spilled:
+            self._resmoke_logger.info("Log output to logkeeper was delayed: %s.",
+                                      logging.spill.STATS)
 
     def _exit_on_incomplete_logging(self):
+        self._resmoke_logger.info("Log output to logkeeper: %s.", logging.spill.STATS)
+
         if self._exit_code == 0:
             # We don't anticipate users to look at passing Evergreen tasks very often that even if
             # the log output is incomplete, we'd still rather not show anything in the Evergreen UI
@@ -147,6 +154,7 @@ class Resmoke(object):  # pylint: disable=too-many-instance-attributes
         suites = self._get_suites()
         for suite in suites:
             self._shuffle_tests(suite)
+            self._rerun_failed_tests_first(suite)
             sb = ["Tests that would be run in suite {}".format(suite.get_display_name())]
             sb.extend(suite.tests or ["(no tests)"])
             sb.append("Tests that would be excluded from suite {}".format(suite.get_display_name()))
@@ -166,9 +174,14 @@ class Resmoke(object):  # pylint: disable=too-many-instance-attributes
         suites = None
         try:
             suites = self._get_suites()
+            # The failed tests must be loaded before the results of this invocation are streamed
+            # since --rerunFailedFrom may be the stream file of an earlier invocation.
+            self._load_failed_tests()
+            reportfile.open_stream()
             self._setup_archival()
             if config.SPAWN_USING == "jasper":
                 self._setup_jasper()
+            self._setup_fixture_pool()
             self._setup_signal_handler(suites)
 
             for suite in suites:
@@ -183,11 +196,13 @@ class Resmoke(object):  # pylint: disable=too-many-instance-attributes
             exit_code = max(suite.return_code for suite in suites)
             self.exit(exit_code)
         finally:
+            self._exit_fixture_pool()
             if config.SPAWN_USING == "jasper":
                 self._exit_jasper()
             self._exit_archival()
             if suites:
                 reportfile.write(suites)
+            reportfile.close_stream()
 
     def _run_suite(self, suite):
         """Run a test suite."""
@@ -213,6 +228,7 @@ class Resmoke(object):  # pylint: disable=too-many-instance-attributes
     def _execute_suite(self, suite):
         """Execute a suite and return True if interrupted, False otherwise."""
         self._shuffle_tests(suite)
+        self._rerun_failed_tests_first(suite)
         if not suite.tests:
             self._exec_logger.info("Skipping %s, no tests to run", suite.test_kind)
             suite.return_code = 0
@@ -220,7 +236,8 @@ class Resmoke(object):  # pylint: disable=too-many-instance-attributes
         executor_config = suite.get_executor_config()
         try:
             executor = testing.executor.TestSuiteExecutor(
-                self._exec_logger, suite, archive_instance=self._archive, **executor_config)
+                self._exec_logger, suite, archive_instance=self._archive,
+                fixture_pool=self._fixture_pool, **executor_config)
             executor.run()
         except (errors.UserInterrupt, errors.LoggerRuntimeConfigError) as err:
             self._exec_logger.error("Encountered an error when running %ss of suite %s: %s",
@@ -246,6 +263,26 @@ class Resmoke(object):  # pylint: disable=too-many-instance-attributes
                                suite.test_kind, suite.get_display_name(), config.RANDOM_SEED)
         random.shuffle(suite.tests)
 
+    def _rerun_failed_tests_first(self, suite):
+        """Move the tests which failed in the --rerunFailedFrom report to the front of the suite.
+
+        The other tests are removed from the suite unless --rerunRemaining was specified.
+        """
+        if config.RERUN_FAILED_FROM is None:
+            return
+
+        self._load_failed_tests()
+        (suite.tests, num_failed) = reportfile.order_failed_tests_first(
+            suite.tests, self._failed_tests, config.RERUN_REMAINING)
+        self._exec_logger.info("Running %d %s(s) of suite %s which failed in %s first.",
+                               num_failed, suite.test_kind, suite.get_display_name(),
+                               config.RERUN_FAILED_FROM)
+
+    def _load_failed_tests(self):
+        """Load the tests which failed in the --rerunFailedFrom report if they aren't loaded yet."""
+        if config.RERUN_FAILED_FROM is not None and self._failed_tests is None:
+            self._failed_tests = reportfile.load_failed_tests(config.RERUN_FAILED_FROM)
+
     def _get_suites(self):
         """Return the list of suites for this resmoke invocation."""
         try:
@@ -288,6 +325,16 @@ class Resmoke(object):  # pylint: disable=too-many-instance-attributes
         if self._archive and not self._interrupted:
             self._archive.exit()
 
+    def _setup_fixture_pool(self):
+        """Set up the pool of fixtures shared by the suites if enabled in the cli options."""
+        if config.REUSE_FIXTURES:
+            self._fixture_pool = testing.fixtures.FixturePool(self._exec_logger)
+
+    def _exit_fixture_pool(self):
+        """Tear down the fixtures that are still pooled once all of the suites have run."""
+        if self._fixture_pool and not self._fixture_pool.teardown_all():
+            self._exec_logger.error("Teardown of the pooled fixtures was not successful")
+
     # pylint: disable=too-many-instance-attributes,too-many-statements,too-many-locals
     def _setup_jasper(self):
         """Start up the jasper process manager."""
@@ -45,6 +45,7 @@ DEFAULT_GENNY_EXECUTABLE = os.path.normpath("genny/build/src/driver/genny")
 
 # Names below correspond to how they are specified via the command line or in the options YAML file.
 DEFAULTS = {
+    "adaptive_jobs": False,
     "always_use_log_files": False,
     "is_asan_build": False,
     "archive_file": None,
@@ -57,12 +58,14 @@ DEFAULTS = {
     "dbtest_executable": None,
     "dry_run": None,
     "exclude_with_any_tags": None,
+    "fixture_snapshot_dir": None,
     "flow_control": None,
     "flow_control_tickets": None,
     "genny_executable": None,
     "include_with_any_tags": None,
     "install_dir": None,
     "jobs": 1,
+    "min_jobs": 1,
     "log_format": None,
     "mongo_executable": None,
     "mongod_executable": None,
@@ -71,6 +74,8 @@ DEFAULTS = {
     "mongos_set_parameters": None,
     "no_journal": False,
     "num_clients_per_fixture": 1,
+    "num_clients_started_using": "threads",
+    "client_startup_stagger_ms": 50,
     "perf_report_file": None,
     "repeat_suites": 1,
     "repeat_tests": 1,
@@ -79,6 +84,12 @@ DEFAULTS = {
     "repeat_tests_secs": None,
     "report_failure_status": "fail",
     "report_file": None,
+    "rerun_failed_from": None,
+    "rerun_remaining": False,
+    "result_cache_dir": None,
+    "reuse_fixtures": False,
+    "runtime_history_dir": None,
+    "schedule_by_resources": False,
     "seed": int(time.time() * 256),  # Taken from random.py code in Python 2.7.
     "service_executor": None,
     "shell_conn_string": None,
@@ -92,6 +103,8 @@ DEFAULTS = {
     "storage_engine": None,
     "storage_engine_cache_size_gb": None,
     "tag_file": None,
+    "tag_index_file": None,
+    "test_runtimes_file": None,
     "transport_layer": None,
     "mixed_bin_versions": None,
     "linear_chain": None,
@@ -221,6 +234,10 @@ SuiteOptions.ALL_INHERITED = SuiteOptions(  # type: ignore
 # Variables that are set by the user at the command line or with --options.
 ##
 
+# If true, then the number of tests running at the same time is raised or lowered between MIN_JOBS
+# and the number of jobs based on the load average, free memory, and iowait of the machine.
+ADAPTIVE_JOBS = None
+
 # Log to files located in the db path and don't clean dbpaths after tests.
 ALWAYS_USE_LOG_FILES = False
 
@@ -299,6 +316,10 @@ EXCLUDED_TAG = "__TEMPORARILY_DISABLED__"
 # If true, then a test failure or error will cause resmoke.py to exit and not run any more tests.
 FAIL_FAST = None
 
+# If set, then a copy of the data files of each freshly initiated replica set fixture is saved in
+# the specified directory and restored whenever the fixture is set up again.
+FIXTURE_SNAPSHOT_DIR = None
+
 # Executable file for genny, passed in as a command line arg.
 GENNY_EXECUTABLE = None
 
@@ -309,6 +330,10 @@ INCLUDE_WITH_ANY_TAGS = None
 # If set, then resmoke.py starts the specified number of Job instances to run tests.
 JOBS = None
 
+# The number of tests that are allowed to run at the same time however loaded the machine is when
+# ADAPTIVE_JOBS is true.
+MIN_JOBS = None
+
 # Where to find the MONGO*_EXECUTABLE binaries
 INSTALL_DIR = None
 
@@ -338,6 +363,14 @@ NO_JOURNAL = None
 # If set, then each fixture runs tests with the specified number of clients.
 NUM_CLIENTS_PER_FIXTURE = None
 
+# If "threads", then each of the clients running a test is started and waited on by a thread of its
+# own. If "supervisor", then the thread running the test starts and waits on all of the clients.
+NUM_CLIENTS_STARTED_USING = None
+
+# The number of milliseconds to wait between starting each of the clients running a test when
+# NUM_CLIENTS_STARTED_USING is "supervisor".
+CLIENT_STARTUP_STAGGER_MS = None
+
 # Report file for the Evergreen performance plugin.
 PERF_REPORT_FILE = None
 
@@ -368,6 +401,34 @@ REPORT_FAILURE_STATUS = None
 # If set, then resmoke.py will write out a report file with the status of each test that ran.
 REPORT_FILE = None
 
+# If true, then fixtures are kept running after a suite finishes and are reused, after dropping
+# their databases, by later suites with the same fixture configuration.
+REUSE_FIXTURES = None
+
+# If set, then only the tests which failed or were interrupted in the specified report.json file are
+# run, before any other tests.
+RERUN_FAILED_FROM = None
+
+# If true, then the tests which didn't fail in the RERUN_FAILED_FROM report.json file are run after
+# the ones which did.
+RERUN_REMAINING = None
+
+# If set, then the outcome of each test is recorded in the specified directory after each suite
+# runs, keyed by the contents of the test, the files it loads, the suite configuration, and the
+# binaries. Tests whose last recorded outcome for the same key was a pass are reported as cached
+# instead of being run.
+RESULT_CACHE_DIR = None
+
+# If set, then the runtime of each test is appended to a history file in the specified directory
+# after each suite runs. The history is also used to queue the longest running tests first when
+# TEST_RUNTIMES_FILE isn't set.
+RUNTIME_HISTORY_DIR = None
+
+# If true, then each test waits to start until the resource units it is expected to use, based on
+# its tags, are available on the machine. The number of jobs is then only an upper bound on the
+# number of tests running at the same time.
+SCHEDULE_BY_RESOURCES = None
+
 # IF set, then mongod/mongos's started by resmoke.py will use the specified service executor
 SERVICE_EXECUTOR = None
 
@@ -385,8 +446,9 @@ SHELL_WRITE_MODE = None
 # alphabetical (case-insensitive) order.
 SHUFFLE = None
 
-# Possible values are python and jasper. If python, resmoke uses the python built-in subprocess
-# or subprocess32 module to spawn threads. If jasper, resmoke uses the jasper module.
+# Possible values are python, jasper, and selectors. If python, resmoke uses the python built-in
+# subprocess or subprocess32 module to spawn threads. If jasper, resmoke uses the jasper module. If
+# selectors, resmoke spawns processes like python but reads their output on a single thread.
 SPAWN_USING = None
 
 # If true, the launching of jobs is staggered in resmoke.py.
@@ -425,6 +487,15 @@ STORAGE_ENGINE_CACHE_SIZE = None
 # The tag file to use that associates tests with tags.
 TAG_FILE = None
 
+# If set, then the tags parsed from the comments of JavaScript test files are saved to and loaded
+# from the specified JSON file so that a file is only parsed again once its size or modification
+# time changes.
+TAG_INDEX_FILE = None
+
+# If set, then tests are queued in order of decreasing historical runtime, as read from the
+# specified JSON file, so that the longest running tests don't end up at the tail of the suite.
+TEST_RUNTIMES_FILE = None
+
 # If set, then mongod/mongos's started by resmoke.py will use the specified transport layer.
 TRANSPORT_LAYER = None
 
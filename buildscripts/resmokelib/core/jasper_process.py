@@ -50,6 +50,10 @@ class Process(_process.Process):
         self._id = self.jasper_pb2.JasperProcessID(value=val.id)
         self._return_code = None
 
+    def watch_output(self, regex):
+        """Return None because the output of the process is handled by the Jasper service."""
+        return None
+
     def stop(self, mode=None):
         """Terminate the process."""
 
@@ -2,6 +2,8 @@
 
 import collections
 import functools
+import os
+import socket
 import threading
 
 from .. import config
@@ -31,6 +33,25 @@ def _check_port(func):
     return wrapper
 
 
+def _is_port_available(port):
+    """Return true if a socket can be bound to 'port', i.e. no other process is listening on it.
+
+    SO_REUSEADDR is set like mongod and mongos do, so that a port with connections left in the
+    TIME_WAIT state by a process which exited counts as available. It isn't set on Windows because
+    it allows binding to a port another socket is listening on there.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        if os.name != "nt":
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(("", port))
+    except OSError:
+        return False
+    finally:
+        sock.close()
+    return True
+
+
 class PortAllocator(object):
     """Class responsible for allocating ranges of ports.
 
@@ -38,46 +59,67 @@ class PortAllocator(object):
     that range used for the fixture started by that job, and the second
     part of the range used for mongod and mongos processes started by
     tests run by that job.
+
+    The size of the ranges is chosen by reset() from the number of jobs
+    and the number of ports the fixtures need. Ports which another
+    process is already listening on aren't handed out to fixtures.
     """
 
     # A PortAllocator will not return any port greater than this number.
     MAX_PORT = 2**16 - 1
 
     # Each job gets a contiguous range of _PORTS_PER_JOB ports, with job 0 getting the first block
-    # of ports, job 1 getting the second block, and so on.
+    # of ports, job 1 getting the second block, and so on. The range is made smaller when there
+    # isn't room for that many ports for every job.
     _PORTS_PER_JOB = 250
 
     # The first _PORTS_PER_FIXTURE ports of each range are reserved for the fixtures, the remainder
-    # of the port range is used by tests.
+    # of the port range is used by tests. More ports are reserved for fixtures with a topology which
+    # needs them.
     _PORTS_PER_FIXTURE = 20
 
+    # The number of ports reserved for a fixture in addition to the ports its topology needs, so
+    # that some of them can be skipped for being in use by another process.
+    _SPARE_FIXTURE_PORTS = 10
+
+    # The fewest ports reserved for tests when the range of each job is made smaller.
+    _MIN_TEST_PORTS = 50
+
     _NUM_USED_PORTS_LOCK = threading.Lock()
 
     # Used to keep track of how many ports a fixture has allocated.
     _NUM_USED_PORTS = collections.defaultdict(int)  # type: ignore
 
+    # The sizes of the ranges reserved by the last call to reset().
+    _ports_per_job = _PORTS_PER_JOB
+    _ports_per_fixture = _PORTS_PER_FIXTURE
+
     @classmethod
     @_check_port
     def next_fixture_port(cls, job_num):
         """Return the next port for a fixture to use.
 
+        Ports which another process is listening on are skipped.
+
         Raises a PortAllocationError if the fixture has requested more
         ports than are reserved per job, or if the next port is not a
         valid port number.
         """
         with cls._NUM_USED_PORTS_LOCK:
-            start_port = config.BASE_PORT + (job_num * cls._PORTS_PER_JOB)
-            num_used_ports = cls._NUM_USED_PORTS[job_num]
-            next_port = start_port + num_used_ports
+            start_port = config.BASE_PORT + (job_num * cls._ports_per_job)
+            while True:
+                num_used_ports = cls._NUM_USED_PORTS[job_num]
+                next_port = start_port + num_used_ports
 
-            cls._NUM_USED_PORTS[job_num] += 1
+                cls._NUM_USED_PORTS[job_num] += 1
 
-            if next_port >= start_port + cls._PORTS_PER_FIXTURE:
-                raise errors.PortAllocationError(
-                    "Fixture has requested more than the %d ports reserved per fixture" %
-                    cls._PORTS_PER_FIXTURE)
+                if next_port >= start_port + cls._ports_per_fixture:
+                    raise errors.PortAllocationError(
+                        "Fixture has requested more than the %d ports reserved per fixture" %
+                        cls._ports_per_fixture)
 
-            return next_port
+                if next_port > cls.MAX_PORT or _is_port_available(next_port):
+                    return next_port
 
     @classmethod
     @_check_port
@@ -87,7 +129,7 @@ class PortAllocator(object):
         Raises a PortAllocationError if that port is higher than the
         maximum port.
         """
-        return config.BASE_PORT + (job_num * cls._PORTS_PER_JOB) + cls._PORTS_PER_FIXTURE
+        return config.BASE_PORT + (job_num * cls._ports_per_job) + cls._ports_per_fixture
 
     @classmethod
     @_check_port
@@ -97,16 +139,38 @@ class PortAllocator(object):
         Raises a PortAllocationError if that port is higher than the
         maximum port.
         """
-        next_range_start = config.BASE_PORT + ((job_num + 1) * cls._PORTS_PER_JOB)
+        next_range_start = config.BASE_PORT + ((job_num + 1) * cls._ports_per_job)
         return next_range_start - 1
 
     @classmethod
-    def reset(cls):
+    def reset(cls, num_jobs=None, num_fixture_ports=None):
         """Reset the internal state of the PortAllocator.
 
         This method is intended to be called each time resmoke.py starts
-        a new test suite.
+        a new test suite. If 'num_fixture_ports' is specified, then the
+        part of each range reserved for the fixture is made large enough
+        for a fixture needing that many ports. If 'num_jobs' is
+        specified, then the range of each job is made smaller if needed
+        so that every job's range fits below MAX_PORT.
+
+        Raises a PortAllocationError if the ranges can't fit.
         """
 
+        ports_per_fixture = cls._PORTS_PER_FIXTURE
+        if num_fixture_ports is not None:
+            ports_per_fixture = max(ports_per_fixture, num_fixture_ports + cls._SPARE_FIXTURE_PORTS)
+        ports_per_job = ports_per_fixture + cls._PORTS_PER_JOB - cls._PORTS_PER_FIXTURE
+
+        if num_jobs is not None and num_jobs > 0:
+            num_available_ports = cls.MAX_PORT + 1 - config.BASE_PORT
+            ports_per_job = min(ports_per_job, num_available_ports // num_jobs)
+            if ports_per_job < ports_per_fixture + cls._MIN_TEST_PORTS:
+                raise errors.PortAllocationError(
+                    "There aren't enough ports above %d for %d jobs using %d ports each. Consider"
+                    " decreasing the number of jobs, or using a lower base port" %
+                    (config.BASE_PORT, num_jobs, ports_per_fixture + cls._MIN_TEST_PORTS))
+
         with cls._NUM_USED_PORTS_LOCK:
             cls._NUM_USED_PORTS = collections.defaultdict(int)
+            cls._ports_per_job = ports_per_job
+            cls._ports_per_fixture = ports_per_fixture
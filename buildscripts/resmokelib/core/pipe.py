@@ -5,10 +5,89 @@ Used to avoid deadlocks from the pipe buffer filling up and blocking the subproc
 being waited on.
 """
 
+import functools
+import os
+import selectors
 import threading
 
+# The number of bytes to read from a pipe at once.
+READ_SIZE = 64 * 1024
 
-class LoggerPipe(threading.Thread):  # pylint: disable=too-many-instance-attributes
+
+def _decode_output(data):
+    """Return the bytestring 'data' read from the output of a subprocess as a string."""
+    # Replace null bytes in the output of the subprocess with a literal backslash ('\') followed by
+    # a literal zero ('0') so tools like grep don't treat resmoke.py's output as binary data.
+    data = data.replace(b"\0", b"\\0")
+
+    # Convert the output of the process from a bytestring to a UTF-8 string, and replace any
+    # characters that cannot be decoded with the official Unicode replacement character, U+FFFD.
+    # The log messages of MongoDB processes are not always valid UTF-8 sequences. See SERVER-7506.
+    return data.decode("utf-8", "replace")
+
+
+class _OutputLogger(object):
+    """Splits chunks of the output of a subprocess into lines and sends them to a logger.
+
+    Loggers that define a log_lines() method, such as loggers.BaseLogger, receive all of the lines
+    of a chunk at once rather than each of them as a separate LogRecord.
+    """
+
+    def __init__(self, logger, level, watches):
+        """Initialize the _OutputLogger."""
+        self._logger = logger
+        self._level = level
+        self._watches = list(watches) if watches is not None else []
+
+        # The end of the output which hasn't been terminated by a newline yet.
+        self._partial_line = b""
+
+    def handle_output(self, data):
+        """Log each complete line of the output read so far."""
+        data = self._partial_line + data
+        end = data.rfind(b"\n")
+        if end == -1:
+            self._partial_line = data
+            return
+
+        self._partial_line = data[end + 1:]
+        self._log_lines(data[:end])
+
+    def handle_eof(self):
+        """Log the last line of the output."""
+        if self._partial_line:
+            self._log_lines(self._partial_line)
+            self._partial_line = b""
+
+        # Wake up anyone still waiting on a line which will now never be logged.
+        for (_, event) in self._watches:
+            event.set()
+
+    def _log_lines(self, data):
+        lines = [line.rstrip() for line in _decode_output(data).split("\n")]
+
+        log_lines = getattr(self._logger, "log_lines", None)
+        if log_lines is not None:
+            log_lines(self._level, lines)
+        else:
+            for line in lines:
+                self._logger.log(self._level, line)
+
+        if self._watches:
+            self._check_watches(lines)
+
+    def _check_watches(self, lines):
+        """Set the events of the watches matching any of 'lines' and stop checking them."""
+        remaining = []
+        for (regex, event) in self._watches:
+            if any(regex.search(line) for line in lines):
+                event.set()
+            else:
+                remaining.append((regex, event))
+        self._watches = remaining
+
+
+class LoggerPipe(threading.Thread):
     """Asynchronously reads the output of a subprocess and sends it to a logger."""
 
     # The start() and join() methods are not intended to be called directly on the LoggerPipe
@@ -16,16 +95,19 @@ class LoggerPipe(threading.Thread):  # pylint: disable=too-many-instance-attribu
     __start = threading.Thread.start
     __join = threading.Thread.join
 
-    def __init__(self, logger, level, pipe_out):
-        """Initialize the LoggerPipe with the specified arguments."""
+    def __init__(self, logger, level, pipe_out, watches=None):
+        """Initialize the LoggerPipe with the specified arguments.
+
+        'watches' is an optional list of (compiled regex, threading.Event) pairs. Each event is set
+        once a line matching its regex is read, or once all of the output has been read.
+        """
 
         threading.Thread.__init__(self)
         # Main thread should not call join() when exiting
         self.daemon = True
 
-        self.__logger = logger
-        self.__level = level
         self.__pipe_out = pipe_out
+        self.__output_logger = _OutputLogger(logger, level, watches)
 
         self.__lock = threading.Lock()
         self.__condition = threading.Condition(self.__lock)
@@ -48,19 +130,11 @@ class LoggerPipe(threading.Thread):  # pylint: disable=too-many-instance-attribu
 
         # Close the pipe when finished reading all of the output.
         with self.__pipe_out:
-            # Avoid buffering the output from the pipe.
-            for line in iter(self.__pipe_out.readline, b""):
-                # Replace null bytes in the output of the subprocess with a literal backslash ('\')
-                # followed by a literal zero ('0') so tools like grep don't treat resmoke.py's
-                # output as binary data.
-                line = line.replace(b"\0", b"\\0")
-
-                # Convert the output of the process from a bytestring to a UTF-8 string, and replace
-                # any characters that cannot be decoded with the official Unicode replacement
-                # character, U+FFFD. The log messages of MongoDB processes are not always valid
-                # UTF-8 sequences. See SERVER-7506.
-                line = line.decode("utf-8", "replace")
-                self.__logger.log(self.__level, line.rstrip())
+            # Read whatever output is available rather than a line at a time so that lines written
+            # together are logged together.
+            for data in iter(functools.partial(self.__pipe_out.read1, READ_SIZE), b""):
+                self.__output_logger.handle_output(data)
+            self.__output_logger.handle_eof()
 
         with self.__lock:
             self.__finished = True
@@ -85,3 +159,121 @@ class LoggerPipe(threading.Thread):  # pylint: disable=too-many-instance-attribu
         # No need to pass a timeout to join() because the thread should already be done after
         # notifying us it has finished reading output from the pipe.
         LoggerPipe.__join(self)  # Tidy up the started thread.
+
+
+class PipeMultiplexer(object):
+    """Reads the output of many subprocesses on a single thread and sends it to their loggers.
+
+    This avoids starting two LoggerPipe threads for every subprocess. It relies on the selectors
+    module supporting pipes, which isn't the case on Windows.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """Return the PipeMultiplexer shared by all MultiplexedPipe instances."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self):
+        """Initialize the PipeMultiplexer and start its thread."""
+        self._selector = selectors.DefaultSelector()
+        self._lock = threading.Lock()
+        self._pending = []
+
+        # Writing to this pipe interrupts the select() call so that newly added pipes are
+        # registered from the multiplexer's thread.
+        (self._wakeup_read_fd, self._wakeup_write_fd) = os.pipe()
+        self._selector.register(self._wakeup_read_fd, selectors.EVENT_READ)
+
+        self._thread = threading.Thread(target=self._run, name="PipeMultiplexer")
+        # Main thread should not call join() when exiting
+        self._thread.daemon = True
+        self._thread.start()
+
+    def add(self, pipe):
+        """Start reading the output of the MultiplexedPipe 'pipe'."""
+        with self._lock:
+            self._pending.append(pipe)
+        os.write(self._wakeup_write_fd, b"\0")
+
+    def _run(self):
+        while True:
+            for (key, _) in self._selector.select():
+                if key.data is None:
+                    os.read(self._wakeup_read_fd, READ_SIZE)
+                    self._register_pending()
+                else:
+                    self._read(key.data)
+
+    def _register_pending(self):
+        with self._lock:
+            (pending, self._pending) = (self._pending, [])
+
+        for pipe in pending:
+            self._selector.register(pipe.fileno(), selectors.EVENT_READ, data=pipe)
+
+    def _read(self, pipe):
+        try:
+            data = os.read(pipe.fileno(), READ_SIZE)
+            if data:
+                pipe.handle_output(data)
+                return
+        except Exception as err:  # pylint: disable=broad-except
+            # Stop reading from the pipe rather than stopping the thread, which would leave the
+            # output of every other subprocess unread.
+            pipe.handle_error(err)
+
+        self._selector.unregister(pipe.fileno())
+        pipe.handle_eof()
+
+
+class MultiplexedPipe(object):
+    """Reads the output of a subprocess on the PipeMultiplexer thread and sends it to a logger.
+
+    It is a drop-in replacement for LoggerPipe which doesn't need a thread of its own.
+    """
+
+    def __init__(self, logger, level, pipe_out, watches=None, multiplexer=None):
+        """Initialize the MultiplexedPipe with the specified arguments.
+
+        'watches' is an optional list of (compiled regex, threading.Event) pairs. Each event is set
+        once a line matching its regex is read, or once all of the output has been read.
+        """
+        self._logger = logger
+        self._pipe_out = pipe_out
+        self._output_logger = _OutputLogger(logger, level, watches)
+        self._finished = threading.Event()
+
+        if multiplexer is None:
+            multiplexer = PipeMultiplexer.get_instance()
+        multiplexer.add(self)
+
+    def fileno(self):
+        """Return the file descriptor of the pipe."""
+        return self._pipe_out.fileno()
+
+    def handle_output(self, data):
+        """Log each complete line of the output read so far."""
+        self._output_logger.handle_output(data)
+
+    def handle_error(self, err):
+        """Log the error that occurred when reading from the pipe."""
+        self._logger.error("Failed to read the output of the process: %s", err)
+
+    def handle_eof(self):
+        """Log the last line of the output and close the pipe."""
+        self._pipe_out.close()
+        self._output_logger.handle_eof()
+        self._finished.set()
+
+    def wait_until_started(self):
+        """Return immediately because the output is read as soon as the pipe is created."""
+
+    def wait_until_finished(self):
+        """Wait until all of the output has been read."""
+        self._finished.wait()
@@ -90,6 +90,7 @@ class Process(object):
         self._process = None
         self._stdout_pipe = None
         self._stderr_pipe = None
+        self._stdout_watches = []
 
     def start(self):
         """Start the process and the logger pipes for its stdout and stderr."""
@@ -115,8 +116,9 @@ class Process(object):
                                              env=self.env, creationflags=creation_flags)
             self.pid = self._process.pid
 
-        self._stdout_pipe = pipe.LoggerPipe(self.logger, logging.INFO, self._process.stdout)
-        self._stderr_pipe = pipe.LoggerPipe(self.logger, logging.ERROR, self._process.stderr)
+        self._stdout_pipe = self._make_logger_pipe(logging.INFO, self._process.stdout,
+                                                   watches=self._stdout_watches)
+        self._stderr_pipe = self._make_logger_pipe(logging.ERROR, self._process.stderr)
 
         self._stdout_pipe.wait_until_started()
         self._stderr_pipe.wait_until_started()
@@ -132,6 +134,21 @@ class Process(object):
                 if return_code == win32con.STILL_ACTIVE:
                     raise
 
+    def _make_logger_pipe(self, level, pipe_out, watches=None):
+        """Return a LoggerPipe that sends the output read from 'pipe_out' to the logger."""
+        return pipe.LoggerPipe(self.logger, level, pipe_out, watches=watches)
+
+    def watch_output(self, regex):
+        """Return a threading.Event that is set once the process writes a line matching 'regex'.
+
+        The event is also set if the process closes its stdout without writing such a line. This
+        method must be called before start(). None is returned if the output of the process isn't
+        visible to resmoke.py.
+        """
+        event = threading.Event()
+        self._stdout_watches.append((regex, event))
+        return event
+
     def stop(self, mode=None):  # pylint: disable=too-many-branches
         """Terminate the process."""
         if mode is None:
@@ -11,6 +11,7 @@ import sys
 
 from . import jasper_process
 from . import process
+from . import selector_process
 from .. import config
 from .. import utils
 
@@ -45,6 +46,8 @@ def make_process(*args, **kwargs):
     process_cls = process.Process
     if config.SPAWN_USING == "jasper":
         process_cls = jasper_process.Process
+    elif config.SPAWN_USING == "selectors":
+        process_cls = selector_process.Process
 
     # Add the current working directory and /data/multiversion to the PATH.
     env_vars = kwargs.get("env_vars", {}).copy()
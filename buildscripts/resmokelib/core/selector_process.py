@@ -0,0 +1,20 @@
+"""A process management system that reads the output of every process on a single thread.
+
+Serves as an alternative to process.py.
+"""
+
+import sys
+
+from . import pipe
+from . import process as _process
+
+
+class Process(_process.Process):
+    """Class for spawning a process whose output is read by the shared PipeMultiplexer."""
+
+    def _make_logger_pipe(self, level, pipe_out, watches=None):
+        """Return a MultiplexedPipe that sends the output read from 'pipe_out' to the logger."""
+        # The selectors module only supports sockets on Windows.
+        if sys.platform == "win32":
+            return _process.Process._make_logger_pipe(self, level, pipe_out, watches=watches)
+        return pipe.MultiplexedPipe(self.logger, level, pipe_out, watches=watches)
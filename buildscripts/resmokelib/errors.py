@@ -46,8 +46,9 @@ class ServerFailure(TestFailure):  # noqa: D204
 class PortAllocationError(ResmokeError):  # noqa: D204
     """Exception that is raised by the PortAllocator.
 
-    Raised if a port is requested outside of the range of valid ports, or if a
-    fixture requests more ports than were reserved for that job.
+    Raised if a port is requested outside of the range of valid ports, if a
+    fixture requests more ports than were reserved for that job, or if there
+    isn't room for the ports of every job.
     """
     pass
 
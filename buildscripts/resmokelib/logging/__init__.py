@@ -7,3 +7,4 @@ from logging import Logger
 from . import buildlogger
 from . import flush
 from . import loggers
+from . import spill
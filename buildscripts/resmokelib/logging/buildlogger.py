@@ -3,11 +3,13 @@
 import functools
 import json
 import os
+import queue
 import threading
 
 import requests
 
 from . import handlers
+from . import spill
 from .. import config as _config
 
 CREATE_BUILD_ENDPOINT = "/build"
@@ -20,6 +22,11 @@ _BUILDLOGGER_CONFIG = os.getenv("BUILDLOGGER_CREDENTIALS", "mci.buildlogger")
 _SEND_AFTER_LINES = 2000
 _SEND_AFTER_SECS = 10
 
+# The number of bytes of log lines each handler keeps in memory while they can't be sent, and the
+# number of bytes it spills to disk beyond that before dropping log lines.
+_MAX_BUFFERED_BYTES = 16 * 1024 * 1024
+_MAX_SPILLED_BYTES = 1024 * 1024 * 1024
+
 # Initialized by resmokelib.logging.loggers.configure_loggers()
 BUILDLOGGER_FALLBACK = None
 
@@ -68,7 +75,7 @@ class _LogsSplitter(object):
         """Split the log lines into batches of size less than or equal to max_size.
 
         Args:
-            log_lines: A list of log lines.
+            log_lines: A list of log lines, or of log lines already encoded as JSON bytestrings.
             max_size: The maximum size in bytes a batch of log lines can have in JSON.
         Returns:
             A list of list of log lines. Each item is a list is a list of log lines
@@ -83,6 +90,8 @@ class _LogsSplitter(object):
             2 is added to each string size to account for the array representation of the logs,
             as each line is preceded by a '[' or a space and followed by a ',' or a ']'.
             """
+            if isinstance(line, bytes):
+                return len(line) + 2
             return len(json.dumps(line)) + 2
 
         curr_logs = []
@@ -100,11 +109,57 @@ class _LogsSplitter(object):
         return split_logs
 
 
+class _Sender(object):
+    """A pool of threads which send the log lines of the buildlogger handlers.
+
+    Sending the log lines in the background keeps the flush thread from waiting on the network, and
+    allows the log lines of different handlers to be sent at the same time. Each thread keeps its
+    HTTP connections to the buildlogger server alive across handlers.
+    """
+
+    NUM_THREADS = 4
+
+    def __init__(self, num_threads=NUM_THREADS):
+        """Initialize the _Sender and start its threads."""
+        self._queue = queue.Queue()
+        for i in range(num_threads):
+            thread = threading.Thread(target=self._run, name="BuildloggerSender-%d" % i)
+            # Main thread should not call join() when exiting
+            thread.daemon = True
+            thread.start()
+
+    def schedule(self, handler):
+        """Send the pending log lines of 'handler' on one of the threads."""
+        self._queue.put(handler)
+
+    def _run(self):
+        session = requests.Session()
+        while True:
+            handler = self._queue.get()
+            handler.send_pending(session)
+
+
+_SENDER_LOCK = threading.Lock()
+_SENDER = None
+
+
+def _get_sender():
+    """Return the _Sender shared by all of the buildlogger handlers, starting it if necessary."""
+    global _SENDER  # pylint: disable=global-statement
+    with _SENDER_LOCK:
+        if _SENDER is None:
+            _SENDER = _Sender()
+        return _SENDER
+
+
 class _BaseBuildloggerHandler(handlers.BufferedHandler):
     """Base class of the buildlogger handler for global logs and handler for test logs."""
 
-    def __init__(self, build_config, endpoint, capacity=_SEND_AFTER_LINES,
-                 interval_secs=_SEND_AFTER_SECS):
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self, build_config, endpoint, capacity=_SEND_AFTER_LINES,
+            interval_secs=_SEND_AFTER_SECS, compress=True):
         """Initialize the buildlogger handler with the build id and credentials."""
 
         handlers.BufferedHandler.__init__(self, capacity, interval_secs)
@@ -114,9 +169,18 @@ class _BaseBuildloggerHandler(handlers.BufferedHandler):
         self.http_handler = handlers.HTTPHandler(_config.BUILDLOGGER_URL, username, password)
 
         self.endpoint = endpoint
-        self.retry_buffer = []
+        self.compress = compress
         self.max_size = None
 
+        # self.__send_condition prohibits concurrent access to 'self.__pending_lines',
+        # 'self.__send_scheduled', and 'self.__closing'.
+        self.__send_condition = threading.Condition()
+        # Log lines encoded as JSON which haven't been sent yet, including ones which failed to be
+        # sent and are retried the next time flush() is called.
+        self.__pending_lines = spill.SpillBuffer(_MAX_BUFFERED_BYTES, _MAX_SPILLED_BYTES)
+        self.__send_scheduled = False
+        self.__closing = False
+
     def process_record(self, record):
         """Return a tuple of the time the log record was created, and the message.
 
@@ -130,11 +194,15 @@ class _BaseBuildloggerHandler(handlers.BufferedHandler):
         msg = self.format(record)
         return (record.created, msg)
 
+    def process_batched_record(self, record):
+        """Return a (created, message) tuple for each line of the record."""
+        return [(record.created, msg) for msg in self.format(record).split("\n")]
+
     def post(self, *args, **kwargs):
         """Provide convenience method for subclasses to use when making POST requests."""
         return self.http_handler.post(*args, **kwargs)
 
-    def _append_logs(self, log_lines):  # noqa: D406,D407,D413
+    def _append_logs(self, log_lines, session=None):  # noqa: D406,D407,D413
         """Send a POST request to the handlers endpoint with the logs that have been captured.
 
         Returns:
@@ -142,21 +210,23 @@ class _BaseBuildloggerHandler(handlers.BufferedHandler):
         """
         lines_sent = 0
         for chunk in _LogsSplitter.split_logs(log_lines, self.max_size):
-            chunk_lines_sent = self.__append_logs_chunk(chunk)
+            chunk_lines_sent = self.__append_logs_chunk(chunk, session)
             lines_sent += chunk_lines_sent
             if chunk_lines_sent < len(chunk):
                 # Not all lines have been sent. We stop here.
                 break
         return lines_sent
 
-    def __append_logs_chunk(self, log_lines_chunk):  # noqa: D406,D407,D413
+    def __append_logs_chunk(self, log_lines_chunk, session):  # noqa: D406,D407,D413
         """Send log lines chunk, handle 413 Request Entity Too Large errors & retry, if necessary.
 
         Returns:
             The number of log lines that have been successfully sent.
         """
         try:
-            self.post(self.endpoint, data=log_lines_chunk)
+            body = b"[" + b",".join(log_lines_chunk) + b"]"
+            self.http_handler.post_json(self.endpoint, body, compress=self.compress,
+                                        session=session)
             return len(log_lines_chunk)
         except requests.HTTPError as err:
             # Handle the "Request Entity Too Large" error, set the max size and retry.
@@ -172,7 +242,7 @@ class _BaseBuildloggerHandler(handlers.BufferedHandler):
                         "Received an HTTP 413 code, updating the request max_size to %s",
                         new_max_size)
                     self.max_size = new_max_size
-                    return self._append_logs(log_lines_chunk)
+                    return self._append_logs(log_lines_chunk, session)
             BUILDLOGGER_FALLBACK.error("Encountered an HTTP error: %s", err)
         except requests.RequestException as err:
             BUILDLOGGER_FALLBACK.error("Encountered a network error: %s", err)
@@ -181,31 +251,96 @@ class _BaseBuildloggerHandler(handlers.BufferedHandler):
         return 0
 
     def _flush_buffer_with_lock(self, buf, close_called):
-        """Ensure all logging output has been flushed to the buildlogger server.
+        """Hand the log messages over to the sender threads.
 
-        If _append_logs() returns false, then the log messages are added
-        to a separate buffer and retried the next time flush() is
-        called.
+        Each message is encoded as JSON once here so that its size is known when splitting the
+        messages into requests.
         """
 
-        self.retry_buffer.extend(buf)
+        self._schedule_send([json.dumps(entry).encode("utf-8") for entry in buf])
 
-        nb_sent = self._append_logs(self.retry_buffer)
-        if nb_sent:
-            self.retry_buffer = self.retry_buffer[nb_sent:]
-        if close_called and self.retry_buffer:
-            # The request to the logkeeper returned an error. We discard the log output rather than
-            # writing the messages to the fallback logkeeper to avoid putting additional pressure on
-            # the Evergreen database.
-            BUILDLOGGER_FALLBACK.warning(
-                "Failed to flush all log output (%d messages) to logkeeper.",
-                len(self.retry_buffer))
+    def flush(self):
+        """Flush the buffer and retry sending the log lines which previously failed to be sent."""
 
-            # We set a flag to indicate that we failed to flush all log output to logkeeper so
-            # resmoke.py can exit with a special return code.
-            set_log_output_incomplete()
+        handlers.BufferedHandler.flush(self)
 
-            self.retry_buffer = []
+        # The log lines which failed to be sent are retried even if no new ones were logged.
+        self._schedule_send([])
+
+    def _schedule_send(self, log_lines):
+        with self.__send_condition:
+            if self.__pending_lines.append(log_lines):
+                BUILDLOGGER_FALLBACK.warning(
+                    "Dropped log output which couldn't be spilled to %s while waiting to send it"
+                    " to logkeeper.", spill.get_spill_dir())
+                set_log_output_incomplete()
+
+            if self.__pending_lines and not self.__send_scheduled:
+                self.__send_scheduled = True
+                _get_sender().schedule(self)
+
+    def send_pending(self, session):
+        """Send the pending log lines to the buildlogger server using 'session'.
+
+        This method is called by the sender threads. The log lines which fail to be sent are retried
+        the next time flush() is called, or discarded if close() has been called.
+        """
+
+        with self.__send_condition:
+            log_lines = self.__pending_lines.take()
+            final_attempt = self.__closing
+
+        try:
+            nb_sent = self._append_logs(log_lines, session)
+        except:  # pylint: disable=bare-except
+            BUILDLOGGER_FALLBACK.exception("Encountered an error.")
+            nb_sent = 0
+
+        with self.__send_condition:
+            if nb_sent < len(log_lines):
+                self.__pending_lines.put_back(log_lines[nb_sent:])
+                if final_attempt:
+                    self.__discard_pending()
+                    self.__send_scheduled = False
+                elif self.__closing:
+                    # close() was called while sending. Try one last time now that it's waiting.
+                    _get_sender().schedule(self)
+                else:
+                    self.__send_scheduled = False
+            elif self.__pending_lines:
+                # More log lines were flushed while sending, or were spilled to disk. The handler
+                # remains scheduled so they are sent in order after the ones that were just sent.
+                _get_sender().schedule(self)
+            else:
+                self.__send_scheduled = False
+            self.__send_condition.notify_all()
+
+    def __discard_pending(self):
+        # The request to the logkeeper returned an error. We discard the log output rather than
+        # writing the messages to the fallback logkeeper to avoid putting additional pressure on
+        # the Evergreen database.
+        num_lines = self.__pending_lines.clear()
+        BUILDLOGGER_FALLBACK.warning("Failed to flush all log output (%d messages) to logkeeper.",
+                                     num_lines)
+
+        # We set a flag to indicate that we failed to flush all log output to logkeeper so
+        # resmoke.py can exit with a special return code.
+        set_log_output_incomplete()
+
+    def close(self):
+        """Flush the buffer and wait for all of the log lines to be sent."""
+
+        handlers.BufferedHandler.close(self)
+
+        with self.__send_condition:
+            self.__closing = True
+            # Retry sending any log lines which previously failed to be sent one last time.
+            if self.__pending_lines and not self.__send_scheduled:
+                self.__send_scheduled = True
+                _get_sender().schedule(self)
+
+            while self.__send_scheduled:
+                self.__send_condition.wait()
 
 
 class BuildloggerTestHandler(_BaseBuildloggerHandler):
@@ -213,13 +348,14 @@ class BuildloggerTestHandler(_BaseBuildloggerHandler):
 
     def __init__(  # pylint: disable=too-many-arguments
             self, build_config, build_id, test_id, capacity=_SEND_AFTER_LINES,
-            interval_secs=_SEND_AFTER_SECS):
+            interval_secs=_SEND_AFTER_SECS, compress=True):
         """Initialize the buildlogger handler with the credentials, build id, and test id."""
         endpoint = APPEND_TEST_LOGS_ENDPOINT % {
             "build_id": build_id,
             "test_id": test_id,
         }
-        _BaseBuildloggerHandler.__init__(self, build_config, endpoint, capacity, interval_secs)
+        _BaseBuildloggerHandler.__init__(self, build_config, endpoint, capacity, interval_secs,
+                                         compress)
 
     @_log_on_error
     def _finish_test(self, failed=False):
@@ -242,11 +378,13 @@ class BuildloggerTestHandler(_BaseBuildloggerHandler):
 class BuildloggerGlobalHandler(_BaseBuildloggerHandler):
     """Buildlogger handler for the global logs."""
 
-    def __init__(self, build_config, build_id, capacity=_SEND_AFTER_LINES,
-                 interval_secs=_SEND_AFTER_SECS):
+    def __init__(  # pylint: disable=too-many-arguments
+            self, build_config, build_id, capacity=_SEND_AFTER_LINES,
+            interval_secs=_SEND_AFTER_SECS, compress=True):
         """Initialize the buildlogger handler with the credentials and build id."""
         endpoint = APPEND_GLOBAL_LOGS_ENDPOINT % {"build_id": build_id}
-        _BaseBuildloggerHandler.__init__(self, build_config, endpoint, capacity, interval_secs)
+        _BaseBuildloggerHandler.__init__(self, build_config, endpoint, capacity, interval_secs,
+                                         compress)
 
 
 class BuildloggerServer(object):
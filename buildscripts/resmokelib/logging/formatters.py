@@ -11,6 +11,28 @@ class ISO8601Formatter(logging.Formatter):
     millisecond separator in order to match the log messages of MongoDB.
     """
 
+    # Stands in for each line of a record logged by BaseLogger.log_lines(). The output of
+    # subprocesses can't contain null bytes because the LoggerPipe escapes them.
+    _LINE_PLACEHOLDER = "\0"
+
+    def format(self, record):
+        """Return the formatted record with each line of a batched record formatted separately."""
+        lines = getattr(record, "lines", None)
+        if lines is None:
+            return logging.Formatter.format(self, record)
+
+        # Format the parts of the message surrounding the line once and reuse them for all of the
+        # lines of the record.
+        record.message = ISO8601Formatter._LINE_PLACEHOLDER
+        if self.usesTime():
+            record.asctime = self.formatTime(record, self.datefmt)
+        parts = self.formatMessage(record).split(ISO8601Formatter._LINE_PLACEHOLDER, 1)
+        if len(parts) != 2:
+            return logging.Formatter.format(self, record)
+
+        (prefix, suffix) = parts
+        return "\n".join([prefix + line + suffix for line in lines])
+
     def formatTime(self, record, datefmt=None):
         """Return formatted time."""
         converted_time = self.converter(record.created)
@@ -1,5 +1,6 @@
 """Additional handlers that are used as the base classes of the buildlogger handler."""
 
+import gzip
 import json
 import logging
 import sys
@@ -23,6 +24,9 @@ from .. import utils
 
 _TIMEOUT_SECS = 10
 
+# Log lines compress well, so a fast compression level already shrinks the requests considerably.
+_COMPRESS_LEVEL = 1
+
 
 class BufferedHandler(logging.Handler):
     """A handler class that buffers logging records in memory.
@@ -87,19 +91,31 @@ class BufferedHandler(logging.Handler):
 
         return record
 
+    def process_batched_record(self, record):
+        """Return the list of entries to add to the buffer for a record with multiple 'lines'.
+
+        The default implementation adds the record as a single entry using process_record().
+        """
+
+        return [self.process_record(record)]
+
     def emit(self, record):
         """Emit a record.
 
         Append the record to the buffer after it has been transformed by
-        process_record(). If the length of the buffer is greater than or
+        process_record(), or process_batched_record() if the record has
+        multiple lines. If the length of the buffer is greater than or
         equal to its capacity, then the flush() event is rescheduled to
         immediately process the buffer.
         """
 
-        processed_record = self.process_record(record)
+        if getattr(record, "lines", None) is None:
+            processed_records = [self.process_record(record)]
+        else:
+            processed_records = self.process_batched_record(record)
 
         with self.__emit_lock:
-            self.__emit_buffer.append(processed_record)
+            self.__emit_buffer.extend(processed_records)
 
             if self.__flush_event is None:
                 # Now that we've added our first record to the buffer, we schedule a call to flush()
@@ -198,9 +214,31 @@ class HTTPHandler(object):
         data = utils.default_if_none(data, [])
         data = json.dumps(data)
 
+        return self.post_json(endpoint, data, headers=headers, timeout_secs=timeout_secs)
+
+    def post_json(  # pylint: disable=too-many-arguments
+            self, endpoint, body, headers=None, timeout_secs=_TIMEOUT_SECS, compress=False,
+            session=None):
+        """Send a POST request to the specified endpoint with 'body', a serialized JSON document.
+
+        The body is gzip-compressed if 'compress' is true. The request is sent using 'session' if
+        specified, which allows connections to be kept alive across HTTPHandler instances.
+
+        Return the response, either as a string or a JSON object based
+        on the content type.
+        """
+
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+
         headers = utils.default_if_none(headers, {})
         headers["Content-Type"] = "application/json; charset=utf-8"
 
+        if compress:
+            body = gzip.compress(body, compresslevel=_COMPRESS_LEVEL)
+            headers["Content-Encoding"] = "gzip"
+
+        session = utils.default_if_none(session, self.session)
         url = self._make_url(endpoint)
 
         with warnings.catch_warnings():
@@ -221,8 +259,8 @@ class HTTPHandler(object):
                     # that defined InsecureRequestWarning.
                     pass
 
-            response = self.session.post(url, data=data, headers=headers, timeout=timeout_secs,
-                                         auth=self.auth_handler, verify=True)
+            response = session.post(url, data=body, headers=headers, timeout=timeout_secs,
+                                    auth=self.auth_handler, verify=True)
 
         response.raise_for_status()
 
@@ -4,6 +4,7 @@ import logging
 import sys
 
 from . import buildlogger
+from . import flush
 from . import formatters
 from .. import errors
 
@@ -87,6 +88,20 @@ class BaseLogger(logging.Logger):
             return getattr(self.parent, "logging_config", None)
         return None
 
+    def log_lines(self, level, lines):
+        """Log each of 'lines' with the severity 'level' using a single LogRecord.
+
+        This avoids the overhead of creating and handling a LogRecord for every line of output of a
+        subprocess. Handlers receive a record whose message is all of the lines joined by newlines
+        and whose 'lines' attribute is the list of lines, which ISO8601Formatter formats separately.
+        """
+        if not lines or not self.isEnabledFor(level):
+            return
+
+        record = self.makeRecord(self.name, level, "(unknown file)", 0, "\n".join(lines), None,
+                                 None, extra={"lines": lines})
+        self.handle(record)
+
     @staticmethod
     def get_formatter(logger_info):
         """Return formatter."""
@@ -278,6 +293,18 @@ class FixtureLogger(BaseLogger):
             handler.setFormatter(self.get_formatter(logger_info))
             self.addHandler(handler)
 
+    def reset_build_id(self, build_id):
+        """Send the output of a fixture reused by a later suite to the build log 'build_id'.
+
+        The node loggers of the fixture propagate to this logger and so are re-pointed as well.
+        """
+        for handler in list(self.handlers):
+            self.removeHandler(handler)
+            # We ignore the cancellation token returned by close_later() since we always want the
+            # logs to eventually get flushed.
+            flush.close_later(handler)
+        self._add_build_logger_handler(build_id)
+
     def new_fixture_node_logger(self, node_name):
         """Create a new child FixtureNodeLogger."""
         return FixtureNodeLogger(self.fixture_class, self.job_num, node_name, self)
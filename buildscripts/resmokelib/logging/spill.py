@@ -0,0 +1,194 @@
+"""A buffer of log lines which spills to disk once it holds too much data in memory.
+
+Used by the buildlogger handlers to hold on to the log lines that couldn't be sent yet.
+"""
+
+import atexit
+import collections
+import os
+import shutil
+import tempfile
+import threading
+
+_SPILL_DIR_LOCK = threading.Lock()
+_SPILL_DIR = None
+
+
+def get_spill_dir():
+    """Return the directory to write the segment files to, creating it if necessary."""
+    global _SPILL_DIR  # pylint: disable=global-statement
+    with _SPILL_DIR_LOCK:
+        if _SPILL_DIR is None:
+            _SPILL_DIR = tempfile.mkdtemp(prefix="resmoke_buildlogger_")
+            atexit.register(shutil.rmtree, _SPILL_DIR, ignore_errors=True)
+        return _SPILL_DIR
+
+
+class SpillStats(object):
+    """Counters of the bytes of log lines that were buffered, spilled to disk, and dropped."""
+
+    def __init__(self):
+        """Initialize the SpillStats."""
+        self._lock = threading.Lock()
+        self.bytes_buffered = 0
+        self.bytes_spilled = 0
+        self.bytes_dropped = 0
+
+    def add(self, buffered=0, spilled=0, dropped=0):
+        """Increment the counters."""
+        with self._lock:
+            self.bytes_buffered += buffered
+            self.bytes_spilled += spilled
+            self.bytes_dropped += dropped
+
+    def __str__(self):
+        return "{:d} bytes buffered, {:d} bytes spilled to disk, {:d} bytes dropped".format(
+            self.bytes_buffered, self.bytes_spilled, self.bytes_dropped)
+
+
+# The counters of all of the SpillBuffer instances.
+STATS = SpillStats()
+
+
+class SpillBuffer(object):
+    """A first-in, first-out buffer of log lines encoded as bytestrings.
+
+    Up to 'max_memory_bytes' of log lines are kept in memory. Any log lines added after that are
+    appended to segment files on disk, up to 'max_disk_bytes', and read back once the log lines in
+    memory have been taken. Log lines which don't fit on disk either are dropped.
+
+    The log lines must not contain newlines. SpillBuffer isn't thread-safe.
+    """
+
+    SEGMENT_BYTES = 4 * 1024 * 1024
+
+    def __init__(self, max_memory_bytes, max_disk_bytes, stats=STATS):
+        """Initialize the SpillBuffer."""
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._stats = stats
+
+        self._memory_lines = collections.deque()
+        self._memory_bytes = 0
+
+        # A [pathname, size] pair for each segment file, from oldest to newest. Only the newest
+        # segment file is open for writing.
+        self._segments = collections.deque()
+        self._segment_file = None
+        self._disk_bytes = 0
+
+    def __bool__(self):
+        return bool(self._memory_lines or self._segments)
+
+    def append(self, lines):
+        """Add 'lines' to the end of the buffer and return the number of bytes that were dropped."""
+        buffered = 0
+        dropped = 0
+        for line in lines:
+            size = len(line)
+            buffered += size
+            # Once log lines have been spilled to disk, new log lines are spilled as well until
+            # they have been read back so the order of the log lines is preserved.
+            if not self._segments and self._memory_bytes + size <= self.max_memory_bytes:
+                self._memory_lines.append(line)
+                self._memory_bytes += size
+            elif not self._spill(line):
+                dropped += size
+
+        self._stats.add(buffered=buffered, dropped=dropped)
+        return dropped
+
+    def _spill(self, line):
+        if self._disk_bytes + len(line) > self.max_disk_bytes:
+            return False
+
+        try:
+            if self._segment_file is None or self._segments[-1][1] >= SpillBuffer.SEGMENT_BYTES:
+                self._start_segment()
+            self._segment_file.write(line + b"\n")
+        except (IOError, OSError):
+            return False
+
+        self._segments[-1][1] += len(line)
+        self._disk_bytes += len(line)
+        self._stats.add(spilled=len(line))
+        return True
+
+    def _start_segment(self):
+        self._close_segment_file()
+        (fd, pathname) = tempfile.mkstemp(suffix=".segment", dir=get_spill_dir())
+        self._segment_file = os.fdopen(fd, "wb")
+        self._segments.append([pathname, 0])
+
+    def _close_segment_file(self):
+        if self._segment_file is not None:
+            self._segment_file.close()
+            self._segment_file = None
+
+    def take(self):
+        """Remove and return the log lines at the start of the buffer.
+
+        Either all of the log lines in memory or the log lines of the oldest segment file are
+        returned so that at most SEGMENT_BYTES are read back from disk at once.
+        """
+        if self._memory_lines:
+            lines = list(self._memory_lines)
+            self._memory_lines.clear()
+            self._memory_bytes = 0
+            return lines
+
+        if not self._segments:
+            return []
+
+        (pathname, size) = self._segments.popleft()
+        if not self._segments:
+            self._close_segment_file()
+        self._disk_bytes -= size
+
+        try:
+            with open(pathname, "rb") as fp:
+                return fp.read().splitlines()
+        except (IOError, OSError):
+            self._stats.add(dropped=size)
+            return []
+        finally:
+            _remove(pathname)
+
+    def put_back(self, lines):
+        """Return 'lines' taken by take() to the start of the buffer.
+
+        The log lines are kept in memory even if this exceeds 'max_memory_bytes', by at most the
+        size of a segment file, because they must be sent before any of the other log lines.
+        """
+        self._memory_lines.extendleft(reversed(lines))
+        self._memory_bytes += sum(len(line) for line in lines)
+
+    def clear(self):
+        """Drop all of the log lines and return the number of log lines that were dropped."""
+        num_lines = len(self._memory_lines)
+        dropped = self._memory_bytes
+        self._memory_lines.clear()
+        self._memory_bytes = 0
+
+        self._close_segment_file()
+        while self._segments:
+            (pathname, size) = self._segments.popleft()
+            try:
+                with open(pathname, "rb") as fp:
+                    num_lines += sum(1 for _ in fp)
+            except (IOError, OSError):
+                pass
+            _remove(pathname)
+            dropped += size
+        self._disk_bytes = 0
+
+        if dropped:
+            self._stats.add(dropped=dropped)
+        return num_lines
+
+
+def _remove(pathname):
+    try:
+        os.remove(pathname)
+    except OSError:
+        pass
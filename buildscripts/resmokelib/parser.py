@@ -96,6 +96,12 @@ def _make_parser():  # pylint: disable=too-many-statements
               " specified tags will be excluded from any suites that are run."
               " The tag '{}' is implicitly part of this list.".format(_config.EXCLUDED_TAG)))
 
+    parser.add_option(
+        "--fixtureSnapshotDir", dest="fixture_snapshot_dir", metavar="DIR",
+        help=("Saves a copy of the data files of each replica set fixture in DIR once it has been"
+              " initiated, and restores them instead of initiating the replica set again whenever"
+              " the fixture is restarted with no data, e.g. by the CleanEveryN hook."))
+
     parser.add_option("-f", "--findSuites", action="store_true", dest="find_suites",
                       help="Lists the names of the suites that will execute the specified tests.")
 
@@ -103,9 +109,12 @@ def _make_parser():  # pylint: disable=too-many-statements
                       help="The path to the genny executable for resmoke to use.")
 
     parser.add_option(
-        "--spawnUsing", type="choice", dest="spawn_using", choices=("python", "jasper"),
+        "--spawnUsing", type="choice", dest="spawn_using",
+        choices=("python", "jasper", "selectors"),
         help=("Allows you to spawn resmoke processes using python or Jasper."
-              "Defaults to python. Options are 'python' or 'jasper'."))
+              "Defaults to python. Options are 'python', 'jasper', or 'selectors'. 'selectors'"
+              " spawns processes using python but reads the output of all of them on a single"
+              " thread rather than two threads per process."))
 
     parser.add_option(
         "--includeWithAnyTags", action="append", dest="include_with_any_tags", metavar="TAG1,TAG2",
@@ -127,6 +136,18 @@ def _make_parser():  # pylint: disable=too-many-statements
         help=("The number of Job instances to use. Each instance will receive its"
               " own MongoDB deployment to dispatch tests to."))
 
+    parser.add_option(
+        "--adaptiveJobs", action="store_true", dest="adaptive_jobs",
+        help=("Starts by running --minJobs tests at once, and then raises or lowers the number of"
+              " tests running at once, up to --jobs, based on the load average, free memory, and"
+              " iowait of the machine. Fixtures are set up in the same way, replacing the fixed"
+              " delays of --staggerJobs."))
+
+    parser.add_option(
+        "--minJobs", type="int", dest="min_jobs", metavar="N",
+        help=("The number of tests allowed to run at once however loaded the machine is when"
+              " --adaptiveJobs is specified. Defaults to 1."))
+
     parser.add_option("-l", "--listSuites", action="store_true", dest="list_suites",
                       help="Lists the names of the suites available to execute.")
 
@@ -162,6 +183,20 @@ def _make_parser():  # pylint: disable=too-many-statements
     parser.add_option("--numClientsPerFixture", type="int", dest="num_clients_per_fixture",
                       help="Number of clients running tests per fixture.")
 
+    parser.add_option(
+        "--numClientsStartedUsing", type="choice", dest="num_clients_started_using",
+        choices=("threads", "supervisor"), metavar="MODE",
+        help=("How the clients running a test are started when --numClientsPerFixture is greater"
+              " than 1. 'threads' starts each client on a thread of its own. 'supervisor' starts"
+              " all of the clients from the thread running the test, --clientStartupStaggerMS"
+              " apart, and builds their mongo shell invocation once. Defaults to 'threads'."))
+
+    parser.add_option(
+        "--clientStartupStaggerMS", type="int", dest="client_startup_stagger_ms",
+        metavar="MILLISECONDS",
+        help=("The number of milliseconds to wait between starting each of the clients running a"
+              " test with --numClientsStartedUsing=supervisor. Defaults to 50."))
+
     parser.add_option("--perfReportFile", dest="perf_report_file", metavar="PERF_REPORT",
                       help="Writes a JSON file with performance test results.")
 
@@ -214,7 +249,49 @@ def _make_parser():  # pylint: disable=too-many-statements
         " never be silently ignored. Defaults to STATUS=%default.")
 
     parser.add_option("--reportFile", dest="report_file", metavar="REPORT",
-                      help="Writes a JSON file with test status and timing information.")
+                      help=("Writes a JSON file with test status and timing information. The result"
+                            " of each test is also appended to a JSON-lines file with the same name"
+                            " and the .jsonl extension as soon as the test finishes."))
+
+    parser.add_option(
+        "--rerunFailedFrom", dest="rerun_failed_from", metavar="REPORT",
+        help=("Only runs the tests which failed or were interrupted in REPORT, a report.json file"
+              " written by --reportFile, or the JSON-lines file written alongside it. A test is"
+              " also run again if a hook, such as a data consistency check, failed after it."
+              " Specify the same --suites as the earlier invocation to run the tests against the"
+              " same fixtures."))
+
+    parser.add_option(
+        "--rerunRemaining", action="store_true", dest="rerun_remaining",
+        help=("Runs the tests which didn't fail in the --rerunFailedFrom report.json file after the"
+              " ones which did."))
+
+    parser.add_option(
+        "--resultCacheDir", dest="result_cache_dir", metavar="DIR",
+        help=("Records the outcome of each test in DIR after each suite runs. Tests which passed"
+              " before are reported as cached instead of being run again, unless the test file,"
+              " the files it loads, the suite configuration, the mongo, mongod, or mongos binaries,"
+              " or the command line options that change how tests run have changed since."))
+
+    parser.add_option(
+        "--reuseFixtures", action="store_true", dest="reuse_fixtures",
+        help=("Keeps fixtures running after a suite finishes so that later suites with the same"
+              " fixture configuration can reuse them after dropping their databases, instead of"
+              " setting up new fixtures. Only suites whose tests don't leave behind users, roles,"
+              " server parameters, or failpoints should be run with this option."))
+
+    parser.add_option(
+        "--runtimeHistoryDir", dest="runtime_history_dir", metavar="DIR",
+        help=("Appends the runtime of each test to a history file in DIR after each suite runs."
+              " The recorded runtimes are used to start the longest running tests first in later"
+              " invocations."))
+
+    parser.add_option(
+        "--scheduleByResources", action="store_true", dest="schedule_by_resources",
+        help=("Waits to start each test until enough of the machine's CPUs and memory are free"
+              " for it. Tests tagged as 'resource_intensive' or 'requires_sharding' are expected"
+              " to use more resources than other tests. Specify a number of jobs larger than the"
+              " number of CPUs to run lighter tests more densely."))
 
     parser.add_option(
         "--seed", type="int", dest="seed", metavar="SEED",
@@ -286,6 +363,18 @@ def _make_parser():  # pylint: disable=too-many-statements
     parser.add_option("--tagFile", dest="tag_file", metavar="OPTIONS",
                       help="A YAML file that associates tests and tags.")
 
+    parser.add_option(
+        "--tagIndexFile", dest="tag_index_file", metavar="PATH",
+        help=("A JSON file in which the tags found in the comments of JavaScript test files are"
+              " saved. The tags of a file are only parsed again once its size or modification time"
+              " changes, which speeds up selecting the tests of suites in later invocations."))
+
+    parser.add_option(
+        "--testRuntimesFile", dest="test_runtimes_file", metavar="PATH",
+        help=("A JSON file with historical test runtimes, e.g. the report.json file of a previous"
+              " resmoke.py invocation. If specified, then tests are queued so that the ones"
+              " expected to run the longest are started first."))
+
     parser.add_option("--wiredTigerCollectionConfigString", dest="wt_coll_config", metavar="CONFIG",
                       help="Sets the WiredTiger collection configuration setting for all mongod's.")
 
@@ -455,8 +544,14 @@ def to_local_args(args=None):  # pylint: disable=too-many-branches,too-many-loca
         "--perfReportFile",
         "--reportFailureStatus",
         "--reportFile",
+        "--rerunFailedFrom",
+        "--rerunRemaining",
+        "--resultCacheDir",
+        "--runtimeHistoryDir",
         "--staggerJobs",
         "--tagFile",
+        "--tagIndexFile",
+        "--testRuntimesFile",
     }
 
     def format_option(option_name, option_value):
@@ -543,6 +638,16 @@ def _validate_config(parser):
     if _config.REPEAT_TESTS > 1 and _config.REPEAT_TESTS_SECS:
         parser.error("Cannot specify --repeatTests and --repeatTestsSecs")
 
+    if _config.RERUN_REMAINING and _config.RERUN_FAILED_FROM is None:
+        parser.error("Must specify --rerunFailedFrom with --rerunRemaining")
+
+    if _config.RERUN_FAILED_FROM is not None and not os.path.isfile(_config.RERUN_FAILED_FROM):
+        parser.error("--rerunFailedFrom report file '{}' does not exist".format(
+            _config.RERUN_FAILED_FROM))
+
+    if _config.CLIENT_STARTUP_STAGGER_MS < 0:
+        parser.error("--clientStartupStaggerMS must not be negative")
+
     if _config.MIXED_BIN_VERSIONS is not None:
         for version in _config.MIXED_BIN_VERSIONS:
             if version not in set(['old', 'new']):
@@ -599,6 +704,7 @@ def _update_config_vars(values):  # pylint: disable=too-many-statements,too-many
             user_config = dict(config_parser["resmoke"])
             config.update(user_config)
 
+    _config.ADAPTIVE_JOBS = config.pop("adaptive_jobs")
     _config.ALWAYS_USE_LOG_FILES = config.pop("always_use_log_files")
     _config.ARCHIVE_FILE = config.pop("archive_file")
     _config.ARCHIVE_LIMIT_MB = config.pop("archive_limit_mb")
@@ -613,11 +719,13 @@ def _update_config_vars(values):  # pylint: disable=too-many-statements,too-many
     _config.EXCLUDE_WITH_ANY_TAGS.extend(
         utils.default_if_none(_tags_from_list(config.pop("exclude_with_any_tags")), []))
     _config.FAIL_FAST = not config.pop("continue_on_failure")
+    _config.FIXTURE_SNAPSHOT_DIR = _expand_user(config.pop("fixture_snapshot_dir"))
     _config.FLOW_CONTROL = config.pop("flow_control")
     _config.FLOW_CONTROL_TICKETS = config.pop("flow_control_tickets")
     _config.INCLUDE_WITH_ANY_TAGS = _tags_from_list(config.pop("include_with_any_tags"))
     _config.GENNY_EXECUTABLE = _expand_user(config.pop("genny_executable"))
     _config.JOBS = config.pop("jobs")
+    _config.MIN_JOBS = config.pop("min_jobs")
     _config.LINEAR_CHAIN = config.pop("linear_chain") == "on"
     _config.LOG_FORMAT = config.pop("log_format")
     _config.MAJORITY_READ_CONCERN = config.pop("majority_read_concern") == "on"
@@ -646,6 +754,8 @@ def _update_config_vars(values):  # pylint: disable=too-many-statements,too-many
     _config.MONGOS_SET_PARAMETERS = config.pop("mongos_set_parameters")
     _config.NO_JOURNAL = config.pop("no_journal")
     _config.NUM_CLIENTS_PER_FIXTURE = config.pop("num_clients_per_fixture")
+    _config.NUM_CLIENTS_STARTED_USING = config.pop("num_clients_started_using")
+    _config.CLIENT_STARTUP_STAGGER_MS = config.pop("client_startup_stagger_ms")
     _config.NUM_REPLSET_NODES = config.pop("num_replset_nodes")
     _config.NUM_SHARDS = config.pop("num_shards")
     _config.PERF_REPORT_FILE = config.pop("perf_report_file")
@@ -657,6 +767,12 @@ def _update_config_vars(values):  # pylint: disable=too-many-statements,too-many
     _config.REPEAT_TESTS_SECS = config.pop("repeat_tests_secs")
     _config.REPORT_FAILURE_STATUS = config.pop("report_failure_status")
     _config.REPORT_FILE = config.pop("report_file")
+    _config.REUSE_FIXTURES = config.pop("reuse_fixtures")
+    _config.RERUN_FAILED_FROM = _expand_user(config.pop("rerun_failed_from"))
+    _config.RERUN_REMAINING = config.pop("rerun_remaining")
+    _config.RESULT_CACHE_DIR = _expand_user(config.pop("result_cache_dir"))
+    _config.RUNTIME_HISTORY_DIR = _expand_user(config.pop("runtime_history_dir"))
+    _config.SCHEDULE_BY_RESOURCES = config.pop("schedule_by_resources")
     _config.SERVICE_EXECUTOR = config.pop("service_executor")
     _config.SHELL_READ_MODE = config.pop("shell_read_mode")
     _config.SHELL_WRITE_MODE = config.pop("shell_write_mode")
@@ -665,6 +781,8 @@ def _update_config_vars(values):  # pylint: disable=too-many-statements,too-many
     _config.STORAGE_ENGINE = config.pop("storage_engine")
     _config.STORAGE_ENGINE_CACHE_SIZE = config.pop("storage_engine_cache_size_gb")
     _config.TAG_FILE = config.pop("tag_file")
+    _config.TAG_INDEX_FILE = _expand_user(config.pop("tag_index_file"))
+    _config.TEST_RUNTIMES_FILE = _expand_user(config.pop("test_runtimes_file"))
     _config.TRANSPORT_LAYER = config.pop("transport_layer")
 
     # Evergreen options.
@@ -1,10 +1,17 @@
 """Manage interactions with the report.json file."""
 
+import collections
 import json
+import os.path
 
+from buildscripts.util import testname as _testname
 from . import config
 from .testing import report as _report
 
+# The statuses of the tests in a report.json file which should be run again by --rerunFailedFrom.
+# Tests which errored or were interrupted are reported as failures.
+_FAILED_STATUSES = ("fail", "silentfail")
+
 
 def write(suites):
     """Write the combined report of all executions if --reportFile was specified."""
@@ -18,4 +25,134 @@ def write(suites):
 
     combined_report_dict = _report.TestReport.combine(*reports).as_dict()
     with open(config.REPORT_FILE, "w") as fp:
-        json.dump(combined_report_dict, fp)
+        json.dump(combined_report_dict, fp, separators=(",", ":"))
+
+
+def get_stream_pathname(pathname):
+    """Return the pathname of the JSON-lines file the results are streamed to for 'pathname'."""
+
+    stream_pathname = os.path.splitext(pathname)[0] + ".jsonl"
+    if stream_pathname == pathname:
+        return pathname + ".jsonl"
+    return stream_pathname
+
+
+def open_stream():
+    """Append the result of each test to a JSON-lines file if --reportFile was specified.
+
+    The results are appended as soon as the tests finish so that they aren't lost if resmoke.py is
+    killed before write() is called, and so that the progress of a long run can be followed.
+    """
+
+    if config.REPORT_FILE is None:
+        return
+
+    _report.set_result_stream(_report.ResultStream(get_stream_pathname(config.REPORT_FILE)))
+
+
+def close_stream():
+    """Stop appending the results of the tests to the JSON-lines file."""
+
+    _report.close_result_stream()
+
+
+def _load_stream(fp):
+    """Return the report dict equivalent to the JSON-lines file 'fp' written by open_stream()."""
+
+    results = collections.OrderedDict()
+    for line in fp:
+        try:
+            result = json.loads(line)
+        except ValueError:
+            # The last line is incomplete if resmoke.py was killed while writing it.
+            continue
+
+        # Tests which were interrupted don't have a status.
+        if result["status"] is None:
+            result["status"] = "fail"
+        # The last result appended for a test is its final one.
+        results.pop(result["test_id"], None)
+        results[result["test_id"]] = result
+
+    return {"results": list(results.values())}
+
+
+def load_failed_tests(pathname):
+    """Return the tests which failed in the report.json file 'pathname'.
+
+    'pathname' can also be the JSON-lines file written while the tests ran, e.g. when resmoke.py was
+    killed before writing the report.json file.
+
+    A failed dynamic test, such as a data consistency check that ran after a test, is attributed to
+    the test it ran after by including that test's file. Failed dynamic tests which aren't
+    associated with a test, such as setting up a fixture, are ignored.
+    """
+
+    with open(pathname, "r") as fp:
+        try:
+            report_dict = json.load(fp)
+        except ValueError:
+            report_dict = None
+
+        # A JSON-lines file with a single result is also a valid JSON file.
+        if not isinstance(report_dict, dict) or "results" not in report_dict:
+            fp.seek(0)
+            report_dict = _load_stream(fp)
+    report = _report.TestReport.from_dict(report_dict)
+
+    failed_tests = set()
+    for (index, test_info) in enumerate(report.test_infos):
+        if test_info.status not in _FAILED_STATUSES:
+            continue
+
+        test_file = _testname.normalize_test_file(test_info.test_file)
+        failed_tests.add(test_file)
+        if _testname.is_resmoke_hook(test_file):
+            after_test_file = _get_after_test_file(report.test_infos, index)
+            if after_test_file is not None:
+                failed_tests.add(_testname.normalize_test_file(after_test_file))
+    return failed_tests
+
+
+def _get_after_test_file(test_infos, index):
+    """Return the test file of the test which the dynamic test 'test_infos[index]' ran after.
+
+    Older reports don't record that test. They list the results of each job together and in order,
+    so the test is then the closest earlier one, ignoring other dynamic tests, if its short name
+    matches the name of the dynamic test.
+    """
+
+    test_info = test_infos[index]
+    if test_info.after_test_file is not None:
+        return test_info.after_test_file
+
+    short_name = _testname.split_test_hook_name(test_info.test_file)[0]
+    for earlier_test_info in reversed(test_infos[:index]):
+        if _testname.is_resmoke_hook(earlier_test_info.test_file):
+            continue
+        if _testname.get_short_name_from_test_file(earlier_test_info.test_file) == short_name:
+            return earlier_test_info.test_file
+        return None
+    return None
+
+
+def order_failed_tests_first(tests, failed_tests, include_remaining):
+    """Return a (tests to run, number of failed tests) pair.
+
+    The tests in 'tests' which are in 'failed_tests' come first and keep their relative order. They
+    are followed by the other tests if 'include_remaining' is true. Groups of tests, such as the
+    ones run by the parallel FSM workload executor, aren't named in report.json files and are
+    counted as other tests.
+    """
+
+    failed = []
+    remaining = []
+    for test in tests:
+        if isinstance(test, str) and _testname.normalize_test_file(test) in failed_tests:
+            failed.append(test)
+        else:
+            remaining.append(test)
+
+    if include_remaining:
+        return (failed + remaining, len(failed))
+    return (failed, len(failed))
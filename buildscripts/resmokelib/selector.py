@@ -12,13 +12,14 @@ import os.path
 import random
 import subprocess
 import sys
+import threading
 
 import buildscripts.ciconfig.tags as _tags
 from . import config
 from . import errors
 from . import utils
 from .utils import globstar
-from .utils import jscomment
+from .utils import tagindex
 
 ########################
 #  Test file explorer  #
@@ -53,11 +54,12 @@ class TestFileExplorer(object):
     def jstest_tags(file_path):  # noqa: D406,D407,D411,D413
         """Extract the tags from a JavaScript test file.
 
-        See buildscripts.resmokelib.utils.jscomment.get_tags().
+        The tags are looked up in the TagIndex shared by all selectors so that a file is only
+        parsed again once it changes. See buildscripts.resmokelib.utils.jscomment.get_tags().
         Returns:
             A list of tags.
         """
-        return jscomment.get_tags(file_path)
+        return tagindex.get_tag_index(config.TAG_INDEX_FILE).get_tags(file_path)
 
     @staticmethod
     def read_root_file(root_file_path):  # noqa: D406,D407,D411,D413
@@ -98,6 +100,16 @@ class TestFileExplorer(object):
                                           dbtest_binary, stdout, stderr))
         return stdout.splitlines()
 
+    def list_unittest_suites(self, unittest_binary):
+        """List the test suites of a C++ unit test binary."""
+        returncode, stdout, stderr = self._run_program(unittest_binary, ["--list"])
+
+        if returncode != 0:
+            raise errors.ResmokeError("Getting list of unit test suites failed"
+                                      ", unittest_binary=`{}`: stdout=`{}`, stderr=`{}`".format(
+                                          unittest_binary, stdout, stderr))
+        return [line.strip() for line in stdout.splitlines() if line.strip()]
+
     @staticmethod
     def _run_program(binary, args):  # noqa: D406,D407,D411,D413
         """Run a program.
@@ -136,6 +148,59 @@ class TestFileExplorer(object):
         return tagged_tests
 
 
+class CachingTestFileExplorer(TestFileExplorer):
+    """A TestFileExplorer that remembers the result of its file system operations.
+
+    Using the same CachingTestFileExplorer to select the tests of many suites means that a glob
+    pattern shared by their roots, e.g. jstests/core/**/*.js, is only expanded once, and that a
+    directory is only read once even when it is matched by different patterns. The file system is
+    assumed not to change while the instance is in use.
+    """
+
+    def __init__(self):
+        """Initialize the CachingTestFileExplorer with empty caches."""
+        TestFileExplorer.__init__(self)
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._dir_cache = globstar.DirectoryCache()
+
+    def _get_cached(self, key, func, *args):
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+
+        # Multiple threads may compute the same value concurrently. This is harmless because the
+        # result is the same and it avoids holding the lock while accessing the file system.
+        value = func(*args)
+        with self._lock:
+            return self._cache.setdefault(key, value)
+
+    def iglob(self, pattern):
+        """Expand the given glob pattern, reusing the paths from a previous expansion."""
+        paths = self._get_cached(("iglob", pattern),
+                                 lambda: list(globstar.iglob(pattern, self._dir_cache)))
+        return list(paths)
+
+    def isfile(self, path):
+        """Indicate if the given path corresponds to an existing file."""
+        return self._get_cached(("isfile", path), TestFileExplorer.isfile, path)
+
+    def read_root_file(self, root_file_path):
+        """Read a file containing the list of root test files, reusing a previous read."""
+        tests = self._get_cached(("read_root_file", root_file_path),
+                                 TestFileExplorer.read_root_file, root_file_path)
+        return list(tests)
+
+    def parse_tag_file(self, test_kind):
+        """Parse the tag file and return a dict of tagged tests, reusing a previous parse."""
+        tagged_tests = self._get_cached(("parse_tag_file", test_kind),
+                                        TestFileExplorer.parse_tag_file, test_kind)
+        return collections.defaultdict(list, {
+            test: list(tags)
+            for test, tags in tagged_tests.items()
+        })
+
+
 class _TestList(object):
     """
     A list of tests on which filtering operations can be applied.
@@ -176,15 +241,10 @@ class _TestList(object):
         """
         if not self._tests_are_files:
             raise TypeError("_TestList does not contain files.")
-        expanded_include_files = set()
-        for path in include_files:
-            if self._test_file_explorer.is_glob_pattern(path):
-                expanded_include_files.update(set(self._test_file_explorer.iglob(path)))
-            else:
-                expanded_include_files.add(os.path.normpath(path))
-        self._filtered = self._filtered & expanded_include_files
+        match = self._make_matcher(include_files)
+        self._filtered = {test for test in self._filtered if match(test)}
         if force:
-            self._filtered |= set(self._roots) & expanded_include_files
+            self._filtered |= {test for test in self._roots if match(test)}
 
     def exclude_files(self, exclude_files):  # noqa: D406,D407,D411,D413
         """Exclude from the test list the files that match elements from 'exclude_files'.
@@ -198,29 +258,59 @@ class _TestList(object):
         if not self._tests_are_files:
             raise TypeError("_TestList does not contain files.")
         for path in exclude_files:
-            if self._test_file_explorer.is_glob_pattern(path):
-                paths = self._test_file_explorer.iglob(path)
-                for expanded_path in paths:
-                    self._filtered.discard(expanded_path)
-            else:
+            if not self._test_file_explorer.is_glob_pattern(path):
                 path = os.path.normpath(path)
                 if path not in self._roots:
                     raise ValueError(
                         ("Excluded test file {} does not exist, perhaps it was renamed or removed"
                          " , and should be modified in, or removed from, the exclude_files list.".
                          format(path)))
-                self._filtered.discard(path)
+        match = self._make_matcher(exclude_files)
+        self._filtered = {test for test in self._filtered if not match(test)}
+
+    def _make_matcher(self, paths):
+        """Return a callable indicating if a test matches any of the paths or glob patterns.
+
+        All of the glob patterns are compiled into a single regular expression which is matched
+        against the tests of the _TestList. Since the tests were found by expanding the roots, this
+        is equivalent to expanding each of the patterns without walking the directories again.
+        """
+        patterns = []
+        exact_paths = set()
+        for path in paths:
+            if self._test_file_explorer.is_glob_pattern(path):
+                patterns.append(path)
+            else:
+                exact_paths.add(os.path.normpath(path))
+        regex = globstar.compile_patterns(patterns)
+
+        def match(test):
+            """Return True if 'test' is one of the paths or matches one of the glob patterns."""
+            return test in exact_paths or regex.match(test) is not None
+
+        return match
 
     def match_tag_expression(self, tag_expression, get_tags):
         """Filter the test list to only include tests that match the tag expression.
 
+        The tags of each test are converted to a bitmask and the expression is only evaluated once
+        for each distinct bitmask, since most tests share the same few combinations of tags.
+
         Args:
-            tag_expression: a callable object that takes a list of tags and indicate if the required
-                condition is met by returning a boolean.
+            tag_expression: a tag matching expression, as returned by make_expression().
             get_tags: a callable object that takes a test and returns the corresponding list of
                 tags.
         """
-        self._filtered = {test for test in self._filtered if tag_expression(get_tags(test))}
+        matches = tag_expression.compile()
+        results = {}
+        filtered = set()
+        for test in self._filtered:
+            mask = _TAG_BITS.get_mask(get_tags(test))
+            if mask not in results:
+                results[mask] = matches(mask)
+            if results[mask]:
+                filtered.add(test)
+        self._filtered = filtered
 
     def include_any_pattern(self, patterns):
         """Filter the test list to only include tests that match any provided glob patterns."""
@@ -255,6 +345,47 @@ class _TestList(object):
 ##############################
 
 
+class _TagBits(object):
+    """The bit assigned to each tag so that a list of tags can be represented as an int bitmask.
+
+    The same bit is used for a tag by every test suite of the process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bits = {}
+
+    def get_bit(self, tag):
+        """Return the bit assigned to 'tag', assigning it the next unused bit if it has none."""
+        with self._lock:
+            bit = self._bits.get(tag)
+            if bit is None:
+                bit = self._bits[tag] = 1 << len(self._bits)
+            return bit
+
+    def get_mask(self, tags):
+        """Return the bitmask of the list of tags 'tags'."""
+        mask = 0
+        for tag in tags:
+            mask |= self.get_bit(tag)
+        return mask
+
+
+_TAG_BITS = _TagBits()
+
+
+def _get_children_bits(children):
+    """Return the bits of the tags of the _MatchExpression children and the other children."""
+    bits = 0
+    others = []
+    for child in children:
+        if isinstance(child, _MatchExpression):
+            bits |= _TAG_BITS.get_bit(child.tag)
+        else:
+            others.append(child.compile())
+    return bits, others
+
+
 class _AllOfExpression(object):
     """A tag matching expression that requires all child expressions to match."""
 
@@ -264,6 +395,13 @@ class _AllOfExpression(object):
     def __call__(self, file_tags):
         return all(child(file_tags) for child in self.__children)
 
+    def compile(self):
+        """Return a callable taking a bitmask of tags and indicating if the expression matches."""
+        bits, others = _get_children_bits(self.__children)
+        if not others:
+            return lambda mask: mask & bits == bits
+        return lambda mask: mask & bits == bits and all(other(mask) for other in others)
+
 
 class _AnyOfExpression(object):
     """A tag matching expression that requires at least one of the child expressions."""
@@ -274,6 +412,13 @@ class _AnyOfExpression(object):
     def __call__(self, file_tags):
         return any(child(file_tags) for child in self.__children)
 
+    def compile(self):
+        """Return a callable taking a bitmask of tags and indicating if the expression matches."""
+        bits, others = _get_children_bits(self.__children)
+        if not others:
+            return lambda mask: mask & bits != 0
+        return lambda mask: mask & bits != 0 or any(other(mask) for other in others)
+
 
 class _NotExpression(object):
     """A tag matching expression that matches if and only if the child expression does not match."""
@@ -284,6 +429,11 @@ class _NotExpression(object):
     def __call__(self, file_tags):
         return not self.__child(file_tags)
 
+    def compile(self):
+        """Return a callable taking a bitmask of tags and indicating if the expression matches."""
+        child = self.__child.compile()
+        return lambda mask: not child(mask)
+
 
 class _MatchExpression(object):
     """A tag matching expression that matches when a specific tag is present."""
@@ -294,6 +444,16 @@ class _MatchExpression(object):
     def __call__(self, file_tags):
         return self.__tag in file_tags
 
+    @property
+    def tag(self):
+        """Return the tag that must be present."""
+        return self.__tag
+
+    def compile(self):
+        """Return a callable taking a bitmask of tags and indicating if the expression matches."""
+        bit = _TAG_BITS.get_bit(self.__tag)
+        return lambda mask: mask & bit != 0
+
 
 def make_expression(conf):
     """Create a tag matching expression from an expression configuration.
@@ -551,9 +711,22 @@ class _MultiJSTestSelector(_JSTestSelector):
 class _CppTestSelectorConfig(_SelectorConfig):
     """_SelectorConfig subclass for cpp_integration_test and cpp_unit_test tests."""
 
-    def __init__(self, root=config.DEFAULT_INTEGRATION_TEST_LIST, roots=None, include_files=None,
-                 exclude_files=None):
-        """Initialize _CppTestSelectorConfig."""
+    def __init__(  # pylint: disable=too-many-arguments
+            self, root=config.DEFAULT_INTEGRATION_TEST_LIST, roots=None, include_files=None,
+            exclude_files=None, split_by_suite=None, num_suite_groups=None):
+        """Initialize _CppTestSelectorConfig.
+
+        :param split_by_suite: glob patterns of the unit test binaries to run as one test per suite
+               so that jobs can run their suites in parallel.
+        :param num_suite_groups: the number of tests each binary matching 'split_by_suite' is split
+               into. Each test runs a balanced group of the binary's suites. Defaults to one test
+               per suite.
+        """
+        self.split_by_suite = utils.default_if_none(split_by_suite, [])
+        self.num_suite_groups = num_suite_groups
+        if num_suite_groups is not None and num_suite_groups < 1:
+            raise ValueError("num_suite_groups must be a positive integer")
+
         if roots:
             # The 'roots' argument is only present when tests are specified on the command line
             # and in that case they take precedence over the tests in the root file.
@@ -577,8 +750,38 @@ class _CppTestSelector(_Selector):
             # Tests have been specified on the command line. We use them without additional
             # filtering.
             test_list = _TestList(self._test_file_explorer, selector_config.roots)
-            return test_list.get_tests()
-        return _Selector.select(self, selector_config)
+            tests, excluded = test_list.get_tests()
+        else:
+            tests, excluded = _Selector.select(self, selector_config)
+
+        if selector_config.split_by_suite:
+            tests = self._split_by_suite(tests, selector_config)
+        return tests, excluded
+
+    def _split_by_suite(self, tests, selector_config):
+        """Replace the binaries matching 'split_by_suite' with groups of their suites.
+
+        E.g. ["build/testA", ["build/testB", "suite1", "suite3"], ["build/testB", "suite2"]].
+        """
+        split_tests = []
+        for test in tests:
+            if not any(
+                    self._test_file_explorer.fnmatchcase(test, pattern)
+                    for pattern in selector_config.split_by_suite):
+                split_tests.append(test)
+                continue
+
+            suites = self._test_file_explorer.list_unittest_suites(test)
+            num_groups = utils.default_if_none(selector_config.num_suite_groups, len(suites))
+            num_groups = min(num_groups, len(suites))
+            if num_groups <= 1:
+                split_tests.append(test)
+                continue
+
+            # The suites are assigned to the groups in turn since their running times aren't known.
+            for i in range(num_groups):
+                split_tests.append([test] + suites[i::num_groups])
+        return split_tests
 
 
 class _DbTestSelectorConfig(_SelectorConfig):
@@ -710,18 +913,24 @@ _SELECTOR_REGISTRY = {
 }
 
 
-def filter_tests(test_kind, selector_config, test_file_explorer=_DEFAULT_TEST_FILE_EXPLORER):
+def filter_tests(test_kind, selector_config, test_file_explorer=None):
     """Filter the tests according to a specified configuration.
 
     Args:
         test_kind: the test kind, from _SELECTOR_REGISTRY.
         selector_config: a dict containing the selector configuration.
         test_file_explorer: the TestFileExplorer to use. Using a TestFileExplorer other than
-        the default one should not be needed except for mocking purposes.
+        the default one should not be needed except for mocking purposes or for sharing a
+        CachingTestFileExplorer between the suites.
     """
+    if test_file_explorer is None:
+        test_file_explorer = _DEFAULT_TEST_FILE_EXPLORER
     if test_kind not in _SELECTOR_REGISTRY:
         raise ValueError("Unknown test kind '{}'".format(test_kind))
     selector_config_class, selector_class = _SELECTOR_REGISTRY[test_kind]
     selector = selector_class(test_file_explorer)
     selector_config = selector_config_class(**selector_config)
-    return selector.select(selector_config)
+    tests = selector.select(selector_config)
+    # Save the tags of the JavaScript test files parsed while selecting the tests, if any.
+    tagindex.get_tag_index(config.TAG_INDEX_FILE).save()
+    return tests
@@ -6,6 +6,7 @@ import os
 
 from . import config as _config
 from . import errors
+from . import selector as _selector
 from . import utils
 from .testing import suite as _suite
 
@@ -39,6 +40,10 @@ def create_test_membership_map(fail_on_missing_selector=False, test_kind=None):
     kinds of tests can be specified as an iterable (e.g. a tuple or list). This function parses the
     definition of every available test suite, which is an expensive operation. It is therefore
     desirable for it to only ever be called once.
+
+    The tests of every suite are selected using the same CachingTestFileExplorer so that the glob
+    patterns shared by the roots of the suites are only expanded once, and the tags of each test
+    file are only parsed once.
     """
     if test_kind is not None:
         if isinstance(test_kind, str):
@@ -46,6 +51,7 @@ def create_test_membership_map(fail_on_missing_selector=False, test_kind=None):
 
         test_kind = frozenset(test_kind)
 
+    test_file_explorer = _selector.CachingTestFileExplorer()
     test_membership = collections.defaultdict(list)
     suite_names = get_named_suites()
     for suite_name in suite_names:
@@ -53,7 +59,7 @@ def create_test_membership_map(fail_on_missing_selector=False, test_kind=None):
             suite_config = _get_suite_config(suite_name)
             if test_kind and suite_config.get("test_kind") not in test_kind:
                 continue
-            suite = _suite.Suite(suite_name, suite_config)
+            suite = _suite.Suite(suite_name, suite_config, test_file_explorer=test_file_explorer)
         except IOError as err:
             # We ignore errors from missing files referenced in the test suite's "selector"
             # section. Certain test suites (e.g. unittests.yml) have a dedicated text file to
@@ -9,9 +9,13 @@ from . import hooks as _hooks
 from . import job as _job
 from .queue_element import queue_elem_factory
 from . import report as _report
+from . import resources as _resources
+from . import result_cache as _result_cache
+from . import runtimes as _runtimes
 from . import testcases
 from .. import config as _config
 from .. import errors
+from .. import selector as _selector
 from .. import utils
 from ..core import network
 from ..utils.queue import Queue
@@ -28,8 +32,12 @@ class TestSuiteExecutor(object):  # pylint: disable=too-many-instance-attributes
 
     def __init__(  # pylint: disable=too-many-arguments
             self, exec_logger, suite, config=None, fixture=None, hooks=None, archive_instance=None,
-            archive=None):
-        """Initialize the TestSuiteExecutor with the test suite to run."""
+            archive=None, fixture_pool=None):
+        """Initialize the TestSuiteExecutor with the test suite to run.
+
+        If 'fixture_pool' is specified, then fixtures are taken from it when a compatible one is
+        already running and are returned to it instead of being torn down.
+        """
         self.logger = exec_logger
 
         if _config.SHELL_CONN_STRING is not None:
@@ -51,11 +59,34 @@ class TestSuiteExecutor(object):  # pylint: disable=too-many-instance-attributes
                                                       archive)
 
         self._suite = suite
+        self._fixture_pool = fixture_pool
         self.num_tests = len(suite.tests) * suite.options.num_repeat_tests
         self.test_queue_logger = self.logger.new_testqueue_logger(suite.test_kind)
 
+        # The tests whose cached result was a pass are reported as cached instead of being run.
+        self._result_cache = None
+        self._result_cache_keys = {}
+        if _config.RESULT_CACHE_DIR is not None:
+            self._result_cache = _result_cache.ResultCache(_config.RESULT_CACHE_DIR)
+        (self._tests_to_run, self._cached_tests) = self._partition_cached_tests()
+        self._cached_report = _report.TestReport(self.logger, suite.options)
+
+        self._resource_budget = None
+        self._max_capacity = None
+        if _config.SCHEDULE_BY_RESOURCES:
+            self._max_capacity = _resources.machine_capacity()
+            self.logger.info("Running tests based on a capacity of %d resource units.",
+                             self._max_capacity)
+        elif _config.ADAPTIVE_JOBS:
+            self._max_capacity = suite.options.num_jobs
+        if self._max_capacity is not None:
+            self._resource_budget = _resources.ResourceBudget(self._max_capacity)
+        # The resource weight of each test, which is looked up once even when it is repeated.
+        self._test_file_explorer = _selector.TestFileExplorer()
+        self._test_weights = {}
+
         # Must be done after getting buildlogger configuration.
-        self._jobs = self._create_jobs(self.num_tests)
+        self._jobs = self._create_jobs(len(self._tests_to_run) * suite.options.num_repeat_tests)
 
     def _num_jobs_to_start(self, suite, num_tests):
         """
@@ -85,6 +116,10 @@ class TestSuiteExecutor(object):  # pylint: disable=too-many-instance-attributes
         :return: List of jobs.
         """
         n_jobs_to_start = self._num_jobs_to_start(self._suite, num_tests)
+        if self._fixture_pool is not None:
+            # Fixtures pooled for job numbers this suite won't use would otherwise keep running,
+            # and holding onto their ports and dbpaths, until the end of the resmoke.py invocation.
+            self._fixture_pool.evict(n_jobs_to_start)
         return [self._make_job(job_num) for job_num in range(n_jobs_to_start)]
 
     def run(self):
@@ -100,25 +135,31 @@ class TestSuiteExecutor(object):  # pylint: disable=too-many-instance-attributes
         # The first run of the job will set up the fixture.
         setup_flag = threading.Event()
         # We reset the internal state of the PortAllocator so that ports used by the fixture during
-        # a test suite run earlier can be reused during this current test suite.
-        network.PortAllocator.reset()
+        # a test suite run earlier can be reused during this current test suite. The range of ports
+        # of each job is sized for the number of jobs and the topology of their fixtures.
+        num_fixture_ports = max([job.fixture.get_num_ports() for job in self._jobs], default=0)
+        network.PortAllocator.reset(num_jobs=len(self._jobs), num_fixture_ports=num_fixture_ports)
         teardown_flag = None
         try:
             num_repeat_suites = self._suite.options.num_repeat_suites
             while num_repeat_suites > 0:
                 test_queue = self._make_test_queue()
 
-                partial_reports = [job.report for job in self._jobs]
+                partial_reports = [job.report for job in self._jobs] + [self._cached_report]
                 self._suite.record_test_start(partial_reports)
 
                 # Have the Job threads destroy their fixture during the final repetition after they
                 # finish running their last test. This avoids having a large number of processes
                 # still running if an Evergreen task were to time out from a hang/deadlock being
-                # triggered.
-                teardown_flag = threading.Event() if num_repeat_suites == 1 else None
+                # triggered. Fixtures which are returned to the fixture pool are kept running.
+                teardown_flag = None
+                if num_repeat_suites == 1 and self._get_fixture_pool_key() is None:
+                    teardown_flag = threading.Event()
                 (report, interrupted) = self._run_tests(test_queue, setup_flag, teardown_flag)
 
                 self._suite.record_test_end(report)
+                self._record_runtime_history(report)
+                self._record_results(report)
 
                 if setup_flag and setup_flag.is_set():
                     self.logger.error("Setup of one of the job fixtures failed")
@@ -154,6 +195,7 @@ class TestSuiteExecutor(object):  # pylint: disable=too-many-instance-attributes
                 # Clear the report so it can be reused for the next execution.
                 for job in self._jobs:
                     job.report.reset()
+                self._cached_report.reset()
                 num_repeat_suites -= 1
         finally:
             if not teardown_flag:
@@ -172,6 +214,7 @@ class TestSuiteExecutor(object):  # pylint: disable=too-many-instance-attributes
         threads = []
         interrupt_flag = threading.Event()
         user_interrupted = False
+        load_monitor = self._start_load_monitor()
         try:
             # Run each Job instance in its own thread.
             for job in self._jobs:
@@ -184,8 +227,9 @@ class TestSuiteExecutor(object):  # pylint: disable=too-many-instance-attributes
                 threads.append(thr)
                 # SERVER-24729 Need to stagger when jobs start to reduce I/O load if there
                 # are many of them.  Both the 5 and the 10 are arbitrary.
-                # Currently only enabled on Evergreen.
-                if _config.STAGGER_JOBS and len(threads) >= 5:
+                # Currently only enabled on Evergreen. The load monitor already ramps up the number
+                # of fixtures being set up at the same time based on the load of the machine.
+                if _config.STAGGER_JOBS and load_monitor is None and len(threads) >= 5:
                     time.sleep(10)
 
             joined = False
@@ -211,7 +255,10 @@ class TestSuiteExecutor(object):  # pylint: disable=too-many-instance-attributes
 
         self.logger.debug("Threads are completed!")
 
-        reports = [job.report for job in self._jobs]
+        if load_monitor is not None:
+            load_monitor.stop()
+
+        reports = [job.report for job in self._jobs] + [self._cached_report]
         combined_report = _report.TestReport.combine(*reports)
 
         # We cannot return 'interrupt_flag.is_set()' because the interrupt flag can be set by a Job
@@ -219,28 +266,104 @@ class TestSuiteExecutor(object):  # pylint: disable=too-many-instance-attributes
         # StopExecution exception in TestSuiteExecutor.run() if the user triggered the interrupt.
         return (combined_report, user_interrupted)
 
+    def _start_load_monitor(self):
+        """Start adjusting the resources available to the jobs if --adaptiveJobs was specified.
+
+        Return the started LoadMonitor, or None.
+        """
+        if not _config.ADAPTIVE_JOBS:
+            return None
+
+        min_capacity = min(_config.MIN_JOBS, self._max_capacity)
+        load_monitor = _resources.LoadMonitor(self.logger, self._resource_budget, min_capacity,
+                                              self._max_capacity)
+        load_monitor.start()
+        return load_monitor
+
+    def _record_runtime_history(self, report):
+        """Append the runtimes of the tests in 'report' to the history if --runtimeHistoryDir."""
+        if _config.RUNTIME_HISTORY_DIR is None:
+            return
+
+        history = _runtimes.get_runtime_history(_config.RUNTIME_HISTORY_DIR)
+        history.record(self._suite.get_name(), self._get_fixture_class(), report)
+        if history.needs_compaction():
+            history.compact()
+
+    def _partition_cached_tests(self):
+        """Return a (tests to run, tests whose cached result was a pass) pair.
+
+        All of the tests are run unless --resultCacheDir was specified.
+        """
+        tests = self._suite.tests
+        if self._result_cache is None or not utils.is_string_list(tests):
+            return (tests, [])
+
+        suite_key = self._result_cache.make_suite_key(self._suite.get_name(),
+                                                      self._suite.get_executor_config())
+        tests_to_run = []
+        cached_tests = []
+        for test_name in tests:
+            key = self._result_cache.make_test_key(suite_key, test_name)
+            self._result_cache_keys[test_name] = key
+            if self._result_cache.has_passed(key):
+                cached_tests.append(test_name)
+            else:
+                tests_to_run.append(test_name)
+
+        self.logger.info("Not running %d of the %d %ss because their cached result was a pass.",
+                         len(cached_tests), len(tests), self._suite.test_kind)
+        return (tests_to_run, cached_tests)
+
+    def _record_results(self, report):
+        """Record the outcome of the tests in 'report' in the result cache if --resultCacheDir."""
+        if self._result_cache is None:
+            return
+
+        self._result_cache.record(self._result_cache_keys, report)
+
     def _teardown_fixtures(self):
         """Tear down all of the fixtures.
 
+        Fixtures which are still running are returned to the fixture pool instead, if there is one.
+
         Returns true if all fixtures were torn down successfully, and
         false otherwise.
         """
         success = True
+        pool_key = self._get_fixture_pool_key()
         for job in self._jobs:
+            job_num = job.manager.job_num
+            if pool_key is not None and job.fixture.is_running():
+                self._fixture_pool.release(job_num, pool_key, job.fixture)
+                continue
+
             if not job.manager.teardown_fixture(self.logger):
                 self.logger.warning("Teardown of %s of job %s was not successful", job.fixture,
-                                    job.job_num)
+                                    job_num)
                 success = False
         return success
 
+    def _get_fixture_pool_key(self):
+        """Return the key of the suite's fixtures in the fixture pool, or None if not pooled."""
+        if self._fixture_pool is None:
+            return None
+
+        fixture_class = self._get_fixture_class()
+        if fixture_class == fixtures.EXTERNAL_FIXTURE_CLASS:
+            # The external fixture wasn't started by resmoke.py so we must never clear its data.
+            return None
+
+        return self._fixture_pool.make_key(fixture_class, self.fixture_config)
+
     def _make_fixture(self, job_num, job_logger):
         """Create a fixture for a job."""
 
         fixture_config = {}
-        fixture_class = fixtures.NOOP_FIXTURE_CLASS
+        fixture_class = self._get_fixture_class()
         if self.fixture_config is not None:
             fixture_config = self.fixture_config.copy()
-            fixture_class = fixture_config.pop("class")
+            fixture_config.pop("class")
 
         fixture_logger = job_logger.new_fixture_logger(fixture_class)
 
@@ -270,13 +393,22 @@ class TestSuiteExecutor(object):  # pylint: disable=too-many-instance-attributes
         """
         job_logger = self.logger.new_job_logger(self._suite.test_kind, job_num)
 
-        fixture = self._make_fixture(job_num, job_logger)
+        fixture = None
+        pool_key = self._get_fixture_pool_key()
+        if pool_key is not None:
+            fixture = self._fixture_pool.acquire(job_num, pool_key)
+        fixture_reused = fixture is not None
+        if fixture_reused:
+            fixture.logger.reset_build_id(job_logger.build_id)
+        else:
+            fixture = self._make_fixture(job_num, job_logger)
         hooks = self._make_hooks(fixture)
 
         report = _report.TestReport(job_logger, self._suite.options)
 
         return _job.Job(job_num, job_logger, fixture, hooks, report, self.archival,
-                        self._suite.options, self.test_queue_logger)
+                        self._suite.options, self.test_queue_logger, fixture_reused=fixture_reused,
+                        resource_budget=self._resource_budget)
 
     def _num_times_to_repeat_tests(self):
         """
@@ -297,7 +429,59 @@ class TestSuiteExecutor(object):  # pylint: disable=too-many-instance-attributes
         """
         test_case = testcases.make_test_case(self._suite.test_kind, self.test_queue_logger,
                                              test_name, **self.test_config)
-        return queue_elem_factory(test_case, self.test_config, self._suite.options)
+        queue_elem = queue_elem_factory(test_case, self.test_config, self._suite.options)
+        if self._resource_budget is not None:
+            queue_elem.resource_weight = self._get_test_weight(test_name)
+        return queue_elem
+
+    def _get_test_weight(self, test_name):
+        """Return the number of resource units 'test_name' is expected to use."""
+        if not isinstance(test_name, str):
+            return _resources.get_test_weight(test_name)
+
+        if test_name not in self._test_weights:
+            self._test_weights[test_name] = _resources.get_test_weight(
+                test_name, test_file_explorer=self._test_file_explorer)
+        return self._test_weights[test_name]
+
+    def _get_tests_in_queue_order(self):
+        """
+        Return the tests of the suite to run in the order they should be added to the queue.
+
+        If --testRuntimesFile or --runtimeHistoryDir was specified, then the tests expected to run
+        the longest are queued first so that they don't end up running alone at the tail of the
+        suite. The order of the suite is kept with --rerunFailedFrom so the tests which failed
+        before run first.
+
+        :return: List of test names.
+        """
+        tests = self._tests_to_run
+        if not utils.is_string_list(tests):
+            return tests
+
+        if _config.RERUN_FAILED_FROM is not None:
+            # The tests which failed in the earlier report were already moved to the front.
+            return tests
+
+        if _config.TEST_RUNTIMES_FILE is not None:
+            self.logger.info("Ordering %ss by decreasing historical runtime from %s.",
+                             self._suite.test_kind, _config.TEST_RUNTIMES_FILE)
+            runtimes = _runtimes.load_runtimes(_config.TEST_RUNTIMES_FILE)
+        elif _config.RUNTIME_HISTORY_DIR is not None:
+            self.logger.info("Ordering %ss by decreasing historical runtime from %s.",
+                             self._suite.test_kind, _config.RUNTIME_HISTORY_DIR)
+            history = _runtimes.get_runtime_history(_config.RUNTIME_HISTORY_DIR)
+            runtimes = history.get_runtimes(self._suite.get_name(), self._get_fixture_class())
+        else:
+            return tests
+
+        return _runtimes.order_longest_first(tests, runtimes)
+
+    def _get_fixture_class(self):
+        """Return the name of the fixture class the tests run against."""
+        if self.fixture_config is None:
+            return fixtures.NOOP_FIXTURE_CLASS
+        return self.fixture_config["class"]
 
     def _make_test_queue(self):
         """
@@ -310,15 +494,19 @@ class TestSuiteExecutor(object):  # pylint: disable=too-many-instance-attributes
         object, which will requeue itself if it has not run for the expected duration.
 
         Use a multi-consumer queue instead of a unittest.TestSuite so that the test cases can
-        be dispatched to multiple threads.
+        be dispatched to multiple threads. The order of the tests within each repetition is given
+        by _get_tests_in_queue_order().
 
         :return: Queue of testcases to run.
         """
         queue = Queue()
+        tests = self._get_tests_in_queue_order()
 
         # Put all the test cases in a queue.
         for _ in range(self._num_times_to_repeat_tests()):
-            for test_name in self._suite.tests:
+            for test_name in self._cached_tests:
+                self._cached_report.add_cached(test_name)
+            for test_name in tests:
                 queue_elem = self._create_queue_elem_for_test_name(test_name)
                 queue.put(queue_elem)
 
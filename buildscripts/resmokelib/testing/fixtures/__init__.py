@@ -3,6 +3,7 @@
 from .external import ExternalFixture as _ExternalFixture
 from .interface import NoOpFixture as _NoOpFixture
 from .interface import make_fixture
+from .pool import FixturePool
 from ...utils import autoloader as _autoloader
 
 EXTERNAL_FIXTURE_CLASS = _ExternalFixture.REGISTERED_NAME
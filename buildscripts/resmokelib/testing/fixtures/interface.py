@@ -1,5 +1,6 @@
 """Interface of the different fixtures for executing JSTests against."""
 
+import concurrent.futures
 import os.path
 import time
 from enum import Enum
@@ -38,6 +39,22 @@ def make_fixture(class_name, *args, **kwargs):
     return _FIXTURES[class_name](*args, **kwargs)
 
 
+def run_concurrently(funcs):
+    """Call each of the no-argument functions in 'funcs' on its own thread and wait for all of them.
+
+    Return the list of their return values. If any of the functions raises an exception, then the
+    exception of the earliest such function in 'funcs' is re-raised once all of them have finished.
+    """
+
+    funcs = list(funcs)
+    if len(funcs) <= 1:
+        return [func() for func in funcs]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(funcs)) as executor:
+        futures = [executor.submit(func) for func in funcs]
+    return [future.result() for future in futures]
+
+
 class Fixture(object, metaclass=registry.make_registry_metaclass(_FIXTURES)):
     """Base class for all fixtures."""
 
@@ -49,6 +66,9 @@ class Fixture(object, metaclass=registry.make_registry_metaclass(_FIXTURES)):
     _LATEST_FCV = multiversion.LATEST_FCV
     _LAST_STABLE_BIN_VERSION = multiversion.LAST_STABLE_BIN_VERSION
 
+    # Databases that aren't dropped by clear_data().
+    _INTERNAL_DBS = ("admin", "config", "local", "$external")
+
     def __init__(self, logger, job_num, dbpath_prefix=None):
         """Initialize the fixture with a logger instance."""
 
@@ -71,6 +91,10 @@ class Fixture(object, metaclass=registry.make_registry_metaclass(_FIXTURES)):
         """Return any pids owned by this fixture."""
         raise NotImplementedError("pids must be implemented by Fixture subclasses %s" % self)
 
+    def get_num_ports(self):  # pylint: disable=no-self-use
+        """Return the number of ports the fixture allocates from the PortAllocator."""
+        return 0
+
     def setup(self):
         """Create the fixture."""
         pass
@@ -112,6 +136,23 @@ class Fixture(object, metaclass=registry.make_registry_metaclass(_FIXTURES)):
         """Return true if the fixture is still operating and more tests and can be run."""
         return True
 
+    def clear_data(self):
+        """Drop the databases created by tests so the running fixture can be reused.
+
+        Users and roles, server parameters, failpoints, and the contents of the internal databases
+        (e.g. config.settings) are not reset. Suites whose tests change them must not reuse pooled
+        fixtures.
+        """
+        self._drop_test_databases(self.mongo_client())
+
+    def _drop_test_databases(self, client):
+        """Drop all databases except for the internal ones using 'client'."""
+        for db_name in client.list_database_names():
+            if db_name in Fixture._INTERNAL_DBS:
+                continue
+            self.logger.info("Dropping database %s", db_name)
+            client.drop_database(db_name)
+
     def get_dbpath_prefix(self):
         """Return dbpath prefix."""
         return self._dbpath_prefix
@@ -224,6 +265,10 @@ class NoOpFixture(Fixture):
         """Return the mongo_client connection."""
         raise NotImplementedError("NoOpFixture does not support a mongo_client")
 
+    def clear_data(self):
+        """Do nothing since there is no data to clear."""
+        pass
+
     def get_internal_connection_string(self):
         """Return the internal connection string."""
         return None
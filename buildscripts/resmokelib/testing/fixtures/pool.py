@@ -0,0 +1,97 @@
+"""Pool of running fixtures that can be reused by later suites of the same resmoke.py invocation."""
+
+import json
+import threading
+
+from ... import errors
+
+
+class FixturePool(object):
+    """Keep fixtures running after a suite finishes so the next compatible suite can reuse them.
+
+    At most one fixture is kept per job number because a fixture's ports and dbpaths are derived
+    from the job number it was created for. Fixtures are matched on their normalized configuration
+    and must have their data cleared by the caller before they are reused.
+
+    Only the databases created by tests are cleared, so fixtures should only be pooled for suites
+    whose tests don't leave behind users, roles, server parameters, failpoints, or changes to the
+    config database. See Fixture.clear_data().
+    """
+
+    def __init__(self, logger):
+        """Initialize the FixturePool."""
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._fixtures = {}  # Map of job number to (key, fixture) pairs.
+
+    @staticmethod
+    def make_key(fixture_class, fixture_config):
+        """Return the key that identifies fixtures created from the same configuration."""
+        return "{}:{}".format(fixture_class, json.dumps(fixture_config, sort_keys=True,
+                                                        default=str))
+
+    def acquire(self, job_num, key):
+        """Return the running fixture for 'job_num' if it was created with 'key', or None.
+
+        A pooled fixture for 'job_num' with a different configuration is torn down because it would
+        otherwise conflict with the ports and dbpaths of the fixture about to be created.
+        """
+        with self._lock:
+            (pooled_key, fixture) = self._fixtures.pop(job_num, (None, None))
+
+        if fixture is None:
+            return None
+
+        if pooled_key == key and fixture.is_running():
+            self.logger.info("Reusing %s from a previous suite.", fixture)
+            return fixture
+
+        self._teardown(fixture)
+        return None
+
+    def release(self, job_num, key, fixture):
+        """Return 'fixture' to the pool so a later suite can reuse it."""
+        with self._lock:
+            (_, previous) = self._fixtures.pop(job_num, (None, None))
+            self._fixtures[job_num] = (key, fixture)
+
+        if previous is not None and previous is not fixture:
+            self._teardown(previous)
+
+    def evict(self, num_jobs):
+        """Tear down the pooled fixtures for job numbers which a suite running 'num_jobs' won't use.
+
+        Return true if all fixtures were torn down successfully, and false otherwise.
+        """
+        with self._lock:
+            evicted = [job_num for job_num in self._fixtures if job_num >= num_jobs]
+            fixtures = [self._fixtures.pop(job_num)[1] for job_num in sorted(evicted)]
+
+        success = True
+        for fixture in fixtures:
+            success = self._teardown(fixture) and success
+        return success
+
+    def teardown_all(self):
+        """Tear down all of the pooled fixtures.
+
+        Return true if all fixtures were torn down successfully, and false otherwise.
+        """
+        with self._lock:
+            fixtures = [fixture for (_, fixture) in self._fixtures.values()]
+            self._fixtures = {}
+
+        success = True
+        for fixture in fixtures:
+            success = self._teardown(fixture) and success
+        return success
+
+    def _teardown(self, fixture):
+        """Tear down a fixture that is no longer needed, logging instead of raising on errors."""
+        self.logger.info("Tearing down pooled %s.", fixture)
+        try:
+            fixture.teardown(finished=True)
+            return True
+        except errors.ServerFailure as err:
+            self.logger.warning("Teardown of pooled %s was not successful: %s", fixture, err)
+            return False
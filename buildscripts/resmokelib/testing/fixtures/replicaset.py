@@ -1,6 +1,8 @@
 """Replica set fixture for executing JSTests against."""
 
+import json
 import os.path
+import shutil
 import time
 
 import bson.errors
@@ -10,10 +12,12 @@ import pymongo.write_concern
 
 from . import interface
 from . import replicaset_utils
+from . import snapshot as _snapshot
 from . import standalone
 from ... import config
 from ... import errors
 from ... import utils
+from ...utils import backoff as _backoff
 
 
 class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-instance-attributes
@@ -104,34 +108,53 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
         self.initial_sync_node = None
         self.initial_sync_node_idx = -1
 
+        # Snapshot of the data files of the nodes after the replica set was first initiated. It is
+        # only taken when the fixture was set up with empty dbpaths.
+        self._snapshot = None
+        self._take_snapshot_when_ready = False
+
     def setup(self):  # pylint: disable=too-many-branches,too-many-statements
         """Set up the replica set."""
-        self.replset_name = self.mongod_options.get("replSet", "rs")
-        if not self.nodes:
+        self.reserve_ports()
+
+        restore_snapshot = False
+        snapshot = self._get_snapshot()
+        if snapshot is not None:
+            restore_snapshot = snapshot.exists()
+            self._take_snapshot_when_ready = not restore_snapshot
+            if restore_snapshot:
+                for (i, node) in enumerate(self._get_all_nodes()):
+                    snapshot.restore_dbpath(i, node.mongod_options["dbpath"])
+                    # Prevent the node from clearing the restored data files when it is set up.
+                    node.preserve_dbpath = True
+
+        try:
             for i in range(self.num_nodes):
-                node = self._new_mongod(i, self.replset_name)
-                self.nodes.append(node)
+                if self.linear_chain and i > 0:
+                    self.nodes[i].mongod_options["set_parameters"][
+                        "failpoint.forceSyncSourceCandidate"] = {
+                            "mode": "alwaysOn",
+                            "data": {
+                                "hostAndPort": self.nodes[i - 1].get_internal_connection_string()
+                            }
+                        }
+                self.nodes[i].setup()
 
-        for i in range(self.num_nodes):
-            if self.linear_chain and i > 0:
-                self.nodes[i].mongod_options["set_parameters"][
-                    "failpoint.forceSyncSourceCandidate"] = {
-                        "mode": "alwaysOn",
-                        "data": {"hostAndPort": self.nodes[i - 1].get_internal_connection_string()}
-                    }
-            self.nodes[i].setup()
-
-        if self.start_initial_sync_node:
-            if not self.initial_sync_node:
-                self.initial_sync_node_idx = len(self.nodes)
-                self.initial_sync_node = self._new_mongod(self.initial_sync_node_idx,
-                                                          self.replset_name)
-            self.initial_sync_node.setup()
-            self.initial_sync_node.await_ready()
+            if self.initial_sync_node:
+                self.initial_sync_node.setup()
+        finally:
+            if restore_snapshot:
+                for node in self._get_all_nodes():
+                    node.preserve_dbpath = False
 
         # We need only to wait to connect to the first node of the replica set because we first
-        # initiate it as a single node replica set.
-        self.nodes[0].await_ready()
+        # initiate it as a single node replica set. The other nodes continue starting up in the
+        # meantime.
+        if self.initial_sync_node:
+            interface.run_concurrently(
+                [self.initial_sync_node.await_ready, self.nodes[0].await_ready])
+        else:
+            self.nodes[0].await_ready()
 
         # Initiate the replica set.
         members = []
@@ -158,6 +181,8 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
         self.auth(client, self.auth_options)
 
         if client.local.system.replset.count():
+            if restore_snapshot:
+                self._step_up_restored_primary(client)
             # Skip initializing the replset if there is an existing configuration.
             return
 
@@ -212,8 +237,7 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
         if self.nodes[1:]:
             # Wait to connect to each of the secondaries before running the replSetReconfig
             # command.
-            for node in self.nodes[1:]:
-                node.await_ready()
+            interface.run_concurrently([node.await_ready for node in self.nodes[1:]])
             repl_config["version"] = 2
             repl_config["members"] = members
             self.logger.info("Issuing replSetReconfig command: %s", repl_config)
@@ -221,6 +245,28 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
             self._configure_repl_set(client, {"replSetReconfig": repl_config, "force": True})
             self._await_secondaries()
 
+    def reserve_ports(self):
+        """Create the nodes of the replica set and allocate their ports in order."""
+        self.replset_name = self.mongod_options.get("replSet", "rs")
+        if not self.nodes:
+            for i in range(self.num_nodes):
+                node = self._new_mongod(i, self.replset_name)
+                self.nodes.append(node)
+
+        if self.start_initial_sync_node and not self.initial_sync_node:
+            self.initial_sync_node_idx = len(self.nodes)
+            self.initial_sync_node = self._new_mongod(self.initial_sync_node_idx,
+                                                      self.replset_name)
+
+        for node in self.nodes:
+            node.reserve_ports()
+        if self.initial_sync_node:
+            self.initial_sync_node.reserve_ports()
+
+    def get_num_ports(self):
+        """Return the number of ports the fixture allocates from the PortAllocator."""
+        return self.num_nodes + (1 if self.start_initial_sync_node else 0)
+
     def pids(self):
         """:return: all pids owned by this fixture if any."""
         pids = []
@@ -235,6 +281,7 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
         # if a heartbeat times out during the quorum check. We retry three times to reduce
         # the chance of failing this way.
         num_initiate_attempts = 3
+        backoff = _backoff.Backoff(initial_secs=2, max_secs=5)
         for attempt in range(1, num_initiate_attempts + 1):
             try:
                 client.admin.command(cmd_obj)
@@ -254,7 +301,7 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
                     msg = "Exceeded number of retries while configuring the replica set fixture"
                     self.logger.error(msg + ".")
                     raise errors.ServerFailure(msg)
-                time.sleep(5)  # Wait a little bit before trying again.
+                backoff.sleep()  # Wait a little bit before trying again.
 
     def await_last_op_committed(self):
         """Wait for the last majority committed op to be visible."""
@@ -285,18 +332,127 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
         self._setup_sessions_collection()
         self._setup_cwrwc_defaults()
 
+        if self._take_snapshot_when_ready:
+            self._take_snapshot_when_ready = False
+            self._take_snapshot()
+
+    def _get_all_nodes(self):
+        """Return the nodes of the replica set followed by the initial sync node, if any."""
+        if self.initial_sync_node:
+            return self.nodes + [self.initial_sync_node]
+        return list(self.nodes)
+
+    def _get_snapshot(self):
+        """Return the snapshot to restore the nodes from when they have no data, or None.
+
+        Snapshots are only used when --fixtureSnapshotDir is specified and the replica set isn't
+        part of a sharded cluster, whose nodes also depend on the data of the other replica sets.
+        """
+        if config.FIXTURE_SNAPSHOT_DIR is None:
+            return None
+
+        if "shardsvr" in self.mongod_options or self.replset_config_options.get("configsvr"):
+            return None
+
+        if any(node.preserve_dbpath for node in self._get_all_nodes()):
+            # The nodes are meant to start up with their existing data files.
+            return None
+
+        if self._snapshot is None:
+            dirname = os.path.join(config.FIXTURE_SNAPSHOT_DIR, "job{}".format(self.job_num),
+                                   self.replset_name)
+            self._snapshot = _snapshot.DbpathSnapshot(self.logger, dirname,
+                                                      self._get_snapshot_key())
+        return self._snapshot
+
+    def _get_snapshot_key(self):
+        """Return a key describing everything the initiated data files of the nodes depend on."""
+
+        def executable_version(executable):
+            executable = utils.default_if_none(executable, config.DEFAULT_MONGOD_EXECUTABLE)
+            pathname = shutil.which(executable) or executable
+            return [pathname, os.path.getmtime(pathname) if os.path.isfile(pathname) else None]
+
+        return json.dumps({
+            "nodes": [[executable_version(node.mongod_executable), node.mongod_options]
+                      for node in self._get_all_nodes()],
+            "replset_config_options": self.replset_config_options,
+            "all_nodes_electable": self.all_nodes_electable,
+            "voting_secondaries": self.voting_secondaries,
+            "write_concern_majority_journal_default": self.write_concern_majority_journal_default,
+            "default_read_concern": self.default_read_concern,
+            "default_write_concern": self.default_write_concern,
+        }, sort_keys=True, default=str)
+
+    def _take_snapshot(self):
+        """Save a copy of the data files of each node while it is fsync-locked.
+
+        The secondaries are copied before the primary so that no node in the snapshot is ahead of
+        the primary. Failing to take the snapshot isn't an error because it is only an optimization.
+        """
+        primary_client = self.auth(self.nodes[0].mongo_client(), self.auth_options)
+        if not primary_client.admin.command("serverStatus")["storageEngine"]["persistent"]:
+            self.logger.info("Not saving a snapshot of the replica set because its storage engine"
+                             " doesn't persist any data files.")
+            return
+
+        self.logger.info("Saving a snapshot of the data files of the replica set.")
+        self._snapshot.clear()
+        nodes = self._get_all_nodes()
+        try:
+            for index in reversed(range(len(nodes))):
+                client = self.auth(nodes[index].mongo_client(
+                    read_preference=pymongo.ReadPreference.SECONDARY), self.auth_options)
+                client.admin.command("fsync", lock=True)
+                try:
+                    self._snapshot.save_dbpath(index, nodes[index].mongod_options["dbpath"])
+                finally:
+                    client.admin.command("fsyncUnlock")
+            self._snapshot.commit()
+        except (EnvironmentError, shutil.Error, pymongo.errors.PyMongoError) as err:
+            self.logger.warning("Failed to save a snapshot of the replica set: %s", err)
+            self._snapshot.clear()
+
+    def _step_up_restored_primary(self, client):
+        """Run replSetStepUp on the first node after the nodes were restored from a snapshot.
+
+        The restored replica set config gives the secondaries a priority of 0 and an election
+        timeout of 24 hours when not all nodes are electable, so the first node would otherwise
+        not be elected primary. The command is retried until the other nodes have started up and
+        can vote for it.
+        """
+        retry_time_secs = ReplicaSetFixture.AWAIT_REPL_TIMEOUT_MINS * 60
+        retry_start_time = time.time()
+        backoff = _backoff.Backoff()
+        while True:
+            if client.admin.command("isMaster")["ismaster"]:
+                return
+            try:
+                self.logger.info("Running replSetStepUp on the restored node on port %d.",
+                                 self.nodes[0].port)
+                client.admin.command("replSetStepUp")
+                return
+            except pymongo.errors.OperationFailure as err:
+                if time.time() - retry_start_time > retry_time_secs:
+                    raise errors.ServerFailure(
+                        "The restored node on port {} of replica set {} did not step up in {}"
+                        " seconds: {}".format(self.nodes[0].port, self.replset_name,
+                                              retry_time_secs, err))
+            backoff.sleep()  # Wait a little bit before trying again.
+
     def _await_primary(self):
         # Wait for the primary to be elected.
         # Since this method is called at startup we expect the first node to be primary even when
         # self.all_nodes_electable is True.
         primary = self.nodes[0]
         client = primary.mongo_client()
+        backoff = _backoff.Backoff()
         while True:
             self.logger.info("Waiting for primary on port %d to be elected.", primary.port)
             is_master = client.admin.command("isMaster")["ismaster"]
             if is_master:
                 break
-            time.sleep(0.1)  # Wait a little bit before trying again.
+            backoff.sleep()  # Wait a little bit before trying again.
         self.logger.info("Primary on port %d successfully elected.", primary.port)
 
     def _await_secondaries(self):
@@ -309,13 +465,14 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
 
         for secondary in secondaries:
             client = secondary.mongo_client(read_preference=pymongo.ReadPreference.SECONDARY)
+            backoff = _backoff.Backoff()
             while True:
                 self.logger.info("Waiting for secondary on port %d to become available.",
                                  secondary.port)
                 is_secondary = client.admin.command("isMaster")["secondary"]
                 if is_secondary:
                     break
-                time.sleep(0.1)  # Wait a little bit before trying again.
+                backoff.sleep()  # Wait a little bit before trying again.
             self.logger.info("Secondary on port %d is now available.", secondary.port)
 
     @staticmethod
@@ -363,6 +520,7 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
 
             client_admin = client["admin"]
 
+            backoff = _backoff.Backoff()
             while True:
                 status = client_admin.command("replSetGetStatus")
 
@@ -382,7 +540,7 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
                         "Node on port %d now has a stable timestamp for recovery. Time: %s",
                         node.port, last_stable_recovery_timestamp)
                     break
-                time.sleep(0.1)  # Wait a little bit before trying again.
+                backoff.sleep()  # Wait a little bit before trying again.
 
     def _setup_sessions_collection(self):
         """Set up the sessions collection so that it will not attempt to set up during a test."""
@@ -462,6 +620,7 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
 
         start = time.time()
         clients = {}
+        backoff = _backoff.Backoff()
         while True:
             for node in self.nodes:
                 now = time.time()
@@ -483,6 +642,9 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
                     # of isMaster requests.
                     continue
 
+            # Wait a little bit before the next round of requests.
+            backoff.sleep(start + timeout_secs)
+
     def get_secondaries(self):
         """Return a list of secondaries from the replica set."""
         primary = self.get_primary()
@@ -1,5 +1,6 @@
 """Sharded cluster fixture for executing JSTests against."""
 
+import functools
 import os.path
 import time
 
@@ -13,6 +14,7 @@ from ... import config
 from ... import core
 from ... import errors
 from ... import utils
+from ...utils import backoff as _backoff
 from ...utils import registry
 
 
@@ -83,13 +85,19 @@ class ShardedClusterFixture(interface.Fixture):  # pylint: disable=too-many-inst
             self.logger.debug('No shards when gathering sharded cluster fixture pids.')
         return out
 
+    def get_num_ports(self):
+        """Return the number of ports the fixture allocates from the PortAllocator."""
+        num_configsvr_nodes = self.configsvr_options.get("num_nodes", 1)
+        num_nodes_per_shard = utils.default_if_none(self.num_rs_nodes_per_shard, 1)
+        if self.shard_options.get("start_initial_sync_node", False):
+            num_nodes_per_shard += 1
+        return num_configsvr_nodes + self.num_shards * num_nodes_per_shard + self.num_mongos
+
     def setup(self):
         """Set up the sharded cluster."""
         if self.configsvr is None:
             self.configsvr = self._new_configsvr()
 
-        self.configsvr.setup()
-
         if not self.shards:
             for i in range(self.num_shards):
                 if self.num_rs_nodes_per_shard is None:
@@ -102,19 +110,24 @@ class ShardedClusterFixture(interface.Fixture):  # pylint: disable=too-many-inst
                     raise TypeError("num_rs_nodes_per_shard must be an integer or None")
                 self.shards.append(shard)
 
-        # Start up each of the shards
+        # Allocate the ports up front so they don't depend on the order in which the config server
+        # and the shards start up.
+        self.configsvr.reserve_ports()
         for shard in self.shards:
-            shard.setup()
+            shard.reserve_ports()
+
+        # Start up the config server and each of the shards concurrently. Setting up a replica set
+        # waits for its primary to be elected, so this is the slowest part of starting the cluster.
+        interface.run_concurrently([self.configsvr.setup] +
+                                   [shard.setup for shard in self.shards])
 
     def await_ready(self):
         """Block until the fixture can be used for testing."""
-        # Wait for the config server
+        # Wait for the config server and each of the shards.
+        waits = [shard.await_ready for shard in self.shards]
         if self.configsvr is not None:
-            self.configsvr.await_ready()
-
-        # Wait for each of the shards
-        for shard in self.shards:
-            shard.await_ready()
+            waits.insert(0, self.configsvr.await_ready)
+        interface.run_concurrently(waits)
 
         # We call self._new_mongos() and mongos.setup() in self.await_ready() function
         # instead of self.setup() because mongos routers have to connect to a running cluster.
@@ -124,12 +137,16 @@ class ShardedClusterFixture(interface.Fixture):  # pylint: disable=too-many-inst
                 self.mongos.append(mongos)
 
         for mongos in self.mongos:
-            # Start up the mongos.
-            mongos.setup()
+            mongos.reserve_ports()
 
-            # Wait for the mongos.
+        def start_mongos(mongos):
+            mongos.setup()
             mongos.await_ready()
 
+        # Start up each of the mongos and wait for them concurrently.
+        interface.run_concurrently(
+            [functools.partial(start_mongos, mongos) for mongos in self.mongos])
+
         client = self.mongo_client()
         self._auth_to_db(client)
 
@@ -143,9 +160,12 @@ class ShardedClusterFixture(interface.Fixture):  # pylint: disable=too-many-inst
             coll = client.config.get_collection("settings", write_concern=wc)
             coll.update_one({"_id": "autosplit"}, {"$set": {"enabled": False}}, upsert=True)
 
-        # Inform mongos about each of the shards
-        for shard in self.shards:
-            self._add_shard(client, shard)
+        # Inform mongos about each of the shards. The config server serializes the addShard
+        # commands itself, so they can be issued concurrently.
+        interface.run_concurrently([
+            functools.partial(self._add_shard, client, index, shard)
+            for (index, shard) in enumerate(self.shards)
+        ])
 
         # Ensure that all CSRS nodes are up to date. This is strictly needed for tests that use
         # multiple mongoses. In those cases, the first mongos initializes the contents of the config
@@ -177,6 +197,12 @@ class ShardedClusterFixture(interface.Fixture):  # pylint: disable=too-many-inst
                                  password=self.auth_options["password"],
                                  mechanism=self.auth_options["authenticationMechanism"])
 
+    def clear_data(self):
+        """Drop the databases created by tests through the mongos."""
+        client = self.mongo_client()
+        self._auth_to_db(client)
+        self._drop_test_databases(client)
+
     def stop_balancer(self, timeout_ms=60000):
         """Stop the balancer."""
         client = self.mongo_client()
@@ -343,7 +369,7 @@ class ShardedClusterFixture(interface.Fixture):  # pylint: disable=too-many-inst
         return _MongoSFixture(mongos_logger, self.job_num, dbpath_prefix=self._dbpath_prefix,
                               mongos_executable=mongos_executable, mongos_options=mongos_options)
 
-    def _add_shard(self, client, shard):
+    def _add_shard(self, client, index, shard):
         """
         Add the specified program as a shard by executing the addShard command.
 
@@ -352,7 +378,13 @@ class ShardedClusterFixture(interface.Fixture):  # pylint: disable=too-many-inst
 
         connection_string = shard.get_internal_connection_string()
         self.logger.info("Adding %s as a shard...", connection_string)
-        client.admin.command({"addShard": connection_string})
+        command = {"addShard": connection_string}
+        if isinstance(shard, standalone.MongoDFixture):
+            # A replica set shard is named after its replica set, whereas a standalone shard would
+            # otherwise be named after the order in which the concurrent addShard commands happened
+            # to be processed. Use the name the shard would get if they were run sequentially.
+            command["name"] = "shard%04d" % index
+        client.admin.command(command)
 
 
 class _MongoSFixture(interface.Fixture):
@@ -373,14 +405,19 @@ class _MongoSFixture(interface.Fixture):
 
         self.mongos = None
         self.port = None
+        self._ready_event = None
         self._dbpath_prefix = dbpath_prefix
 
-    def setup(self):
-        """Set up the sharded cluster."""
+    def reserve_ports(self):
+        """Allocate the port of the mongos if it doesn't already have one."""
         if "port" not in self.mongos_options:
             self.mongos_options["port"] = core.network.PortAllocator.next_fixture_port(self.job_num)
         self.port = self.mongos_options["port"]
 
+    def setup(self):
+        """Set up the sharded cluster."""
+        self.reserve_ports()
+
         if config.ALWAYS_USE_LOG_FILES:
             self.mongos_options["logpath"] = self._dbpath_prefix + "/mongos-{port}.log".format(
                 port=self.port)
@@ -388,6 +425,10 @@ class _MongoSFixture(interface.Fixture):
 
         mongos = core.programs.mongos_program(self.logger, executable=self.mongos_executable,
                                               **self.mongos_options)
+        self._ready_event = None
+        if "logpath" not in self.mongos_options:
+            self._ready_event = mongos.watch_output(standalone.READY_LOG_REGEX)
+
         try:
             self.logger.info("Starting mongos on port %d...\n%s", self.port, mongos.as_command())
             mongos.start()
@@ -399,6 +440,10 @@ class _MongoSFixture(interface.Fixture):
 
         self.mongos = mongos
 
+    def get_num_ports(self):  # pylint: disable=no-self-use
+        """Return the number of ports the fixture allocates from the PortAllocator."""
+        return 1
+
     def pids(self):
         """:return: pids owned by this fixture if any."""
         if self.mongos is not None:
@@ -411,9 +456,15 @@ class _MongoSFixture(interface.Fixture):
         """Block until the fixture can be used for testing."""
         deadline = time.time() + standalone.MongoDFixture.AWAIT_READY_TIMEOUT_SECS
 
+        if self._ready_event is not None:
+            # Wait for the mongos to log that it is listening for connections, or to exit, rather
+            # than repeatedly trying to connect to it in the meantime.
+            self._ready_event.wait(standalone.MongoDFixture.AWAIT_READY_TIMEOUT_SECS)
+
         # Wait until the mongos is accepting connections. The retry logic is necessary to support
         # versions of PyMongo <3.0 that immediately raise a ConnectionFailure if a connection cannot
         # be established.
+        backoff = _backoff.Backoff()
         while True:
             # Check whether the mongos exited for some reason.
             exit_code = self.mongos.poll()
@@ -435,7 +486,7 @@ class _MongoSFixture(interface.Fixture):
                             self.port, standalone.MongoDFixture.AWAIT_READY_TIMEOUT_SECS))
 
                 self.logger.info("Waiting to connect to mongos on port %d.", self.port)
-                time.sleep(0.1)  # Wait a little bit before trying again.
+                backoff.sleep(deadline)  # Wait a little bit before trying again.
 
         self.logger.info("Successfully contacted the mongos on port %d.", self.port)
 
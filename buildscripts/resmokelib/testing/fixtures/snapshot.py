@@ -0,0 +1,62 @@
+"""Copies of the data directories of a freshly set up fixture used to quickly reset it."""
+
+import json
+import os
+import os.path
+import shutil
+
+from ... import utils
+
+# Files in a dbpath that are either specific to a running process or only useful for diagnostics.
+_IGNORED_FILES = shutil.ignore_patterns("mongod.lock", "diagnostic.data", "*.log")
+
+
+class DbpathSnapshot(object):
+    """A snapshot of the dbpaths of the nodes of a fixture stored in a cache directory.
+
+    The snapshot is only restored if it was taken from a fixture with the same 'key', which should
+    capture everything the data files depend on, e.g. the ports and options of each node.
+    """
+
+    METADATA_FILENAME = "snapshot.json"
+
+    def __init__(self, logger, dirname, key):
+        """Initialize the DbpathSnapshot."""
+        self.logger = logger
+        self.dirname = dirname
+        self.key = key
+
+    def _get_node_dir(self, index):
+        return os.path.join(self.dirname, "node{}".format(index))
+
+    def exists(self):
+        """Return True if a complete snapshot taken with the same key exists."""
+        try:
+            with open(os.path.join(self.dirname, DbpathSnapshot.METADATA_FILENAME), "r") as fp:
+                return json.load(fp).get("key") == self.key
+        except (IOError, ValueError):
+            return False
+
+    def clear(self):
+        """Remove the snapshot so that it can be taken again."""
+        if os.path.lexists(self.dirname):
+            utils.rmtree(self.dirname, ignore_errors=False)
+
+    def save_dbpath(self, index, dbpath):
+        """Copy 'dbpath' into the snapshot as the data of the node numbered 'index'."""
+        self.logger.info("Saving a snapshot of %s to %s.", dbpath, self._get_node_dir(index))
+        shutil.copytree(dbpath, self._get_node_dir(index), ignore=_IGNORED_FILES)
+
+    def commit(self):
+        """Mark the snapshot as complete once the dbpath of every node has been saved."""
+        pathname = os.path.join(self.dirname, DbpathSnapshot.METADATA_FILENAME)
+        with open(pathname + ".tmp", "w") as fp:
+            json.dump({"key": self.key}, fp)
+        os.replace(pathname + ".tmp", pathname)
+
+    def restore_dbpath(self, index, dbpath):
+        """Replace the contents of 'dbpath' with the data of the node numbered 'index'."""
+        self.logger.info("Restoring %s from the snapshot in %s.", dbpath, self._get_node_dir(index))
+        if os.path.lexists(dbpath):
+            utils.rmtree(dbpath, ignore_errors=False)
+        shutil.copytree(self._get_node_dir(index), dbpath)
@@ -2,6 +2,7 @@
 
 import os
 import os.path
+import re
 import time
 
 import pymongo
@@ -12,6 +13,10 @@ from ... import config
 from ... import core
 from ... import errors
 from ... import utils
+from ...utils import backoff as _backoff
+
+# mongod and mongos log this message once they are listening for connections on their port.
+READY_LOG_REGEX = re.compile(r"waiting for connections", re.IGNORECASE)
 
 
 class MongoDFixture(interface.Fixture):
@@ -49,6 +54,7 @@ class MongoDFixture(interface.Fixture):
 
         self.mongod = None
         self.port = None
+        self._ready_event = None
 
     def setup(self):
         """Set up the mongod."""
@@ -61,12 +67,14 @@ class MongoDFixture(interface.Fixture):
             # Directory already exists.
             pass
 
-        if "port" not in self.mongod_options:
-            self.mongod_options["port"] = core.network.PortAllocator.next_fixture_port(self.job_num)
-        self.port = self.mongod_options["port"]
+        self.reserve_ports()
 
         mongod = core.programs.mongod_program(self.logger, executable=self.mongod_executable,
                                               **self.mongod_options)
+        self._ready_event = None
+        if "logpath" not in self.mongod_options:
+            self._ready_event = mongod.watch_output(READY_LOG_REGEX)
+
         try:
             self.logger.info("Starting mongod on port %d...\n%s", self.port, mongod.as_command())
             mongod.start()
@@ -78,6 +86,16 @@ class MongoDFixture(interface.Fixture):
 
         self.mongod = mongod
 
+    def reserve_ports(self):
+        """Allocate the port of the mongod if it doesn't already have one."""
+        if "port" not in self.mongod_options:
+            self.mongod_options["port"] = core.network.PortAllocator.next_fixture_port(self.job_num)
+        self.port = self.mongod_options["port"]
+
+    def get_num_ports(self):  # pylint: disable=no-self-use
+        """Return the number of ports the fixture allocates from the PortAllocator."""
+        return 1
+
     def pids(self):
         """:return: pids owned by this fixture if any."""
         out = [x.pid for x in [self.mongod] if x is not None]
@@ -89,9 +107,15 @@ class MongoDFixture(interface.Fixture):
         """Block until the fixture can be used for testing."""
         deadline = time.time() + MongoDFixture.AWAIT_READY_TIMEOUT_SECS
 
+        if self._ready_event is not None:
+            # Wait for the mongod to log that it is listening for connections, or to exit, rather
+            # than repeatedly trying to connect to it in the meantime.
+            self._ready_event.wait(MongoDFixture.AWAIT_READY_TIMEOUT_SECS)
+
         # Wait until the mongod is accepting connections. The retry logic is necessary to support
         # versions of PyMongo <3.0 that immediately raise a ConnectionFailure if a connection cannot
         # be established.
+        backoff = _backoff.Backoff()
         while True:
             # Check whether the mongod exited for some reason.
             exit_code = self.mongod.poll()
@@ -113,7 +137,7 @@ class MongoDFixture(interface.Fixture):
                             self.port, MongoDFixture.AWAIT_READY_TIMEOUT_SECS))
 
                 self.logger.info("Waiting to connect to mongod on port %d.", self.port)
-                time.sleep(0.1)  # Wait a little bit before trying again.
+                backoff.sleep(deadline)  # Wait a little bit before trying again.
 
         self.logger.info("Successfully contacted the mongod on port %d.", self.port)
 
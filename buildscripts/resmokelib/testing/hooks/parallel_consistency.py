@@ -0,0 +1,572 @@
+"""Test hooks for checking data consistency by sending the commands to the mongod nodes directly.
+
+CheckReplDBHash and ValidateCollections start a mongo shell which visits the nodes, databases, and
+collections of the fixture mostly one at a time. The hooks in this module instead run the dbHash,
+listCollections, listIndexes, and validate commands from resmoke.py using PyMongo, fanning them out
+across the nodes and databases on a pool of threads.
+"""
+
+import collections
+import concurrent.futures
+import threading
+
+import pymongo
+import pymongo.errors
+
+from buildscripts.resmokelib import errors
+from buildscripts.resmokelib.testing.fixtures import interface as fixture_interface
+from buildscripts.resmokelib.testing.fixtures import replicaset
+from buildscripts.resmokelib.testing.fixtures import shardedcluster
+from buildscripts.resmokelib.testing.fixtures import standalone
+from buildscripts.resmokelib.testing.hooks import interface
+from buildscripts.resmokelib.utils import registry
+
+# The contents of a database on one node. 'dbhash' is the response of the dbHash command,
+# 'coll_infos' is a dict of collection or view name to its listCollections entry, and 'indexes' is
+# a dict of collection name to the list of its index specs sorted by name.
+DatabaseSnapshot = collections.namedtuple("DatabaseSnapshot", ["dbhash", "coll_infos", "indexes"])
+
+# The snapshot of a database which doesn't exist on a node, compared like an empty database.
+_EMPTY_DB_SNAPSHOT = DatabaseSnapshot({"collections": {}, "capped": [], "md5": None}, {}, {})
+
+# What CheckReplDBHashInParallel remembers about a replica set whose databases matched. 'pids' and
+# 'primary_port' identify the processes which were checked, 'last_ts' is the timestamp of the newest
+# oplog entry on the primary before the check, and 'checked_dbs' is the set of database names.
+_ReplicaSetState = collections.namedtuple("_ReplicaSetState",
+                                          ["pids", "primary_port", "last_ts", "checked_dbs"])
+
+_NAMESPACE_NOT_FOUND = 26
+
+
+def get_replica_sets(fixture):
+    """Return the ReplicaSetFixtures which are part of 'fixture'."""
+    if isinstance(fixture, replicaset.ReplicaSetFixture):
+        return [fixture]
+    if isinstance(fixture, shardedcluster.ShardedClusterFixture):
+        replica_sets = []
+        for rs_fixture in [fixture.configsvr] + fixture.shards:
+            replica_sets.extend(get_replica_sets(rs_fixture))
+        return replica_sets
+    return []
+
+
+def get_data_nodes(fixture, auth_options=None):
+    """Return a list of (MongoDFixture, auth_options) pairs for the mongod nodes of 'fixture'."""
+    if isinstance(fixture, standalone.MongoDFixture):
+        return [(fixture, auth_options)]
+    if isinstance(fixture, replicaset.ReplicaSetFixture):
+        return [(node, fixture.auth_options) for node in fixture.nodes]
+    if isinstance(fixture, shardedcluster.ShardedClusterFixture):
+        nodes = []
+        for node_fixture in [fixture.configsvr] + fixture.shards:
+            nodes.extend(get_data_nodes(node_fixture, fixture.auth_options))
+        return nodes
+    return []
+
+
+def take_db_snapshot(client, db_name):
+    """Return the DatabaseSnapshot of the database 'db_name' on the node of 'client'."""
+    database = client.get_database(db_name)
+    dbhash = database.command("dbHash")
+
+    coll_infos = {}
+    indexes = {}
+    for coll_info in database.list_collections():
+        coll_name = coll_info["name"]
+        coll_infos[coll_name] = coll_info
+        if coll_info.get("type", "collection") == "collection":
+            specs = []
+            for spec in database.get_collection(coll_name).list_indexes():
+                # The 'ns' field was removed from index specs in 4.4.
+                spec.pop("ns", None)
+                specs.append(spec)
+            indexes[coll_name] = sorted(specs, key=lambda spec: spec["name"])
+
+    return DatabaseSnapshot(dbhash, coll_infos, indexes)
+
+
+def get_last_oplog_ts(client):
+    """Return the timestamp of the newest entry in the oplog of the node of 'client'."""
+    entry = client.local.oplog.rs.find_one(sort=[("$natural", pymongo.DESCENDING)],
+                                           projection={"ts": 1})
+    return None if entry is None else entry["ts"]
+
+
+def get_oplog_entry_dbs(entry):
+    """Return the set of names of the databases the oplog entry 'entry' changed."""
+    namespaces = [entry.get("ns", "")]
+    obj = entry.get("o", {})
+    # The operations of a transaction or an applyOps command each have their own namespace.
+    namespaces.extend(op.get("ns", "") for op in obj.get("applyOps", []))
+    # A collection may be renamed to a different database.
+    namespaces.extend(obj.get(field) for field in ("renameCollection", "to"))
+    return {
+        namespace.split(".", 1)[0]
+        for namespace in namespaces if isinstance(namespace, str) and namespace
+    }
+
+
+def find_changed_dbs(client, since_ts):
+    """Return the set of names of the databases changed by the oplog entries newer than 'since_ts'.
+
+    Return None if the oplog of the node 'client' is connected to no longer has the entries since
+    'since_ts' because it was truncated.
+    """
+    oplog = client.local.oplog.rs
+    oldest_entry = oplog.find_one(sort=[("$natural", pymongo.ASCENDING)], projection={"ts": 1})
+    if oldest_entry is None or oldest_entry["ts"] > since_ts:
+        return None
+
+    db_names = set()
+    projection = {"ns": 1, "o.applyOps.ns": 1, "o.renameCollection": 1, "o.to": 1}
+    for entry in oplog.find({"ts": {"$gt": since_ts}}, projection=projection):
+        db_names.update(get_oplog_entry_dbs(entry))
+    return db_names
+
+
+def _normalize_coll_info(coll_info):
+    """Return a copy of the listCollections entry without the fields that may differ by version."""
+    coll_info = dict(coll_info)
+    # The 'flags' collection option was removed in 4.2.
+    coll_info["options"] = {
+        name: value
+        for (name, value) in coll_info.get("options", {}).items() if name != "flags"
+    }
+    # The 'ns' field was removed from the 'idIndex' field in 4.4.
+    if "idIndex" in coll_info:
+        coll_info["idIndex"] = {
+            name: value
+            for (name, value) in coll_info["idIndex"].items() if name != "ns"
+        }
+    return coll_info
+
+
+def compare_db_snapshots(db_name, primary_snapshot, secondary_snapshot):
+    """Return a list of messages describing how the database 'db_name' differs between nodes.
+
+    Like ReplSetTest.checkReplicatedDataHashes(), only the collections returned by the dbHash
+    command are compared and the contents of capped collections aren't because they may not be
+    truncated at the same points on every member of the replica set. A snapshot of None stands
+    for a database which doesn't exist on the node.
+    """
+    primary_snapshot = primary_snapshot or _EMPTY_DB_SNAPSHOT
+    secondary_snapshot = secondary_snapshot or _EMPTY_DB_SNAPSHOT
+    primary_hashes = primary_snapshot.dbhash["collections"]
+    secondary_hashes = secondary_snapshot.dbhash["collections"]
+    capped = set(primary_snapshot.dbhash.get("capped", []))
+    messages = []
+
+    for coll_name in sorted(set(primary_hashes) ^ set(secondary_hashes)):
+        which = "secondary" if coll_name in primary_hashes else "primary"
+        messages.append("the collection {}.{} doesn't exist on the {}".format(
+            db_name, coll_name, which))
+
+    for coll_name in sorted(set(primary_hashes) & set(secondary_hashes)):
+        namespace = "{}.{}".format(db_name, coll_name)
+        if coll_name not in capped and primary_hashes[coll_name] != secondary_hashes[coll_name]:
+            messages.append("the collection {} has a different hash: {} on the primary and {} on"
+                            " the secondary".format(namespace, primary_hashes[coll_name],
+                                                    secondary_hashes[coll_name]))
+
+        primary_info = primary_snapshot.coll_infos.get(coll_name)
+        secondary_info = secondary_snapshot.coll_infos.get(coll_name)
+        if primary_info is not None and secondary_info is not None:
+            primary_info = _normalize_coll_info(primary_info)
+            secondary_info = _normalize_coll_info(secondary_info)
+            if primary_info != secondary_info:
+                messages.append("the collection {} has different attributes: {} on the primary and"
+                                " {} on the secondary".format(namespace, primary_info,
+                                                              secondary_info))
+
+        primary_indexes = primary_snapshot.indexes.get(coll_name)
+        secondary_indexes = secondary_snapshot.indexes.get(coll_name)
+        if primary_indexes != secondary_indexes:
+            messages.append("the collection {} has different indexes: {} on the primary and {} on"
+                            " the secondary".format(namespace, primary_indexes, secondary_indexes))
+
+    primary_md5 = primary_snapshot.dbhash["md5"]
+    secondary_md5 = secondary_snapshot.dbhash["md5"]
+    if not capped and not messages and None not in (primary_md5, secondary_md5) and \
+            primary_md5 != secondary_md5:
+        messages.append("the {} database has a different hash: {} on the primary and {} on the"
+                        " secondary".format(db_name, primary_md5, secondary_md5))
+
+    return messages
+
+
+class _NodeClients(object):
+    """The PyMongo clients connected directly to each of the nodes, keyed by their port."""
+
+    def __init__(self):
+        """Initialize _NodeClients."""
+        self._lock = threading.Lock()
+        self._clients = {}
+
+    def get(self, node, auth_options):
+        """Return a client connected to 'node', creating it if one doesn't exist yet."""
+        with self._lock:
+            client = self._clients.get(node.port)
+        if client is not None:
+            return client
+
+        client = replicaset.ReplicaSetFixture.auth(
+            node.mongo_client(read_preference=pymongo.ReadPreference.SECONDARY_PREFERRED),
+            auth_options)
+        with self._lock:
+            self._clients[node.port] = client
+        return client
+
+    def close(self):
+        """Close all of the clients."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+
+class _ParallelConsistencyHook(interface.Hook):
+    """A hook which runs a data consistency check on a pool of threads after every test.
+
+    If the check finds an inconsistency, then an errors.ServerFailure exception is raised to cause
+    resmoke.py's test execution to stop, like jsfile.DataConsistencyHook does.
+    """
+
+    REGISTERED_NAME = registry.LEAVE_UNREGISTERED
+
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(self, hook_logger, fixture, description, max_workers=DEFAULT_MAX_WORKERS):
+        """Initialize _ParallelConsistencyHook."""
+        interface.Hook.__init__(self, hook_logger, fixture, description)
+        self._max_workers = max_workers
+        self._clients = _NodeClients()
+
+    def after_suite(self, test_report):
+        """Close the connections to the nodes."""
+        self._clients.close()
+
+    def after_test(self, test, test_report):
+        """Run the check as a dynamic test."""
+        hook_test_case = _ParallelConsistencyTestCase.create_after_test(
+            self.logger.test_case_logger, test, self)
+        hook_test_case.configure(self.fixture)
+        try:
+            hook_test_case.run_dynamic_test(test_report)
+        except errors.TestFailure as err:
+            raise errors.ServerFailure(err.args[0])
+
+    def check(self, logger):
+        """Check the fixture and return a list of messages describing the inconsistencies found."""
+        raise NotImplementedError(
+            "check must be implemented by _ParallelConsistencyHook subclasses")
+
+    def _map(self, func, args_list):
+        """Call 'func' with each of the tuples in 'args_list' on a pool of threads.
+
+        Return the list of results in the same order as 'args_list'. If any of the calls raises an
+        exception, then the exception of the earliest such call is re-raised once all of them have
+        finished.
+        """
+        args_list = list(args_list)
+        if len(args_list) <= 1 or self._max_workers <= 1:
+            return [func(*args) for args in args_list]
+
+        max_workers = min(self._max_workers, len(args_list))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(func, *args) for args in args_list]
+        return [future.result() for future in futures]
+
+    def _list_databases(self, nodes):
+        """Return a dict of port to the set of database names on each of 'nodes'.
+
+        'nodes' is a list of (MongoDFixture, auth_options) pairs. The nodes are listed in parallel.
+        """
+
+        def list_database_names(node, auth_options):
+            return set(self._clients.get(node, auth_options).list_database_names())
+
+        all_db_names = self._map(list_database_names, nodes)
+        return {node.port: db_names for ((node, _), db_names) in zip(nodes, all_db_names)}
+
+    def _snapshot_databases(self, nodes, db_names_by_port):
+        """Return a dict of (port, db name) to the DatabaseSnapshot of each database on 'nodes'.
+
+        'nodes' is a list of (MongoDFixture, auth_options) pairs and 'db_names_by_port' is a dict
+        of port to the names of the databases to snapshot on the node. Every database of every node
+        is snapshotted in parallel.
+        """
+        tasks = []
+        for (node, auth_options) in nodes:
+            for db_name in sorted(db_names_by_port.get(node.port, [])):
+                tasks.append((node, auth_options, db_name))
+
+        def snapshot(node, auth_options, db_name):
+            return take_db_snapshot(self._clients.get(node, auth_options), db_name)
+
+        snapshots = self._map(snapshot, tasks)
+        return {(node.port, db_name): db_snapshot
+                for ((node, _, db_name), db_snapshot) in zip(tasks, snapshots)}
+
+
+class _ParallelConsistencyTestCase(interface.DynamicTestCase):
+    """A dynamic TestCase that runs the check of a _ParallelConsistencyHook."""
+
+    def run_test(self):
+        """Execute the check."""
+        messages = self._hook.check(self.logger)
+        if messages:
+            for message in messages:
+                self.logger.error(message)
+            raise errors.TestFailure(
+                "{} found {} inconsistencies, the first of which is: {}".format(
+                    self._hook.description, len(messages), messages[0]))
+
+
+class CheckReplDBHashInParallel(_ParallelConsistencyHook):
+    """Check that the dbhashes of the primary and secondaries of each replica set match.
+
+    The replica sets of a sharded cluster are checked at the same time and the databases of every
+    node are hashed in parallel, rather than one at a time as the mongo shell running
+    run_check_repl_dbhash.js would.
+
+    If 'incremental' is true, then only the databases which the primary's oplog shows were changed
+    since the last check are hashed again, along with any database which is new or isn't on every
+    node. All of the databases are hashed when the replica set is first checked, after any of its
+    nodes restarted or its primary changed, and after its oplog was truncated past the last check.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self, hook_logger, fixture, excluded_dbs=None, incremental=False,
+            max_workers=_ParallelConsistencyHook.DEFAULT_MAX_WORKERS):
+        """Initialize CheckReplDBHashInParallel."""
+        description = "Check dbhashes of all replica set members in parallel"
+        _ParallelConsistencyHook.__init__(self, hook_logger, fixture, description,
+                                          max_workers=max_workers)
+        # The local database isn't compared because some of its collections aren't replicated.
+        self._excluded_dbs = set(excluded_dbs or []) | {"local"}
+        self._incremental = incremental
+        # Dict of replica set name to the _ReplicaSetState of its last successful check.
+        self._states = {}
+
+    def after_suite(self, test_report):
+        """Forget the checked databases since the fixture is restarted for another suite."""
+        _ParallelConsistencyHook.after_suite(self, test_report)
+        self._states = {}
+
+    def check(self, logger):
+        """Return a list of messages describing the dbhash mismatches."""
+        replica_sets = []
+        for rs_fixture in get_replica_sets(self.fixture):
+            if len(rs_fixture.nodes) < 2:
+                logger.info("Skipping the dbhash check of the 1-node replica set '%s'.",
+                            rs_fixture.replset_name)
+                continue
+            replica_sets.append(rs_fixture)
+
+        primaries = {
+            rs_fixture.replset_name: rs_fixture.get_primary()
+            for rs_fixture in replica_sets
+        }
+        rs_args = [(rs_fixture, ) for rs_fixture in replica_sets]
+        new_states = {}
+        if self._incremental:
+            # The newest oplog entry is read before waiting for replication so that the operations
+            # which happen while the databases are hashed are looked at again by the next check.
+            def read_state(rs_fixture):
+                primary = primaries[rs_fixture.replset_name]
+                client = self._clients.get(primary, rs_fixture.auth_options)
+                return _ReplicaSetState(
+                    tuple(rs_fixture.pids()), primary.port, get_last_oplog_ts(client), set())
+
+            for (rs_fixture, state) in zip(replica_sets, self._map(read_state, rs_args)):
+                new_states[rs_fixture.replset_name] = state
+
+        # Wait for the secondaries to have applied all of the operations of their primary so that
+        # the databases are only hashed once no more writes are being replicated.
+        fixture_interface.run_concurrently(
+            rs_fixture.await_last_op_committed for rs_fixture in replica_sets)
+
+        nodes = []
+        for rs_fixture in replica_sets:
+            nodes.extend((node, rs_fixture.auth_options) for node in rs_fixture.nodes)
+        db_names_by_port = self._list_databases(nodes)
+
+        def get_dbs_to_hash(rs_fixture):
+            return self._get_dbs_to_hash(rs_fixture, primaries[rs_fixture.replset_name],
+                                         new_states.get(rs_fixture.replset_name),
+                                         db_names_by_port, logger)
+
+        dbs_to_hash = {}
+        for (rs_fixture, db_names) in zip(replica_sets, self._map(get_dbs_to_hash, rs_args)):
+            for node in rs_fixture.nodes:
+                dbs_to_hash[node.port] = db_names_by_port[node.port] & db_names
+
+        snapshots = self._snapshot_databases(nodes, dbs_to_hash)
+
+        messages = []
+        for rs_fixture in replica_sets:
+            primary = primaries[rs_fixture.replset_name]
+            rs_messages = []
+            for secondary in rs_fixture.nodes:
+                if secondary.port == primary.port:
+                    continue
+                rs_messages.extend(
+                    self._compare_nodes(rs_fixture, primary, secondary, snapshots, logger))
+
+            new_state = new_states.get(rs_fixture.replset_name)
+            if new_state is not None and not rs_messages:
+                new_state.checked_dbs.update(
+                    self._get_all_dbs(rs_fixture, db_names_by_port, set.union))
+                self._states[rs_fixture.replset_name] = new_state
+            else:
+                self._states.pop(rs_fixture.replset_name, None)
+            messages.extend(rs_messages)
+        return messages
+
+    def _get_all_dbs(self, rs_fixture, db_names_by_port, combine):
+        """Return the union or intersection of the names of the databases on every node."""
+        all_db_names = combine(*(db_names_by_port[node.port] for node in rs_fixture.nodes))
+        return all_db_names - self._excluded_dbs
+
+    def _get_dbs_to_hash(  # pylint: disable=too-many-arguments
+            self, rs_fixture, primary, new_state, db_names_by_port, logger):
+        """Return the set of names of the databases of the replica set to hash."""
+        all_db_names = self._get_all_dbs(rs_fixture, db_names_by_port, set.union)
+        if new_state is None:
+            return all_db_names
+
+        state = self._states.get(rs_fixture.replset_name)
+        changed_dbs = None
+        if state is None:
+            reason = "it wasn't checked before"
+        elif state.pids != new_state.pids:
+            reason = "some of its nodes restarted"
+        elif state.primary_port != primary.port:
+            reason = "its primary changed"
+        else:
+            changed_dbs = find_changed_dbs(
+                self._clients.get(primary, rs_fixture.auth_options), state.last_ts)
+            reason = "its oplog was truncated since it was last checked"
+
+        if changed_dbs is None:
+            logger.info("Hashing all of the databases of replica set '%s' because %s.",
+                        rs_fixture.replset_name, reason)
+            return all_db_names
+
+        # Databases which weren't there at the last check or which aren't on every node aren't
+        # known to match even if the oplog doesn't show they changed.
+        on_every_node = self._get_all_dbs(rs_fixture, db_names_by_port, set.intersection)
+        db_names = all_db_names & (changed_dbs | (all_db_names - state.checked_dbs) |
+                                   (all_db_names - on_every_node))
+        logger.info("Hashing %d of the %d databases of replica set '%s' which changed since it was"
+                    " last checked: %s", len(db_names), len(all_db_names),
+                    rs_fixture.replset_name, sorted(db_names))
+        return db_names
+
+    @staticmethod
+    def _compare_nodes(rs_fixture, primary, secondary, snapshots, logger):
+        db_names = {
+            db_name
+            for (port, db_name) in snapshots if port in (primary.port, secondary.port)
+        }
+        logger.info("Comparing %d databases of the primary on port %d and the secondary on port %d"
+                    " of replica set '%s'.", len(db_names), primary.port, secondary.port,
+                    rs_fixture.replset_name)
+
+        messages = []
+        for db_name in sorted(db_names):
+            for message in compare_db_snapshots(db_name, snapshots.get((primary.port, db_name)),
+                                                snapshots.get((secondary.port, db_name))):
+                messages.append("Replica set '{}', primary on port {}, secondary on port {}: {}".
+                                format(rs_fixture.replset_name, primary.port, secondary.port,
+                                       message))
+        return messages
+
+
+class ValidateCollectionsInParallel(_ParallelConsistencyHook):
+    """Run full validation of every collection on every node in parallel.
+
+    A collection is only validated again once its UUID, dbHash, or indexes on the node changed
+    since it was last found to be valid, so collections the tests don't touch aren't revalidated
+    after every test.
+    """
+
+    def __init__(self, hook_logger, fixture, skip_namespaces=None,
+                 max_workers=_ParallelConsistencyHook.DEFAULT_MAX_WORKERS):
+        """Initialize ValidateCollectionsInParallel."""
+        description = "Full collection validation in parallel"
+        _ParallelConsistencyHook.__init__(self, hook_logger, fixture, description,
+                                          max_workers=max_workers)
+        self._skip_namespaces = set(skip_namespaces or [])
+        # Dict of (port, namespace) to the state of the collection when it was last found valid.
+        self._validated = {}
+
+    def after_suite(self, test_report):
+        """Forget the validated collections since the fixture is restarted for another suite."""
+        _ParallelConsistencyHook.after_suite(self, test_report)
+        self._validated = {}
+
+    def check(self, logger):
+        """Return a list of messages describing the collections which failed validation."""
+        nodes = get_data_nodes(self.fixture)
+        snapshots = self._snapshot_databases(nodes, self._list_databases(nodes))
+        auth_options = {node.port: node_auth_options for (node, node_auth_options) in nodes}
+        nodes_by_port = {node.port: node for (node, _) in nodes}
+
+        tasks = []
+        states = {}
+        num_skipped = 0
+        for ((port, db_name), db_snapshot) in sorted(snapshots.items()):
+            for (coll_name, coll_info) in sorted(db_snapshot.coll_infos.items()):
+                namespace = "{}.{}".format(db_name, coll_name)
+                if coll_name not in db_snapshot.indexes or namespace in self._skip_namespaces:
+                    continue
+
+                state = self._get_collection_state(db_snapshot, coll_name, coll_info)
+                if state is not None and self._validated.get((port, namespace)) == state:
+                    num_skipped += 1
+                    continue
+                states[(port, namespace)] = state
+                tasks.append((nodes_by_port[port], auth_options[port], db_name, coll_name))
+
+        logger.info("Validating %d collections on %d nodes, skipping %d unchanged collections.",
+                    len(tasks), len(nodes), num_skipped)
+
+        messages = []
+        results = self._map(self._validate, tasks)
+        for ((node, _, db_name, coll_name), message) in zip(tasks, results):
+            namespace = "{}.{}".format(db_name, coll_name)
+            if message is not None:
+                messages.append("Node on port {}: {}".format(node.port, message))
+                self._validated.pop((node.port, namespace), None)
+            elif states[(node.port, namespace)] is not None:
+                self._validated[(node.port, namespace)] = states[(node.port, namespace)]
+        return messages
+
+    @staticmethod
+    def _get_collection_state(db_snapshot, coll_name, coll_info):
+        """Return what identifies the contents of the collection, or None if it isn't known.
+
+        The dbHash command doesn't hash every collection, such as system.profile, so those are
+        always validated.
+        """
+        md5 = db_snapshot.dbhash["collections"].get(coll_name)
+        if md5 is None:
+            return None
+        return (coll_info.get("info", {}).get("uuid"), md5, db_snapshot.indexes[coll_name])
+
+    def _validate(self, node, auth_options, db_name, coll_name):
+        """Validate the collection and return a message if it isn't valid, or None otherwise."""
+        database = self._clients.get(node, auth_options).get_database(db_name)
+        try:
+            res = database.command("validate", coll_name, full=True)
+        except pymongo.errors.OperationFailure as err:
+            if err.code == _NAMESPACE_NOT_FOUND:
+                # The collection was dropped after the databases were snapshotted.
+                return None
+            return "validating the collection {}.{} failed: {}".format(db_name, coll_name, err)
+
+        if not res.get("valid", False):
+            return "the collection {}.{} isn't valid: {}".format(db_name, coll_name, res)
+        return None
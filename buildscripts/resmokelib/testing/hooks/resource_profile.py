@@ -0,0 +1,209 @@
+"""Test hook for profiling the CPU, memory, I/O, and file descriptors used by fixture processes."""
+
+import collections
+import json
+import os.path
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from buildscripts.resmokelib.testing.hooks import interface
+
+# The resources used by a process at the time it was sampled. The 'read_bytes' and 'write_bytes'
+# fields are None on platforms where psutil doesn't report the I/O of a process.
+ResourceSample = collections.namedtuple(
+    "ResourceSample", ["cpu_secs", "rss_bytes", "read_bytes", "write_bytes", "num_fds"])
+
+# Serializes appending to the time-series file, which is shared by the hooks of all of the jobs.
+_TIMESERIES_LOCK = threading.Lock()
+
+
+def sample_process(pid):
+    """Return a ResourceSample of the process 'pid', or None if it doesn't exist anymore."""
+    try:
+        process = psutil.Process(pid)
+        with process.oneshot():
+            cpu_times = process.cpu_times()
+            rss_bytes = process.memory_info().rss
+            try:
+                io_counters = process.io_counters()
+                (read_bytes, write_bytes) = (io_counters.read_bytes, io_counters.write_bytes)
+            except (AttributeError, psutil.AccessDenied):
+                (read_bytes, write_bytes) = (None, None)
+            if hasattr(process, "num_fds"):
+                num_fds = process.num_fds()
+            else:
+                num_fds = process.num_handles()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+
+    return ResourceSample(cpu_times.user + cpu_times.system, rss_bytes, read_bytes, write_bytes,
+                          num_fds)
+
+
+class ResourceUsage(object):
+    """The resources used by the processes of a fixture while a test ran.
+
+    The CPU time and bytes read and written are the sum, over every process, of the difference
+    between its first and last sample. The RSS and number of open file descriptors are the largest
+    sum over the processes of a single sample.
+    """
+
+    def __init__(self):
+        """Initialize the ResourceUsage."""
+        self._first_samples = {}
+        self._last_samples = {}
+        self.num_samples = 0
+        self.peak_rss_bytes = 0
+        self.peak_num_fds = 0
+
+    def add(self, samples):
+        """Add 'samples', a dict of pid to the ResourceSample of the process taken at once."""
+        for (pid, sample) in samples.items():
+            self._first_samples.setdefault(pid, sample)
+            self._last_samples[pid] = sample
+
+        self.num_samples += 1
+        self.peak_rss_bytes = max(self.peak_rss_bytes,
+                                  sum(sample.rss_bytes for sample in samples.values()))
+        self.peak_num_fds = max(self.peak_num_fds,
+                                sum(sample.num_fds for sample in samples.values()))
+
+    def _sum_deltas(self, field):
+        total = 0
+        for (pid, last_sample) in self._last_samples.items():
+            first_value = getattr(self._first_samples[pid], field)
+            last_value = getattr(last_sample, field)
+            if first_value is None or last_value is None:
+                return None
+            total += last_value - first_value
+        return total
+
+    def as_dict(self):
+        """Return the resource usage as a dict, used in the report.json file."""
+        return {
+            "cpu_secs": self._sum_deltas("cpu_secs"),
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "read_bytes": self._sum_deltas("read_bytes"),
+            "write_bytes": self._sum_deltas("write_bytes"),
+            "peak_num_fds": self.peak_num_fds,
+            "num_samples": self.num_samples,
+        }
+
+
+class ProfileFixtureResources(interface.Hook):
+    """Sample the resources used by the processes of the fixture before, during, and after a test.
+
+    The CPU time, RSS, bytes read and written, and number of open file descriptors of each of the
+    processes returned by Fixture.pids() are sampled every 'interval_secs' while a test runs. A
+    summary is added to the test's entry in the report.json file. Every sample is also appended to
+    'timeseries_file' as a JSON line if it is specified.
+    """
+
+    DESCRIPTION = "Profile the resources used by the fixture processes"
+
+    DEFAULT_INTERVAL_SECS = 5
+
+    def __init__(self, hook_logger, fixture, interval_secs=DEFAULT_INTERVAL_SECS,
+                 timeseries_file=None):
+        """Initialize ProfileFixtureResources."""
+        interface.Hook.__init__(self, hook_logger, fixture, ProfileFixtureResources.DESCRIPTION)
+        self._interval_secs = interval_secs
+        self._timeseries_file = timeseries_file
+
+        self._test = None
+        self._usage = None
+        self._stop_event = None
+        self._thread = None
+
+    def before_suite(self, test_report):
+        """Warn that no resources are profiled if the psutil module isn't installed."""
+        if psutil is None:
+            self.logger.warning("Not profiling the resources used by the fixture processes"
+                                " because the psutil module isn't installed.")
+
+    def after_suite(self, test_report):
+        """Stop sampling if the after-test hooks of the last test weren't run."""
+        self._stop_sampling(test_report)
+
+    def before_test(self, test, test_report):
+        """Take the first sample and start sampling periodically."""
+        if psutil is None:
+            return
+
+        # The after-test hooks aren't run when the test fails with fail-fast enabled or the fixture
+        # crashed, so the previous test may still be sampled.
+        self._stop_sampling(test_report)
+
+        self._test = test
+        self._usage = ResourceUsage()
+        self._sample()
+
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ProfileFixtureResources")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def after_test(self, test, test_report):
+        """Take the last sample and add the resource usage of the test to 'test_report'."""
+        self._stop_sampling(test_report)
+
+    def _stop_sampling(self, test_report):
+        """Stop the sampling thread, if any, and report the resource usage of its test."""
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        try:
+            self._sample()
+        except Exception:  # pylint: disable=broad-except
+            # The fixture may have crashed, in which case the usage sampled so far is reported.
+            self.logger.exception("Failed to take the last sample of the fixture processes.")
+
+        test = self._test
+        usage = self._usage.as_dict()
+        test_report.set_resource_usage(test, usage)
+        self.logger.info("Resources used by the fixture processes while running %s: %s",
+                         test.short_name(), json.dumps(usage, sort_keys=True))
+
+    def _run(self):
+        try:
+            while not self._stop_event.wait(self._interval_secs):
+                self._sample()
+        except Exception:  # pylint: disable=broad-except
+            # Profiling is best-effort so the test isn't failed when a sample can't be taken.
+            self.logger.exception("Stopped sampling the resources used by the fixture processes.")
+
+    def _sample(self):
+        """Sample each of the fixture processes and record the samples."""
+        now = time.time()
+        samples = {}
+        for pid in self.fixture.pids():
+            sample = sample_process(pid)
+            if sample is not None:
+                samples[pid] = sample
+
+        self._usage.add(samples)
+        if self._timeseries_file is not None:
+            self._append_to_timeseries(now, samples)
+
+    def _append_to_timeseries(self, now, samples):
+        records = []
+        for (pid, sample) in samples.items():
+            record = {"time": now, "test_file": self._test.test_name,
+                      "job_num": self.fixture.job_num, "pid": pid}
+            record.update(sample._asdict())
+            records.append(json.dumps(record) + "\n")
+
+        with _TIMESERIES_LOCK:
+            dirname = os.path.dirname(self._timeseries_file)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
+            with open(self._timeseries_file, "a") as fp:
+                fp.write("".join(records))
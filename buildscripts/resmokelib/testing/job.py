@@ -18,8 +18,13 @@ class Job(object):  # pylint: disable=too-many-instance-attributes
 
     def __init__(  # pylint: disable=too-many-arguments
             self, job_num, logger, fixture, hooks, report, archival, suite_options,
-            test_queue_logger):
-        """Initialize the job with the specified fixture and hooks."""
+            test_queue_logger, fixture_reused=False, resource_budget=None):
+        """Initialize the job with the specified fixture and hooks.
+
+        If 'fixture_reused' is true, then 'fixture' is already running and only has its data
+        cleared instead of being set up. If 'resource_budget' is specified, then the job waits to
+        run each test until the ResourceBudget has enough units for it.
+        """
 
         self.logger = logger
         self.fixture = fixture
@@ -27,7 +32,9 @@ class Job(object):  # pylint: disable=too-many-instance-attributes
         self.report = report
         self.archival = archival
         self.suite_options = suite_options
-        self.manager = FixtureTestCaseManager(test_queue_logger, self.fixture, job_num, self.report)
+        self.resource_budget = resource_budget
+        self.manager = FixtureTestCaseManager(test_queue_logger, self.fixture, job_num, self.report,
+                                              fixture_reused=fixture_reused)
 
         # Don't check fixture.is_running() when using the ContinuousStepdown hook, which kills
         # and restarts the primary. Even if the fixture is still running as expected, there is a
@@ -55,6 +62,11 @@ class Job(object):  # pylint: disable=too-many-instance-attributes
         """
         setup_succeeded = True
         if setup_flag is not None:
+            # Setting up a fixture uses the machine's resources in the same way as running a test.
+            weight = 0
+            if self.resource_budget is not None:
+                weight = self.resource_budget.acquire(1, interrupt_flag)
+
             try:
                 setup_succeeded = self.manager.setup_fixture(self.logger)
             except errors.StopExecution as err:
@@ -70,6 +82,9 @@ class Job(object):  # pylint: disable=too-many-instance-attributes
                 self.logger.exception("Encountered an error when setting up the fixture.")
                 setup_succeeded = False
 
+            if weight:
+                self.resource_budget.release(weight)
+
             if not setup_succeeded:
                 setup_flag.set()
                 self._interrupt_all_jobs(queue, interrupt_flag)
@@ -120,11 +135,22 @@ class Job(object):  # pylint: disable=too-many-instance-attributes
 
         while not queue.empty() and not interrupt_flag.is_set():
             queue_elem = queue.get_nowait()
+
+            weight = 0
+            if self.resource_budget is not None:
+                weight = self.resource_budget.acquire(queue_elem.resource_weight, interrupt_flag)
+                if not weight:
+                    # The tests were interrupted while waiting for other tests to finish.
+                    queue.task_done()
+                    break
+
             test_time_start = self._get_time()
             try:
                 test = queue_elem.testcase
                 self._execute_test(test)
             finally:
+                if weight:
+                    self.resource_budget.release(weight)
                 queue_elem.job_completed(self._get_time() - test_time_start)
                 queue.task_done()
 
@@ -302,7 +328,8 @@ TestResult = namedtuple('TestResult', ['test', 'hook', 'success'])
 class FixtureTestCaseManager:
     """Class that holds information needed to create new fixture setup/teardown test cases for a single job."""
 
-    def __init__(self, test_queue_logger, fixture, job_num, report):
+    def __init__(  # pylint: disable=too-many-arguments
+            self, test_queue_logger, fixture, job_num, report, fixture_reused=False):
         """
         Initialize the test case manager.
 
@@ -310,21 +337,32 @@ class FixtureTestCaseManager:
         :param fixture: The fixture associated with this job.
         :param job_num: This job's unique identifier.
         :param report: Report object collecting test results.
+        :param fixture_reused: Whether the fixture is already running from a previous suite.
         """
         self.test_queue_logger = test_queue_logger
         self.fixture = fixture
         self.job_num = job_num
         self.report = report
+        self.fixture_reused = fixture_reused
         self.times_set_up = 0  # Setups and kills may run multiple times.
 
     def setup_fixture(self, logger):
         """
         Run a test that sets up the job's fixture and waits for it to be ready.
 
+        If the fixture is reused from a previous suite, then its data is cleared instead.
+
         Return True if the setup was successful, False otherwise.
         """
-        test_case = _fixture.FixtureSetupTestCase(self.test_queue_logger, self.fixture,
-                                                  "job{}".format(self.job_num), self.times_set_up)
+        if self.fixture_reused:
+            # Any later setup, e.g. after the fixture is aborted, must start it from scratch.
+            self.fixture_reused = False
+            test_case = _fixture.FixtureClearDataTestCase(self.test_queue_logger, self.fixture,
+                                                          "job{}".format(self.job_num))
+        else:
+            test_case = _fixture.FixtureSetupTestCase(self.test_queue_logger, self.fixture,
+                                                      "job{}".format(self.job_num),
+                                                      self.times_set_up)
         test_case(self.report)
         if self.report.find_test_info(test_case).status != "pass":
             logger.error("The setup of %s failed.", self.fixture)
@@ -28,6 +28,8 @@ class QueueElem(object):
         """
         self.testcase = testcase
         self.test_config = test_config
+        # The number of resource units the test is expected to use, see testing/resources.py.
+        self.resource_weight = 1
 
     def job_completed(self, job_time):
         """
@@ -4,14 +4,65 @@ This is used to support additional test status and timing information for the re
 """
 
 import copy
+import json
 import threading
 import time
 import unittest
+import uuid
 
 from .. import config as _config
 from .. import logging
 
 
+class ResultStream(object):
+    """A JSON-lines file to which the result of each test is appended as soon as it is known.
+
+    A test's result is appended again each time it changes after the test has finished, e.g. when a
+    hook fails after the test. The last line with a given "test_id" is the test's final result.
+    """
+
+    def __init__(self, pathname):
+        """Initialize the ResultStream and truncate the 'pathname' file."""
+        self.pathname = pathname
+        self._lock = threading.Lock()
+        self._fp = open(pathname, "w")
+
+    def append(self, result):
+        """Write the 'result' dict as a line of the file."""
+        line = json.dumps(result, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._fp is None:
+                return
+            self._fp.write(line)
+            # Flush each line so that readers tailing the file see the results as they're known and
+            # so that they aren't lost if resmoke.py is killed.
+            self._fp.flush()
+
+    def close(self):
+        """Close the file."""
+        with self._lock:
+            if self._fp is not None:
+                self._fp.close()
+                self._fp = None
+
+
+_RESULT_STREAM = None
+
+
+def set_result_stream(result_stream):
+    """Append the results of the tests of every TestReport to 'result_stream', if not None."""
+    global _RESULT_STREAM  # pylint: disable=global-statement
+    _RESULT_STREAM = result_stream
+
+
+def close_result_stream():
+    """Stop appending the results of the tests to the current result stream and close it."""
+    global _RESULT_STREAM  # pylint: disable=global-statement
+    (result_stream, _RESULT_STREAM) = (_RESULT_STREAM, None)
+    if result_stream is not None:
+        result_stream.close()
+
+
 # pylint: disable=attribute-defined-outside-init
 class TestReport(unittest.TestResult):  # pylint: disable=too-many-instance-attributes
     """Record test status and timing information."""
@@ -84,6 +135,7 @@ class TestReport(unittest.TestResult):  # pylint: disable=too-many-instance-attr
         combined_report.num_failed = len(combined_report.get_failed())
         combined_report.num_errored = len(combined_report.get_errored())
         combined_report.num_interrupted = len(combined_report.get_interrupted())
+        combined_report.num_cached = len(combined_report.get_cached())
 
         return combined_report
 
@@ -102,6 +154,12 @@ class TestReport(unittest.TestResult):  # pylint: disable=too-many-instance-attr
             self.job_logger.info("Running %s...", basename)
 
         with self._lock:
+            if test.dynamic:
+                # The TestReport belongs to a single job, so a dynamic test such as a data
+                # consistency check runs after the test which was last started.
+                test_info.after_test_file = self._last_test_file
+            else:
+                self._last_test_file = test.test_name
             self.test_infos.append(test_info)
             if test.dynamic:
                 self.num_dynamic += 1
@@ -123,6 +181,7 @@ class TestReport(unittest.TestResult):  # pylint: disable=too-many-instance-attr
             test_info = self.find_test_info(test)
             test_info.end_time = time.time()
             test_status = "no failures detected" if test_info.status == "pass" else "failed"
+        self._stream_result(test_info)
 
         time_taken = test_info.end_time - test_info.start_time
         self.job_logger.info("%s ran in %0.2f seconds: %s.", test.basename(), time_taken,
@@ -165,6 +224,7 @@ class TestReport(unittest.TestResult):  # pylint: disable=too-many-instance-attr
             test_info.status = "error"
             test_info.evergreen_status = "fail"
             test_info.return_code = 2
+        self._stream_result(test_info)
 
         # Recompute number of success, failures, and errors.
         self.num_succeeded = len(self.get_successful())
@@ -206,6 +266,7 @@ class TestReport(unittest.TestResult):  # pylint: disable=too-many-instance-attr
             else:
                 test_info.evergreen_status = self.suite_options.report_failure_status
             test_info.return_code = return_code
+        self._stream_result(test_info)
 
         # Recompute number of success, failures, and errors.
         self.num_succeeded = len(self.get_successful())
@@ -213,6 +274,29 @@ class TestReport(unittest.TestResult):  # pylint: disable=too-many-instance-attr
         self.num_errored = len(self.get_errored())
         self.num_interrupted = len(self.get_interrupted())
 
+    def add_cached(self, test_file):
+        """Record that 'test_file' wasn't run because its cached result was a pass."""
+
+        test_info = _TestInfo(uuid.uuid4(), test_file, False)
+        test_info.start_time = test_info.end_time = time.time()
+        test_info.status = "cached"
+        test_info.evergreen_status = "pass"
+        test_info.return_code = 0
+
+        with self._lock:
+            self.test_infos.append(test_info)
+            self.num_cached += 1
+        self._stream_result(test_info)
+
+    def set_resource_usage(self, test, resource_usage):
+        """Record the resources used by the fixture while 'test' ran, as a dict."""
+
+        with self._lock:
+            test_info = self.find_test_info(test)
+            test_info.resource_usage = resource_usage
+        if test_info.end_time is not None:
+            self._stream_result(test_info)
+
     def addSuccess(self, test):  # pylint: disable=invalid-name
         """Call when 'test' executed successfully."""
 
@@ -256,6 +340,12 @@ class TestReport(unittest.TestResult):  # pylint: disable=too-many-instance-attr
         with self._lock:
             return [test_info for test_info in self.test_infos if test_info.status == "timeout"]
 
+    def get_cached(self):
+        """Return the status and timing information of the tests whose cached result was used."""
+
+        with self._lock:
+            return [test_info for test_info in self.test_infos if test_info.status == "cached"]
+
     def as_dict(self):
         """Return the test result information as a dictionary.
 
@@ -265,20 +355,7 @@ class TestReport(unittest.TestResult):  # pylint: disable=too-many-instance-attr
         results = []
         with self._lock:
             for test_info in self.test_infos:
-                result = {
-                    "test_file": test_info.test_file,
-                    "status": test_info.evergreen_status,
-                    "exit_code": test_info.return_code,
-                    "start": test_info.start_time,
-                    "end": test_info.end_time,
-                    "elapsed": test_info.end_time - test_info.start_time,
-                }
-
-                if test_info.url_endpoint is not None:
-                    result["url"] = test_info.url_endpoint
-                    result["url_raw"] = test_info.url_endpoint + "?raw=1"
-
-                results.append(result)
+                results.append(test_info.as_dict())
 
             return {
                 "results": results,
@@ -303,7 +380,11 @@ class TestReport(unittest.TestResult):  # pylint: disable=too-many-instance-attr
             test_info.url_endpoint = result.get("url")
             test_info.status = result["status"]
             test_info.evergreen_status = test_info.status
+            if result.get("cached", False):
+                test_info.status = "cached"
             test_info.return_code = result["exit_code"]
+            test_info.resource_usage = result.get("resource_usage")
+            test_info.after_test_file = result.get("after_test_file")
             test_info.start_time = result["start"]
             test_info.end_time = result["end"]
             report.test_infos.append(test_info)
@@ -316,6 +397,7 @@ class TestReport(unittest.TestResult):  # pylint: disable=too-many-instance-attr
         report.num_errored = len(report.get_errored())
         report.num_interrupted = len(report.get_interrupted())
         report.num_succeeded = len(report.get_successful())
+        report.num_cached = len(report.get_cached())
 
         return report
 
@@ -324,12 +406,25 @@ class TestReport(unittest.TestResult):  # pylint: disable=too-many-instance-attr
 
         with self._lock:
             self.test_infos = []
+            self._last_test_file = None
 
             self.num_dynamic = 0
             self.num_succeeded = 0
             self.num_failed = 0
             self.num_errored = 0
             self.num_interrupted = 0
+            self.num_cached = 0
+
+    @staticmethod
+    def _stream_result(test_info):
+        """Append the result of the finished test 'test_info' to the ResultStream, if any."""
+        result_stream = _RESULT_STREAM
+        if result_stream is None:
+            return
+
+        result = test_info.as_dict()
+        result["test_id"] = str(test_info.test_id)
+        result_stream.append(result)
 
     def find_test_info(self, test):
         """Return the status and timing information associated with 'test'."""
@@ -361,6 +456,36 @@ class _TestInfo(object):  # pylint: disable=too-many-instance-attributes
         self.evergreen_status = None
         self.return_code = None
         self.url_endpoint = None
+        self.resource_usage = None
+        # The test which a dynamic test ran after, if any.
+        self.after_test_file = None
+
+    def as_dict(self):
+        """Return the test result information as a dictionary, as found in the report.json file."""
+
+        result = {
+            "test_file": self.test_file,
+            "status": self.evergreen_status,
+            "exit_code": self.return_code,
+            "start": self.start_time,
+            "end": self.end_time,
+            "elapsed": self.end_time - self.start_time,
+        }
+
+        if self.status == "cached":
+            result["cached"] = True
+
+        if self.resource_usage is not None:
+            result["resource_usage"] = self.resource_usage
+
+        if self.after_test_file is not None:
+            result["after_test_file"] = self.after_test_file
+
+        if self.url_endpoint is not None:
+            result["url"] = self.url_endpoint
+            result["url_raw"] = self.url_endpoint + "?raw=1"
+
+        return result
 
 
 def test_order(test_name):
@@ -0,0 +1,202 @@
+"""Limit the tests running at the same time by the machine resources they use."""
+
+import collections
+import os
+import threading
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from .. import selector
+
+# The number of resource units that tests with these tags use. Each unit corresponds to a CPU and
+# MEMORY_PER_UNIT bytes of memory. Tests without any of these tags use a single unit.
+DEFAULT_TAG_WEIGHTS = {
+    "resource_intensive": 4,
+    "requires_sharding": 2,
+}
+
+DEFAULT_WEIGHT = 1
+
+MEMORY_PER_UNIT = 1024 * 1024 * 1024
+
+
+def machine_capacity():
+    """Return the number of resource units available on this machine.
+
+    The capacity is the number of CPUs, reduced to the amount of available memory if the psutil
+    module is installed.
+    """
+    capacity = os.cpu_count() or 1
+    if psutil is not None:
+        capacity = min(capacity, psutil.virtual_memory().available // MEMORY_PER_UNIT)
+    return max(1, int(capacity))
+
+
+def get_test_weight(test_name, tag_weights=None, test_file_explorer=None):
+    """Return the number of resource units the test 'test_name' is expected to use.
+
+    The weight of a JavaScript test is the largest weight of its tags in 'tag_weights'. All other
+    kinds of tests use DEFAULT_WEIGHT.
+    """
+    tag_weights = DEFAULT_TAG_WEIGHTS if tag_weights is None else tag_weights
+    if test_file_explorer is None:
+        test_file_explorer = selector.TestFileExplorer()
+
+    if (not isinstance(test_name, str) or not test_name.endswith(".js")
+            or not os.path.isfile(test_name)):
+        return DEFAULT_WEIGHT
+
+    weights = [tag_weights[tag] for tag in test_file_explorer.jstest_tags(test_name)
+               if tag in tag_weights]
+    return max(weights, default=DEFAULT_WEIGHT)
+
+
+class ResourceBudget(object):
+    """A pool of resource units that Job threads acquire before running each test."""
+
+    _WAIT_SECS = 1
+
+    def __init__(self, capacity):
+        """Initialize the ResourceBudget with 'capacity' units."""
+        if capacity < 1:
+            raise ValueError("capacity must be a positive integer")
+
+        self.capacity = capacity
+        self._available = capacity
+        self._condition = threading.Condition()
+
+    def acquire(self, weight, interrupt_flag):
+        """Block until 'weight' units are available and take them.
+
+        Return the number of units taken, which is at most the capacity so that heavy tests still
+        run by themselves. Return 0 without taking any units if 'interrupt_flag' gets set.
+        """
+        with self._condition:
+            # The capacity may change while waiting.
+            while self._available < min(weight, self.capacity):
+                if interrupt_flag.is_set():
+                    return 0
+                # Wake up periodically to check whether the tests were interrupted.
+                self._condition.wait(ResourceBudget._WAIT_SECS)
+            weight = min(weight, self.capacity)
+            self._available -= weight
+            return weight
+
+    def release(self, weight):
+        """Return 'weight' units taken by acquire()."""
+        with self._condition:
+            self._available += weight
+            self._condition.notify_all()
+
+    def set_capacity(self, capacity):
+        """Change the number of units, waiting for running tests to finish if it is lowered."""
+        if capacity < 1:
+            raise ValueError("capacity must be a positive integer")
+
+        with self._condition:
+            self._available += capacity - self.capacity
+            self.capacity = capacity
+            self._condition.notify_all()
+
+
+# A sample of how busy the machine is. A field is None when it can't be measured on this platform.
+HostLoad = collections.namedtuple("HostLoad",
+                                  ["load_per_cpu", "available_memory_fraction", "iowait_percent"])
+
+
+def sample_host_load():
+    """Return the current HostLoad of the machine."""
+    load_per_cpu = None
+    if hasattr(os, "getloadavg"):
+        load_per_cpu = os.getloadavg()[0] / (os.cpu_count() or 1)
+
+    available_memory_fraction = None
+    iowait_percent = None
+    if psutil is not None:
+        memory = psutil.virtual_memory()
+        available_memory_fraction = memory.available / memory.total
+        iowait_percent = getattr(psutil.cpu_times_percent(interval=None), "iowait", None)
+
+    return HostLoad(load_per_cpu, available_memory_fraction, iowait_percent)
+
+
+class LoadMonitor(threading.Thread):
+    """Periodically adjusts the capacity of a ResourceBudget based on the load of the machine.
+
+    The capacity starts at 'min_capacity'. It is halved whenever the machine is overloaded and
+    raised by one unit whenever the machine has spare resources, up to 'max_capacity'.
+    """
+
+    INTERVAL_SECS = 2
+
+    # (overloaded above, has spare resources below) thresholds for each field of HostLoad.
+    LOAD_PER_CPU_THRESHOLDS = (1.5, 1.0)
+    IOWAIT_PERCENT_THRESHOLDS = (30, 15)
+    # (overloaded below, has spare resources above) thresholds for the available memory.
+    AVAILABLE_MEMORY_FRACTION_THRESHOLDS = (0.1, 0.2)
+
+    def __init__(self, logger, budget, min_capacity, max_capacity, sample_fn=sample_host_load):
+        """Initialize the LoadMonitor and set the capacity of 'budget' to 'min_capacity'."""
+        threading.Thread.__init__(self, name="LoadMonitor")
+        self.daemon = True
+        self.logger = logger
+        self.budget = budget
+        self.min_capacity = min_capacity
+        self.max_capacity = max_capacity
+        self._sample_fn = sample_fn
+        self._stop_event = threading.Event()
+
+        self.budget.set_capacity(min_capacity)
+
+    def run(self):
+        """Adjust the capacity of the budget until stop() is called."""
+        while not self._stop_event.wait(LoadMonitor.INTERVAL_SECS):
+            self.adjust(self._sample_fn())
+
+    def stop(self):
+        """Stop adjusting the capacity of the budget."""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join()
+
+    def adjust(self, host_load):
+        """Update the capacity of the budget based on the HostLoad sample 'host_load'."""
+        capacity = self.budget.capacity
+        if LoadMonitor._is_overloaded(host_load):
+            capacity = max(self.min_capacity, capacity // 2)
+        elif LoadMonitor._has_spare_resources(host_load):
+            capacity = min(self.max_capacity, capacity + 1)
+
+        if capacity != self.budget.capacity:
+            self.logger.info("Changing the number of tests running at once from %d to %d, %s.",
+                             self.budget.capacity, capacity, host_load)
+            self.budget.set_capacity(capacity)
+
+    @staticmethod
+    def _is_overloaded(host_load):
+        return any([
+            _exceeds(host_load.load_per_cpu, LoadMonitor.LOAD_PER_CPU_THRESHOLDS[0]),
+            _exceeds(host_load.iowait_percent, LoadMonitor.IOWAIT_PERCENT_THRESHOLDS[0]),
+            _below(host_load.available_memory_fraction,
+                   LoadMonitor.AVAILABLE_MEMORY_FRACTION_THRESHOLDS[0]),
+        ])
+
+    @staticmethod
+    def _has_spare_resources(host_load):
+        return not any([
+            _exceeds(host_load.load_per_cpu, LoadMonitor.LOAD_PER_CPU_THRESHOLDS[1]),
+            _exceeds(host_load.iowait_percent, LoadMonitor.IOWAIT_PERCENT_THRESHOLDS[1]),
+            _below(host_load.available_memory_fraction,
+                   LoadMonitor.AVAILABLE_MEMORY_FRACTION_THRESHOLDS[1]),
+        ])
+
+
+def _exceeds(value, threshold):
+    return value is not None and value > threshold
+
+
+def _below(value, threshold):
+    return value is not None and value < threshold
@@ -0,0 +1,224 @@
+"""Results of previous test executions keyed by the contents of everything the tests depend on."""
+
+import hashlib
+import json
+import os
+import os.path
+import re
+import threading
+
+from .. import config as _config
+from .. import utils
+
+# Matches the load() calls in a JavaScript file whose argument is a string literal. Files loaded
+# using a computed pathname aren't found and therefore aren't part of the key of the test.
+_LOAD_REGEX = re.compile(r"""\bload\(\s*(['"])(?P<pathname>[^'"]+)\1\s*\)""")
+
+# The command line options which change how the tests run, in addition to the suite's YAML
+# configuration.
+_CONFIG_VARS = [
+    "FLOW_CONTROL",
+    "LOG_FORMAT",
+    "MAJORITY_READ_CONCERN",
+    "MIXED_BIN_VERSIONS",
+    "MONGOD_SET_PARAMETERS",
+    "MONGOS_SET_PARAMETERS",
+    "NO_JOURNAL",
+    "NUM_CLIENTS_PER_FIXTURE",
+    "SERVICE_EXECUTOR",
+    "SHELL_READ_MODE",
+    "SHELL_WRITE_MODE",
+    "STORAGE_ENGINE",
+    "STORAGE_ENGINE_CACHE_SIZE",
+    "TRANSPORT_LAYER",
+    "WT_COLL_CONFIG",
+    "WT_ENGINE_CONFIG",
+    "WT_INDEX_CONFIG",
+]
+
+
+class FileDigests(object):
+    """Computes and remembers the SHA-1 digest of the contents of files.
+
+    A digest is computed again only once the size or modification time of the file changes. The
+    digests are saved to the 'file_digests.json' file of a directory so that the mongod and mongo
+    binaries don't need to be read again by later resmoke.py invocations.
+    """
+
+    FILENAME = "file_digests.json"
+
+    def __init__(self, dirname):
+        """Initialize the FileDigests and load the digests saved in 'dirname'."""
+        self.pathname = os.path.join(dirname, FileDigests.FILENAME)
+        self._lock = threading.Lock()
+        self._digests = {}
+        self._changed = False
+
+        try:
+            with open(self.pathname, "r") as fp:
+                self._digests = json.load(fp)
+        except (FileNotFoundError, ValueError):
+            pass
+
+    def get(self, pathname):
+        """Return the hex digest of the file 'pathname', or None if it doesn't exist."""
+        pathname = os.path.normpath(pathname)
+        try:
+            stat = os.stat(pathname)
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self._digests.get(pathname)
+            if entry is not None and entry[:2] == [stat.st_size, stat.st_mtime_ns]:
+                return entry[2]
+
+        sha1 = hashlib.sha1()
+        with open(pathname, "rb") as fp:
+            for chunk in iter(lambda: fp.read(1024 * 1024), b""):
+                sha1.update(chunk)
+        digest = sha1.hexdigest()
+
+        with self._lock:
+            self._digests[pathname] = [stat.st_size, stat.st_mtime_ns, digest]
+            self._changed = True
+        return digest
+
+    def save(self):
+        """Write the digests to the file if any of them changed."""
+        with self._lock:
+            if not self._changed:
+                return
+            os.makedirs(os.path.dirname(self.pathname), exist_ok=True)
+            tmp_pathname = self.pathname + ".tmp"
+            with open(tmp_pathname, "w") as fp:
+                json.dump(self._digests, fp)
+            os.replace(tmp_pathname, self.pathname)
+            self._changed = False
+
+
+def find_load_dependencies(js_filename):
+    """Return the sorted pathnames of the files 'js_filename' loads, directly or transitively.
+
+    Like the mongo shell, pathnames are resolved relative to the current working directory.
+    """
+    dependencies = set()
+    to_visit = [js_filename]
+    while to_visit:
+        pathname = to_visit.pop()
+        try:
+            with open(pathname, "r", encoding="utf-8", errors="replace") as fp:
+                contents = fp.read()
+        except OSError:
+            continue
+
+        for match in _LOAD_REGEX.finditer(contents):
+            loaded = os.path.normpath(match.group("pathname"))
+            if loaded not in dependencies:
+                dependencies.add(loaded)
+                to_visit.append(loaded)
+
+    dependencies.discard(os.path.normpath(js_filename))
+    return sorted(dependencies)
+
+
+class ResultCache(object):
+    """An append-only store of the outcome of tests, keyed by the contents they depend on.
+
+    Records are stored as JSON lines in the 'result_cache.jsonl' file of a directory. The most
+    recent record for a key wins so a test which fails after having passed is run again.
+    """
+
+    FILENAME = "result_cache.jsonl"
+
+    def __init__(self, dirname):
+        """Initialize the ResultCache and load any existing records from 'dirname'."""
+        self.pathname = os.path.join(dirname, ResultCache.FILENAME)
+        self.digests = FileDigests(dirname)
+        self._lock = threading.Lock()
+        self._statuses = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.pathname, "r") as fp:
+                for line in fp:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A previous resmoke.py invocation may have been killed while appending.
+                        continue
+                    self._statuses[record["key"]] = record["status"]
+        except FileNotFoundError:
+            pass
+
+    def make_suite_key(self, suite_name, executor_config):
+        """Return a digest of the suite, the binaries, and the options shared by all of its tests.
+
+        'executor_config' is the "executor" section of the suite's YAML configuration.
+        """
+        executables = {
+            "mongo": (_config.MONGO_EXECUTABLE, _config.DEFAULT_MONGO_EXECUTABLE),
+            "mongod": (_config.MONGOD_EXECUTABLE, _config.DEFAULT_MONGOD_EXECUTABLE),
+            "mongos": (_config.MONGOS_EXECUTABLE, _config.DEFAULT_MONGOS_EXECUTABLE),
+        }
+        binaries = {
+            name: self.digests.get(utils.default_if_none(executable, default))
+            for (name, (executable, default)) in executables.items()
+        }
+
+        doc = {
+            "suite": suite_name,
+            "executor": executor_config,
+            "binaries": binaries,
+            "options": {var: getattr(_config, var) for var in _CONFIG_VARS},
+        }
+        return _digest_json(doc)
+
+    def make_test_key(self, suite_key, test_name):
+        """Return the key of the test 'test_name' run as part of the suite with 'suite_key'."""
+        doc = {"suite": suite_key, "test": [test_name, self.digests.get(test_name)]}
+        if test_name.endswith(".js"):
+            doc["load"] = [[dependency, self.digests.get(dependency)]
+                           for dependency in find_load_dependencies(test_name)]
+        return _digest_json(doc)
+
+    def has_passed(self, key):
+        """Return true if the last recorded outcome of the test with 'key' is a pass."""
+        with self._lock:
+            return self._statuses.get(key) == "pass"
+
+    def record(self, keys, report):
+        """Append the outcome of the tests in the TestReport 'report'.
+
+        'keys' is a dict of test file to the key of the test. Tests that aren't in 'keys', such as
+        dynamic tests and tests whose result came from the cache, aren't recorded. The passes aren't
+        recorded either if one of the dynamic tests, such as a data consistency check, didn't pass
+        because it isn't known which of the tests caused it.
+        """
+        statuses = ("pass", "fail", "error")
+        if any(test_info.dynamic and test_info.status != "pass" for test_info in report.test_infos):
+            statuses = ("fail", "error")
+
+        records = []
+        for test_info in report.test_infos:
+            key = keys.get(test_info.test_file)
+            if key is None or test_info.dynamic or test_info.status not in statuses:
+                continue
+            records.append({"key": key, "test_file": test_info.test_file,
+                            "status": test_info.status})
+
+        with self._lock:
+            if records:
+                os.makedirs(os.path.dirname(self.pathname), exist_ok=True)
+                with open(self.pathname, "a") as fp:
+                    fp.write("".join(json.dumps(record) + "\n" for record in records))
+
+                for record in records:
+                    self._statuses[record["key"]] = record["status"]
+
+        self.digests.save()
+
+
+def _digest_json(doc):
+    return hashlib.sha1(json.dumps(doc, sort_keys=True, default=str).encode("utf-8")).hexdigest()
@@ -0,0 +1,254 @@
+"""Historical test runtimes used for scheduling the tests of a suite."""
+
+import collections
+import json
+import math
+import os.path
+import threading
+
+from buildscripts.util import testname as _testname
+
+
+def load_runtimes(pathname):
+    """Return a dict of test file to expected runtime (in seconds) read from 'pathname'.
+
+    The file may either be a report.json file written by a previous resmoke.py invocation, a JSON
+    object mapping test files to runtimes, or a JSON list of [test_file, runtime] pairs such as the
+    TestRuntime tuples returned by buildscripts/util/teststats.py.
+    """
+
+    with open(pathname, "r") as fp:
+        doc = json.load(fp)
+
+    if isinstance(doc, dict) and "results" in doc:
+        return _runtimes_from_report(doc)
+
+    if isinstance(doc, dict):
+        pairs = doc.items()
+    elif isinstance(doc, list):
+        pairs = doc
+    else:
+        raise ValueError("Expected a JSON object or list of test runtimes in '{}'".format(pathname))
+
+    runtimes = {}
+    for (test_file, runtime) in pairs:
+        runtimes[_testname.normalize_test_file(test_file)] = float(runtime)
+    return runtimes
+
+
+def _runtimes_from_report(report_dict):
+    """Return the average runtime of each non-dynamic test in a report.json document."""
+
+    totals = {}
+    for result in report_dict["results"]:
+        test_file = result["test_file"]
+        if (_testname.is_resmoke_hook(test_file) or result.get("elapsed") is None
+                or result.get("cached", False)):
+            continue
+
+        test_file = _testname.normalize_test_file(test_file)
+        (total, num_run) = totals.get(test_file, (0.0, 0))
+        totals[test_file] = (total + result["elapsed"], num_run + 1)
+
+    return {test_file: total / num_run for (test_file, (total, num_run)) in totals.items()}
+
+
+def order_longest_first(tests, runtimes):
+    """Return a copy of 'tests' sorted by decreasing expected runtime.
+
+    Tests without any historical runtime are assumed to take the average runtime of the known tests
+    in 'tests'. The sort is stable so tests with the same expected runtime keep their relative order
+    (e.g. the order chosen by --shuffle).
+    """
+
+    known = [runtimes[_testname.normalize_test_file(test)] for test in tests
+             if _testname.normalize_test_file(test) in runtimes]
+    if not known:
+        return list(tests)
+
+    default_runtime = sum(known) / len(known)
+
+    def expected_runtime(test):
+        return runtimes.get(_testname.normalize_test_file(test), default_runtime)
+
+    return sorted(tests, key=expected_runtime, reverse=True)
+
+
+# Subset of the fields of an Evergreen test_stats document used by buildscripts/util/teststats.py.
+HistoricTestStats = collections.namedtuple("HistoricTestStats",
+                                           ["test_file", "avg_duration_pass", "num_pass"])
+
+# Summary of the recent runtimes of a test in a particular suite and fixture configuration.
+RuntimeStats = collections.namedtuple("RuntimeStats", ["num_run", "mean", "p95"])
+
+
+class RuntimeHistory(object):
+    """An append-only store of test runtimes written by resmoke.py after each suite runs.
+
+    Records are stored as JSON lines in the 'runtime_history.jsonl' file of a directory and are
+    keyed by (suite, test file, fixture class). Only the most recent 'window' runtimes of passing
+    executions are kept for each key when the history is loaded. The executors of a resmoke.py
+    invocation share the instance returned by get_runtime_history().
+    """
+
+    FILENAME = "runtime_history.jsonl"
+    DEFAULT_WINDOW = 20
+
+    def __init__(self, dirname, window=DEFAULT_WINDOW):
+        """Initialize the RuntimeHistory and load any existing records from 'dirname'."""
+        self.pathname = os.path.join(dirname, RuntimeHistory.FILENAME)
+        self._window = window
+        self._lock = threading.Lock()
+        self._num_records = 0
+        self._samples = collections.defaultdict(lambda: collections.deque(maxlen=self._window))
+        self._load()
+
+    def _load(self):
+        """Read the records from the history file, if it exists."""
+        try:
+            with open(self.pathname, "r") as fp:
+                for line in fp:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A previous resmoke.py invocation may have been killed while appending.
+                        continue
+                    self._num_records += 1
+                    self._add_sample(record)
+        except FileNotFoundError:
+            pass
+
+    def _add_sample(self, record):
+        if record.get("status") != "pass":
+            return
+        key = (record["suite"], _testname.normalize_test_file(record["test_file"]),
+               record.get("fixture_class"))
+        self._samples[key].append(record["elapsed"])
+
+    def record(self, suite_name, fixture_class, report):
+        """Append the runtimes of the non-dynamic tests in the TestReport 'report'."""
+
+        records = []
+        for test_info in report.test_infos:
+            if (test_info.dynamic or test_info.status == "cached" or test_info.end_time is None
+                    or test_info.start_time is None):
+                continue
+            records.append({
+                "suite": suite_name,
+                "test_file": test_info.test_file,
+                "fixture_class": fixture_class,
+                "status": test_info.status,
+                "elapsed": test_info.end_time - test_info.start_time,
+                "end": test_info.end_time,
+            })
+
+        if not records:
+            return
+
+        with self._lock:
+            os.makedirs(os.path.dirname(self.pathname), exist_ok=True)
+            with open(self.pathname, "a") as fp:
+                fp.write("".join(json.dumps(record) + "\n" for record in records))
+
+            for record in records:
+                self._num_records += 1
+                self._add_sample(record)
+
+    def compact(self):
+        """Rewrite the history file to only contain the records that are still in the window."""
+
+        with self._lock:
+            tmp_pathname = self.pathname + ".tmp"
+            num_records = 0
+            with open(tmp_pathname, "w") as fp:
+                for ((suite_name, test_file, fixture_class), samples) in self._samples.items():
+                    for elapsed in samples:
+                        fp.write(
+                            json.dumps({
+                                "suite": suite_name,
+                                "test_file": test_file,
+                                "fixture_class": fixture_class,
+                                "status": "pass",
+                                "elapsed": elapsed,
+                            }) + "\n")
+                        num_records += 1
+            os.replace(tmp_pathname, self.pathname)
+            self._num_records = num_records
+
+    def needs_compaction(self):
+        """Return True if most of the records in the history file are outside of the window."""
+        num_retained = sum(len(samples) for samples in self._samples.values())
+        return self._num_records > 2 * max(num_retained, self._window)
+
+    def get_stats(self, suite_name, test_file, fixture_class=None):
+        """Return the RuntimeStats of a test, or None if it has never passed."""
+        samples = self._get_samples(suite_name, test_file, fixture_class)
+        if not samples:
+            return None
+
+        ordered = sorted(samples)
+        # Nearest-rank percentile.
+        p95 = ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+        return RuntimeStats(num_run=len(ordered), mean=sum(ordered) / len(ordered), p95=p95)
+
+    def _get_samples(self, suite_name, test_file, fixture_class):
+        """Return the runtimes of a test, across all fixture classes if 'fixture_class' is None."""
+        test_file = _testname.normalize_test_file(test_file)
+        if fixture_class is not None:
+            return list(self._samples.get((suite_name, test_file, fixture_class), []))
+
+        samples = []
+        for ((key_suite, key_test_file, _), key_samples) in self._samples.items():
+            if key_suite == suite_name and key_test_file == test_file:
+                samples.extend(key_samples)
+        return samples
+
+    def _get_test_files(self, suite_name):
+        return sorted({key[1] for key in self._samples if key[0] == suite_name})
+
+    def get_runtimes(self, suite_name, fixture_class=None):
+        """Return a dict of test file to mean runtime for the tests of 'suite_name'.
+
+        The result can be passed to order_longest_first().
+        """
+        runtimes = {}
+        for test_file in self._get_test_files(suite_name):
+            stats = self.get_stats(suite_name, test_file, fixture_class)
+            if stats is not None:
+                runtimes[test_file] = stats.mean
+        return runtimes
+
+    def as_test_stats(self, suite_name):
+        """Return the history of 'suite_name' in the form of Evergreen test_stats documents.
+
+        The returned list can be passed to buildscripts.util.teststats.TestStats in place of the
+        results of the Evergreen test_stats API.
+        """
+        test_stats = []
+        for test_file in self._get_test_files(suite_name):
+            stats = self.get_stats(suite_name, test_file)
+            if stats is not None:
+                test_stats.append(
+                    HistoricTestStats(test_file=test_file, avg_duration_pass=stats.mean,
+                                      num_pass=stats.num_run))
+        return test_stats
+
+
+_RUNTIME_HISTORY_LOCK = threading.Lock()
+_RUNTIME_HISTORY = None
+
+
+def get_runtime_history(dirname):
+    """Return the RuntimeHistory of 'dirname' shared by all of the executors of the process.
+
+    The history file is only read once per process, and the records of every suite are appended
+    and compacted through the same instance. A new history is returned when 'dirname' differs
+    from the one of the previous call.
+    """
+    global _RUNTIME_HISTORY  # pylint: disable=global-statement
+
+    pathname = os.path.join(dirname, RuntimeHistory.FILENAME)
+    with _RUNTIME_HISTORY_LOCK:
+        if _RUNTIME_HISTORY is None or _RUNTIME_HISTORY.pathname != pathname:
+            _RUNTIME_HISTORY = RuntimeHistory(dirname)
+        return _RUNTIME_HISTORY
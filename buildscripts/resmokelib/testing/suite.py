@@ -62,8 +62,13 @@ def synchronized(method):
 class Suite(object):  # pylint: disable=too-many-instance-attributes
     """A suite of tests of a particular kind (e.g. C++ unit tests, dbtests, jstests)."""
 
-    def __init__(self, suite_name, suite_config, suite_options=_config.SuiteOptions.ALL_INHERITED):
-        """Initialize the suite with the specified name and configuration."""
+    def __init__(self, suite_name, suite_config, suite_options=_config.SuiteOptions.ALL_INHERITED,
+                 test_file_explorer=None):
+        """Initialize the suite with the specified name and configuration.
+
+        The tests are selected using 'test_file_explorer' if specified, see
+        resmokelib.selector.filter_tests().
+        """
         self._lock = threading.RLock()
 
         self._suite_name = suite_name
@@ -71,7 +76,7 @@ class Suite(object):  # pylint: disable=too-many-instance-attributes
         self._suite_options = suite_options
 
         self.test_kind = self.get_test_kind_config()
-        self.tests, self.excluded = self._get_tests_for_kind(self.test_kind)
+        self.tests, self.excluded = self._get_tests_for_kind(self.test_kind, test_file_explorer)
 
         self.return_code = None  # Set by the executor.
 
@@ -90,7 +95,7 @@ class Suite(object):  # pylint: disable=too-many-instance-attributes
         """Create a string representation of object for debugging."""
         return f"{self.test_kind}:{self._suite_name}"
 
-    def _get_tests_for_kind(self, test_kind):
+    def _get_tests_for_kind(self, test_kind, test_file_explorer=None):
         """Return the tests to run based on the 'test_kind'-specific filtering policy."""
         selector_config = self.get_selector_config()
 
@@ -102,7 +107,7 @@ class Suite(object):  # pylint: disable=too-many-instance-attributes
                 raise TypeError("Expected dictionary of arguments to mongos")
             return [mongos_options], []
 
-        return _selector.filter_tests(test_kind, selector_config)
+        return _selector.filter_tests(test_kind, selector_config, test_file_explorer)
 
     def get_name(self):
         """Return the name of the test suite."""
@@ -212,7 +217,7 @@ class Suite(object):  # pylint: disable=too-many-instance-attributes
         """Append a summary of the suite onto the string builder 'sb'."""
         if not self._reports and not self._partial_reports:
             sb.append("No tests ran.")
-            summary = _summary.Summary(0, 0.0, 0, 0, 0, 0)
+            summary = _summary.Summary(0, 0.0, 0, 0, 0, 0, 0)
         elif not self._reports and self._partial_reports:
             summary = self.summarize_latest(sb)
         elif len(self._reports) == 1 and not self._partial_reports:
@@ -220,7 +225,7 @@ class Suite(object):  # pylint: disable=too-many-instance-attributes
         else:
             summary = self._summarize_repeated(sb)
 
-        if summary.num_run == 0:
+        if summary.num_run == 0 and summary.num_cached == 0:
             sb.append("Suite did not run any tests.")
             return
 
@@ -265,7 +270,7 @@ class Suite(object):  # pylint: disable=too-many-instance-attributes
         total_time_taken = end_times[-1] - start_times[0]
         sb.append("Executed %d times in %0.2f seconds:" % (num_iterations, total_time_taken))
 
-        combined_summary = _summary.Summary(0, 0.0, 0, 0, 0, 0)
+        combined_summary = _summary.Summary(0, 0.0, 0, 0, 0, 0, 0)
         for iteration in range(num_iterations):
             # Summarize each execution as a bulleted list of results.
             bulleter_sb = []
@@ -303,23 +308,27 @@ class Suite(object):  # pylint: disable=too-many-instance-attributes
         # cannot be said to have succeeded.
         num_failed = report.num_failed + report.num_interrupted
         num_run = report.num_succeeded + report.num_errored + num_failed
+        # Tests whose cached result was used are neither run nor skipped.
+        num_cached = report.num_cached
         # The number of skipped tests is only known if self.options.time_repeat_tests_secs
         # is not specified.
         if self.options.time_repeat_tests_secs:
             num_skipped = 0
         else:
             num_tests = len(self.tests) * self.options.num_repeat_tests
-            num_skipped = num_tests + report.num_dynamic - num_run
+            num_skipped = num_tests + report.num_dynamic - num_run - num_cached
 
         if report.num_succeeded == num_run and num_skipped == 0:
             sb.append("All %d test(s) passed in %0.2f seconds." % (num_run, time_taken))
-            return _summary.Summary(num_run, time_taken, num_run, 0, 0, 0)
+            self._summarize_cached(num_cached, sb)
+            return _summary.Summary(num_run, time_taken, num_run, 0, 0, 0, num_cached)
 
         summary = _summary.Summary(num_run, time_taken, report.num_succeeded, num_skipped,
-                                   num_failed, report.num_errored)
+                                   num_failed, report.num_errored, num_cached)
 
         sb.append("%d test(s) ran in %0.2f seconds"
-                  " (%d succeeded, %d were skipped, %d failed, %d errored)" % summary)
+                  " (%d succeeded, %d were skipped, %d failed, %d errored)" % summary[:6])
+        self._summarize_cached(num_cached, sb)
 
         test_names = []
 
@@ -345,6 +354,13 @@ class Suite(object):  # pylint: disable=too-many-instance-attributes
 
         return summary
 
+    @staticmethod
+    def _summarize_cached(num_cached, sb):
+        """Append the number of tests whose cached result was used onto the string builder 'sb'."""
+        if num_cached > 0:
+            sb.append("%d test(s) weren't run because their cached result was a pass." %
+                      (num_cached))
+
     @staticmethod
     def log_summaries(logger, suites, time_taken):
         """Log summary of all suites."""
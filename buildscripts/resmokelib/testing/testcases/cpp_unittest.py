@@ -1,5 +1,7 @@
 """The unittest.TestCase for C++ unit tests."""
 
+import os.path
+
 from . import interface
 from ... import core
 from ... import utils
@@ -11,13 +13,41 @@ class CPPUnitTestCase(interface.ProcessTestCase):
     REGISTERED_NAME = "cpp_unit_test"
 
     def __init__(self, logger, program_executable, program_options=None):
-        """Initialize the CPPUnitTestCase with the executable to run."""
+        """Initialize the CPPUnitTestCase with the executable to run.
+
+        'program_executable' may also be a list of the executable followed by the names of the
+        suites to run, in which case only those suites of the executable are run.
+        """
+
+        suites = []
+        if not isinstance(program_executable, str):
+            (program_executable, suites) = (program_executable[0], list(program_executable[1:]))
 
-        interface.ProcessTestCase.__init__(self, logger, "C++ unit test", program_executable)
+        # The suites aren't separated from the executable with a ':' because that would make the
+        # test look like a hook to buildscripts.util.testname.is_resmoke_hook().
+        test_name = program_executable
+        if suites:
+            test_name = "%s%s" % (program_executable, self._format_suites(suites))
+
+        interface.ProcessTestCase.__init__(self, logger, "C++ unit test", test_name)
 
         self.program_executable = program_executable
+        self.suites = suites
         self.program_options = utils.default_if_none(program_options, {}).copy()
 
+    @staticmethod
+    def _format_suites(suites):
+        return "[%s]" % (",".join(suites))
+
+    def short_name(self):
+        """Return the basename of the executable without its extension, followed by its suites."""
+        short_name = os.path.splitext(os.path.basename(self.program_executable))[0]
+        if self.suites:
+            short_name += self._format_suites(self.suites)
+        return short_name
+
     def _make_process(self):
-        return core.programs.make_process(self.logger, [self.program_executable],
-                                          **self.program_options)
+        args = [self.program_executable]
+        for suite in self.suites:
+            args.extend(["--suite", suite])
+        return core.programs.make_process(self.logger, args, **self.program_options)
@@ -49,6 +49,30 @@ class FixtureSetupTestCase(FixtureTestCase):
             raise
 
 
+class FixtureClearDataTestCase(FixtureTestCase):
+    """TestCase for clearing the data of a running fixture reused from a previous suite."""
+
+    REGISTERED_NAME = registry.LEAVE_UNREGISTERED
+    PHASE = "clear_data"
+
+    def __init__(self, logger, fixture, job_name):
+        """Initialize the FixtureClearDataTestCase."""
+        FixtureTestCase.__init__(self, logger, job_name, self.PHASE)
+        self.fixture = fixture
+
+    def run_test(self):
+        """Drop the databases left behind by the previous suite."""
+        try:
+            self.return_code = 2
+            self.logger.info("Clearing the data of %s.", self.fixture)
+            self.fixture.clear_data()
+            self.logger.info("Finished clearing the data of %s.", self.fixture)
+            self.return_code = 0
+        except:
+            self.logger.exception("An error occurred while clearing the data of %s.", self.fixture)
+            raise
+
+
 class FixtureTeardownTestCase(FixtureTestCase):
     """TestCase for tearing down a fixture."""
 
@@ -4,6 +4,7 @@ import os
 import os.path
 import sys
 import threading
+import time
 
 from . import interface
 from ... import config
@@ -221,9 +222,76 @@ class JSTestCase(interface.ProcessTestCase):
                             self.basename(), exc_info=thread.exc_info)
                     raise thread.exc_info[1]
 
+    def _make_client_processes(self):
+        """Return a (logger, Process) pair for each client, without starting them.
+
+        The mongo shell invocation is built once and then copied for each client. The clients only
+        differ in their logger and in whether TestData.isMainTest is true.
+        """
+        # pylint: disable=protected-access
+        template = self._create_test_case_for_thread(self.logger, thread_id=1)._make_process()
+
+        eval_index = template.args.index("--eval") + 1
+        not_main_test = 'TestData["isMainTest"] = false'
+        if not_main_test not in template.args[eval_index]:
+            raise ValueError("Expected the --eval argument of the mongo shell to set %s" %
+                             (not_main_test))
+
+        client_processes = []
+        for client_id in range(self.num_clients):
+            logger = self.logger.new_test_thread_logger(self.test_kind, str(client_id))
+            args = list(template.args)
+            if client_id == 0:
+                args[eval_index] = args[eval_index].replace(not_main_test,
+                                                            'TestData["isMainTest"] = true', 1)
+            process = template.__class__(logger, args, env=template.env)
+            client_processes.append((logger, process))
+        return client_processes
+
+    def _run_supervised_copies(self):
+        """Start every client from this thread, CLIENT_STARTUP_STAGGER_MS apart, and wait on them.
+
+        This avoids starting a thread for each client and spreads out the connections the clients
+        make to the fixture when they start.
+        """
+        client_processes = self._make_client_processes()
+        started = []
+        try:
+            for (client_id, (logger, process)) in enumerate(client_processes):
+                if client_id > 0 and config.CLIENT_STARTUP_STAGGER_MS:
+                    time.sleep(config.CLIENT_STARTUP_STAGGER_MS / 1000.0)
+
+                logger.info("Starting %s...\n%s", self.short_description(), process.as_command())
+                process.start()
+                started.append((logger, process))
+                logger.info("%s started with pid %s.", self.short_description(), process.pid)
+        except:
+            self.logger.exception("Encountered an error starting the clients for jstest %s.",
+                                  self.basename())
+            for (_, process) in started:
+                process.stop()
+            raise
+        finally:
+            # Go through each client's return code and store the first nonzero one if it exists.
+            return_code = 0
+            for (logger, process) in started:
+                client_return_code = process.wait()
+                if client_return_code != 0:
+                    logger.error("%s failed.", self.short_description())
+                    if return_code == 0:
+                        return_code = client_return_code
+                else:
+                    logger.info("%s finished.", self.short_description())
+            self.return_code = return_code
+
+        if self.return_code != 0:
+            raise self.failureException("%s failed" % (self.short_description()))
+
     def run_test(self):
         """Execute the test."""
         if self.num_clients == 1:
             self._run_single_copy()
+        elif config.NUM_CLIENTS_STARTED_USING == "supervisor":
+            self._run_supervised_copies()
         else:
             self._run_multiple_copies()
@@ -0,0 +1,35 @@
+"""Exponential backoff with jitter for retrying a check until it succeeds."""
+
+import random
+import time
+
+
+class Backoff(object):
+    """Compute exponentially increasing, randomly jittered intervals to sleep between retries.
+
+    Each interval is chosen uniformly between half and all of the current maximum interval so that
+    the processes polling the same server don't retry in lockstep.
+    """
+
+    def __init__(self, initial_secs=0.01, max_secs=1.0, multiplier=2.0):
+        """Initialize the Backoff."""
+        if initial_secs <= 0 or max_secs < initial_secs or multiplier < 1:
+            raise ValueError("Invalid backoff of {}s to {}s by a factor of {}".format(
+                initial_secs, max_secs, multiplier))
+
+        self._max_secs = max_secs
+        self._multiplier = multiplier
+        self._interval = initial_secs
+
+    def next_interval(self):
+        """Return the number of seconds to wait before the next retry."""
+        interval = self._interval
+        self._interval = min(self._interval * self._multiplier, self._max_secs)
+        return random.uniform(interval / 2, interval)
+
+    def sleep(self, deadline=None):
+        """Sleep for the next interval, without sleeping past 'deadline' if it is specified."""
+        interval = self.next_interval()
+        if deadline is not None:
+            interval = max(0.0, min(interval, deadline - time.time()))
+        time.sleep(interval)
@@ -1,13 +1,18 @@
 """Filename globbing utility."""
 
-import glob as _glob
+import fnmatch
 import os
 import os.path
 import re
+import threading
 
 _GLOBSTAR = "**"
 _CONTAINS_GLOB_PATTERN = re.compile("[*?[]")
 
+# Pathnames are compared without regard to case on the platforms where the file system does so,
+# e.g. Windows, like glob.glob() and fnmatch.fnmatch() do.
+_PATTERN_FLAGS = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+
 
 def is_glob_pattern(string):
     """Return true if 'string' represents a glob pattern, and false otherwise."""
@@ -16,7 +21,38 @@ def is_glob_pattern(string):
     return _CONTAINS_GLOB_PATTERN.search(string) is not None
 
 
-def glob(globbed_pathname):
+class DirectoryCache(object):
+    """The entries of the directories read by iglob().
+
+    Passing the same DirectoryCache to iglob() for many patterns, e.g. the roots of every test
+    suite, means that each directory is only read from disk once. The file system is assumed not to
+    change while the DirectoryCache is in use.
+    """
+
+    def __init__(self):
+        """Initialize the DirectoryCache with no directories."""
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def scan_dir(self, pathname):
+        """Return the entries of the 'pathname' directory, see _scan_dir()."""
+        pathname = os.path.normpath(pathname)
+
+        with self._lock:
+            if pathname in self._entries:
+                return self._entries[pathname]
+
+        entries = _scan_dir(pathname)
+        with self._lock:
+            return self._entries.setdefault(pathname, entries)
+
+    def clear(self):
+        """Forget the entries of every directory."""
+        with self._lock:
+            self._entries.clear()
+
+
+def glob(globbed_pathname, dir_cache=None):
     """Return a list of pathnames matching the 'globbed_pathname' pattern.
 
     In addition to containing simple shell-style wildcards a la fnmatch,
@@ -24,23 +60,27 @@ def glob(globbed_pathname):
     expanded to match zero or more subdirectories.
     """
 
-    return list(iglob(globbed_pathname))
+    return list(iglob(globbed_pathname, dir_cache))
 
 
-def iglob(globbed_pathname):
+def iglob(globbed_pathname, dir_cache=None):
     """Emit a list of pathnames matching the 'globbed_pathname' pattern.
 
     In addition to containing simple shell-style wildcards a la fnmatch,
     the pattern may also contain globstars ("**"), which is recursively
     expanded to match zero or more subdirectories.
+
+    The directories are read through 'dir_cache' if it is specified.
     """
 
+    scan_dir = dir_cache.scan_dir if dir_cache is not None else _scan_dir
+
     parts = _split_path(globbed_pathname)
     parts = _canonicalize(parts)
 
     index = _find_globstar(parts)
     if index == -1:
-        for pathname in _glob.iglob(globbed_pathname):
+        for pathname in _glob(parts, scan_dir):
             # Normalize 'pathname' so exact string comparison can be used later.
             yield os.path.normpath(pathname)
         return
@@ -59,17 +99,158 @@ def iglob(globbed_pathname):
     prefix = os.path.join(*prefix_parts) if prefix_parts else os.curdir
     suffix = os.path.join(*suffix_parts) if suffix_parts else ""
 
-    for (kind, path) in expand(prefix):
+    for (kind, path) in expand(prefix, scan_dir):
         if not suffix_parts:
             yield path
 
         # Avoid following symlinks to avoid an infinite loop
         elif suffix_parts and kind == "dir" and not os.path.islink(path):
             path = os.path.join(path, suffix)
-            for pathname in iglob(path):
+            for pathname in iglob(path, dir_cache):
                 yield pathname
 
 
+def translate(globbed_pathname):
+    """Return a regular expression matching the pathnames that iglob() emits for the pattern.
+
+    The regular expression is meant to be matched against normalized pathnames of files, which
+    lets many patterns be checked against a list of files without reading any directory.
+    """
+
+    parts = _canonicalize(_split_path(globbed_pathname))
+    # iglob() normalizes the pathnames it emits, which removes the "./" components.
+    parts = [part for part in parts if part != os.curdir]
+
+    sep = re.escape(os.sep)
+    res = []
+    for (idx, part) in enumerate(parts):
+        is_last = idx == len(parts) - 1
+        if part == _GLOBSTAR:
+            # Zero or more subdirectories, or any file within them when the pattern ends with "**".
+            res.append(".*" if is_last else "(?:[^{0}]+{0})*".format(sep))
+        elif _is_root(part):
+            res.append(re.escape(part))
+        else:
+            res.append(_translate_part(part))
+            if not is_last:
+                res.append(sep)
+
+    return "(?s:{})\\Z".format("".join(res))
+
+
+def compile_patterns(globbed_pathnames):
+    """Return a compiled regular expression matching the pathnames matching any of the patterns.
+
+    See translate().
+    """
+
+    regex = "|".join("(?:{})".format(translate(pattern)) for pattern in globbed_pathnames)
+    # An empty list of patterns doesn't match any pathname.
+    return re.compile(regex or "(?!)", _PATTERN_FLAGS)
+
+
+def _translate_part(part):
+    """Return a regular expression matching a single path component 'part' a la glob.glob()."""
+
+    if not is_glob_pattern(part):
+        return re.escape(part)
+
+    not_sep = "[^{}]".format(re.escape(os.sep))
+
+    # glob.glob() doesn't match hidden files with wildcards unless the pattern starts with a dot.
+    res = [] if part.startswith(".") else ["(?!\\.)"]
+
+    idx = 0
+    length = len(part)
+    while idx < length:
+        char = part[idx]
+        idx += 1
+        if char == "*":
+            res.append(not_sep + "*")
+        elif char == "?":
+            res.append(not_sep)
+        elif char == "[":
+            # Find the end of the character set the same way as fnmatch.translate().
+            end = idx
+            if end < length and part[end] == "!":
+                end += 1
+            if end < length and part[end] == "]":
+                end += 1
+            while end < length and part[end] != "]":
+                end += 1
+            if end >= length:
+                res.append("\\[")
+                continue
+            chars = part[idx:end].replace("\\", "\\\\")
+            idx = end + 1
+            if chars[0] == "!":
+                chars = "^" + chars[1:]
+            elif chars[0] in ("^", "["):
+                chars = "\\" + chars
+            res.append("[{}]".format(chars))
+        else:
+            res.append(re.escape(char))
+
+    return "".join(res)
+
+
+def _is_root(part):
+    """Return true if the path component 'part' is the root of an absolute path."""
+
+    return bool(part) and os.path.dirname(part) == part
+
+
+def _glob(parts, scan_dir):
+    """Emit the pathnames matching the path components 'parts' a la glob.iglob()."""
+
+    for (idx, part) in enumerate(parts):
+        if is_glob_pattern(part):
+            dirname = os.path.join(*parts[:idx]) if idx > 0 else ""
+            for pathname in _glob_in_dir(dirname, parts[idx:], scan_dir):
+                yield pathname
+            return
+
+    pathname = os.path.join(*parts)
+    if os.path.lexists(pathname):
+        yield pathname
+
+
+def _glob_in_dir(dirname, parts, scan_dir):
+    """Emit the pathnames within the 'dirname' directory matching the path components 'parts'."""
+
+    (part, rest) = (parts[0], parts[1:])
+
+    if not is_glob_pattern(part):
+        pathname = os.path.join(dirname, part)
+        if rest:
+            for xpath in _glob_in_dir(pathname, rest, scan_dir):
+                yield xpath
+        elif os.path.lexists(pathname):
+            yield pathname
+        return
+
+    entries = scan_dir(dirname or os.curdir)
+    if entries is None:
+        return
+
+    match_hidden = part.startswith(".")
+    for (name, is_dir) in entries:
+        # Only directories can contain the pathnames matching the rest of the pattern.
+        if rest and not is_dir:
+            continue
+        if name.startswith(".") and not match_hidden:
+            continue
+        if not fnmatch.fnmatch(name, part):
+            continue
+
+        pathname = os.path.join(dirname, name)
+        if not rest:
+            yield pathname
+            continue
+        for xpath in _glob_in_dir(pathname, rest, scan_dir):
+            yield xpath
+
+
 def _split_path(pathname):
     """Return 'pathname' as a list of path components."""
 
@@ -125,26 +306,51 @@ def _find_globstar(parts):
     return -1
 
 
-def _list_dir(pathname):
+def _scan_dir(pathname):
+    """Return a list of (name, is_dir) pairs for the entries of the 'pathname' directory.
+
+    Symbolic links to directories are considered to be directories, like os.walk() does. If
+    'pathname' does not exist, then None is returned.
+    """
+
+    try:
+        with os.scandir(pathname) as entries:
+            return [(entry.name, _is_dir(entry)) for entry in entries]
+    except OSError:
+        return None  # 'pathname' directory does not exist
+
+
+def _is_dir(entry):
+    """Return true if the os.DirEntry 'entry' is a directory or a symbolic link to one."""
+
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _list_dir(pathname, scan_dir=_scan_dir):
     """Return a pair of subdirectory names and filenames contained within the 'pathname' directory.
 
     If 'pathname' does not exist, then None is returned.
     """
 
-    try:
-        (_root, dirs, files) = next(os.walk(pathname))
-        return (dirs, files)
-    except StopIteration:
+    entries = scan_dir(pathname)
+    if entries is None:
         return None  # 'pathname' directory does not exist
 
+    dirs = [name for (name, is_dir) in entries if is_dir]
+    files = [name for (name, is_dir) in entries if not is_dir]
+    return (dirs, files)
+
 
-def _expand(pathname):
+def _expand(pathname, scan_dir=_scan_dir):
     """Emit tuples of the form ("dir", dirname) and ("file", filename).
 
     The result is for all directories and files contained within the 'pathname' directory.
     """
 
-    res = _list_dir(pathname)
+    res = _list_dir(pathname, scan_dir)
     if res is None:
         return
 
@@ -160,11 +366,11 @@ def _expand(pathname):
 
     for dname in dirs:
         path = os.path.join(pathname, dname)
-        for xpath in _expand(path):
+        for xpath in _expand(path, scan_dir):
             yield xpath
 
 
-def _expand_curdir(pathname):
+def _expand_curdir(pathname, scan_dir=_scan_dir):
     """Emit tuples of the form ("dir", dirname) and ("file", filename).
 
     The result is for all directories and files contained within the 'pathname' directory.
@@ -172,7 +378,7 @@ def _expand_curdir(pathname):
     The returned pathnames omit a "./" prefix.
     """
 
-    res = _list_dir(pathname)
+    res = _list_dir(pathname, scan_dir)
     if res is None:
         return
 
@@ -185,5 +391,5 @@ def _expand_curdir(pathname):
         yield ("file", fname)
 
     for dname in dirs:
-        for xdir in _expand(dname):
+        for xdir in _expand(dname, scan_dir):
             yield xdir
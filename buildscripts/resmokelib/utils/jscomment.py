@@ -5,7 +5,7 @@ import re
 import yaml
 
 # TODO: use a more robust regular expression for matching tags
-_JSTEST_TAGS_RE = re.compile(r".*@tags\s*:\s*(\[[^\]]*\])", re.DOTALL)
+_JSTEST_TAGS_RE = re.compile(r"@tags\s*:\s*(\[[^\]]*\])")
 
 
 def get_tags(pathname):
@@ -28,12 +28,14 @@ def get_tags(pathname):
     """
 
     with open(pathname, 'r', encoding='utf-8') as fp:
-        match = _JSTEST_TAGS_RE.match(fp.read())
-        if match:
+        # The last definition is used, which is what matching the contents of the file against a
+        # pattern starting with a greedy '.*' did without having to backtrack over the whole file.
+        matches = _JSTEST_TAGS_RE.findall(fp.read())
+        if matches:
             try:
                 # TODO: it might be worth supporting the block (indented) style of YAML lists in
                 #       addition to the flow (bracketed) style
-                tags = yaml.safe_load(_strip_jscomments(match.group(1)))
+                tags = yaml.safe_load(_strip_jscomments(matches[-1]))
                 if not isinstance(tags, list) and all(isinstance(tag, str) for tag in tags):
                     raise TypeError("Expected a list of string tags, but got '%s'" % (tags))
                 return tags
@@ -0,0 +1,94 @@
+"""Index of the tags found in the comments of JavaScript test files."""
+
+import json
+import os
+import os.path
+import threading
+
+from . import jscomment
+
+
+class TagIndex(object):
+    """The tags of JavaScript test files keyed by their pathname.
+
+    The tags of a file are only parsed again by jscomment.get_tags() once the size or modification
+    time of the file changes. If 'pathname' is specified, then the index is loaded from and saved to
+    that JSON file so that later invocations of resmoke.py, burn_in_tests.py, or the Evergreen task
+    generators don't need to parse the files again either.
+    """
+
+    # Changing the format of the entries, or how the tags are parsed, must change the version so
+    # that the entries saved by an earlier version aren't used.
+    VERSION = 1
+
+    def __init__(self, pathname=None):
+        """Initialize the TagIndex and load the index saved in 'pathname', if any."""
+        self.pathname = pathname
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._changed = False
+
+        if pathname is None:
+            return
+
+        try:
+            with open(pathname, "r") as fp:
+                index = json.load(fp)
+        except (FileNotFoundError, ValueError):
+            return
+
+        if isinstance(index, dict) and index.get("version") == TagIndex.VERSION:
+            self._entries = index.get("files", {})
+
+    def get_tags(self, test_file):
+        """Return the list of tags found in the comments of 'test_file'."""
+        test_file = os.path.normpath(test_file)
+        stat = os.stat(test_file)
+
+        with self._lock:
+            entry = self._entries.get(test_file)
+            if entry is not None and entry[:2] == [stat.st_size, stat.st_mtime_ns]:
+                return list(entry[2])
+
+        tags = jscomment.get_tags(test_file)
+
+        with self._lock:
+            self._entries[test_file] = [stat.st_size, stat.st_mtime_ns, list(tags)]
+            self._changed = True
+        return tags
+
+    def save(self):
+        """Write the index to its file if it has one and any of the entries changed."""
+        with self._lock:
+            if self.pathname is None or not self._changed:
+                return
+
+            dirname = os.path.dirname(self.pathname)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
+
+            # Write to a temporary file first so that concurrent invocations never read a partially
+            # written index.
+            tmp_pathname = "{}.{}.tmp".format(self.pathname, os.getpid())
+            with open(tmp_pathname, "w") as fp:
+                json.dump({"version": TagIndex.VERSION, "files": self._entries}, fp)
+            os.replace(tmp_pathname, self.pathname)
+            self._changed = False
+
+
+_TAG_INDEX_LOCK = threading.Lock()
+_TAG_INDEX = None
+
+
+def get_tag_index(pathname=None):
+    """Return the TagIndex shared by all of the test selectors of the process.
+
+    The index is saved to 'pathname' if specified. A new index is returned when 'pathname' differs
+    from the one of the previous call.
+    """
+    global _TAG_INDEX  # pylint: disable=global-statement
+
+    with _TAG_INDEX_LOCK:
+        if _TAG_INDEX is None or _TAG_INDEX.pathname != pathname:
+            _TAG_INDEX = TagIndex(pathname)
+        return _TAG_INDEX
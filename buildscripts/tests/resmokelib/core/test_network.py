@@ -0,0 +1,83 @@
+"""Unit tests for buildscripts/resmokelib/core/network.py."""
+
+import socket
+import unittest
+
+import mock
+
+from buildscripts.resmokelib import config
+from buildscripts.resmokelib import errors
+from buildscripts.resmokelib.core import network as _network
+
+# pylint: disable=missing-docstring,protected-access
+
+
+class TestPortAllocator(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(config, "BASE_PORT", 20000)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.busy_ports = set()
+        patcher = mock.patch.object(_network, "_is_port_available",
+                                    side_effect=lambda port: port not in self.busy_ports)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.addCleanup(_network.PortAllocator.reset)
+        _network.PortAllocator.reset()
+
+    def test_default_ranges(self):
+        self.assertEqual(20250, _network.PortAllocator.next_fixture_port(1))
+        self.assertEqual(20251, _network.PortAllocator.next_fixture_port(1))
+        self.assertEqual(20270, _network.PortAllocator.min_test_port(1))
+        self.assertEqual(20499, _network.PortAllocator.max_test_port(1))
+
+    def test_fixture_ports_are_exhausted(self):
+        for _ in range(20):
+            _network.PortAllocator.next_fixture_port(0)
+        with self.assertRaises(errors.PortAllocationError):
+            _network.PortAllocator.next_fixture_port(0)
+
+    def test_ports_in_use_are_skipped(self):
+        self.busy_ports = {20000, 20001, 20003}
+        self.assertEqual(20002, _network.PortAllocator.next_fixture_port(0))
+        self.assertEqual(20004, _network.PortAllocator.next_fixture_port(0))
+
+    def test_ranges_are_sized_for_the_fixture(self):
+        _network.PortAllocator.reset(num_jobs=2, num_fixture_ports=40)
+        self.assertEqual(20050, _network.PortAllocator.min_test_port(0))
+        self.assertEqual(20279, _network.PortAllocator.max_test_port(0))
+        self.assertEqual(20280, _network.PortAllocator.next_fixture_port(1))
+
+        # Small fixtures keep the default ranges.
+        _network.PortAllocator.reset(num_jobs=2, num_fixture_ports=3)
+        self.assertEqual(20020, _network.PortAllocator.min_test_port(0))
+        self.assertEqual(20249, _network.PortAllocator.max_test_port(0))
+
+    def test_ranges_are_shrunk_for_many_jobs(self):
+        _network.PortAllocator.reset(num_jobs=400, num_fixture_ports=3)
+        # There are 45536 ports from 20000 to 65535, so each job gets 113 ports.
+        self.assertEqual(20113, _network.PortAllocator.next_fixture_port(1))
+        self.assertEqual(20133, _network.PortAllocator.min_test_port(1))
+        self.assertEqual(20225, _network.PortAllocator.max_test_port(1))
+        self.assertLessEqual(_network.PortAllocator.max_test_port(399),
+                             _network.PortAllocator.MAX_PORT)
+
+    def test_too_many_jobs(self):
+        with self.assertRaises(errors.PortAllocationError):
+            _network.PortAllocator.reset(num_jobs=1000, num_fixture_ports=3)
+
+    def test_reset_clears_the_used_ports(self):
+        _network.PortAllocator.next_fixture_port(0)
+        _network.PortAllocator.reset()
+        self.assertEqual(20000, _network.PortAllocator.next_fixture_port(0))
+
+
+class TestIsPortAvailable(unittest.TestCase):
+    def test_listening_port_is_unavailable(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.addCleanup(sock.close)
+        sock.bind(("", 0))
+        sock.listen(1)
+        self.assertFalse(_network._is_port_available(sock.getsockname()[1]))
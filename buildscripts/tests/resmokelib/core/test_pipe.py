@@ -3,7 +3,10 @@
 from __future__ import absolute_import
 
 import io
+import os
 import logging
+import re
+import threading
 import unittest
 
 import mock
@@ -43,3 +46,97 @@ class TestLoggerPipe(unittest.TestCase):
     def test_escapes_null_bytes(self):
         calls = self._get_log_calls(b"a\0b")
         self.assertEqual(calls, [mock.call(self.LOG_LEVEL, u"a\\0b")])
+
+    def test_logs_lines_read_together_as_a_batch(self):
+        logger = mock.Mock(spec=["log_lines"])
+        logger_pipe = _pipe.LoggerPipe(logger=logger, level=self.LOG_LEVEL,
+                                       pipe_out=io.BytesIO(b"a\nb \nc"))
+        logger_pipe.wait_until_started()
+        logger_pipe.wait_until_finished()
+
+        self.assertEqual(logger.log_lines.call_args_list, [
+            mock.call(self.LOG_LEVEL, [u"a", u"b"]),
+            mock.call(self.LOG_LEVEL, [u"c"]),
+        ])
+
+    def test_watches_are_set_on_matching_line(self):
+        logger = logging.Logger("for_testing")
+        logger.log = mock.MagicMock()
+        ready = threading.Event()
+        other = threading.Event()
+        watches = [(re.compile("waiting for connections"), ready), (re.compile("never"), other)]
+
+        stdout = io.BytesIO(b"starting\nwaiting for connections on port 20000\n")
+        logger_pipe = _pipe.LoggerPipe(logger=logger, level=self.LOG_LEVEL, pipe_out=stdout,
+                                       watches=watches)
+        logger_pipe.wait_until_started()
+        self.assertTrue(ready.wait(10))
+        logger_pipe.wait_until_finished()
+        # Watches which never matched are set once the output is closed.
+        self.assertTrue(other.is_set())
+
+
+class TestMultiplexedPipe(unittest.TestCase):
+    LOG_LEVEL = logging.DEBUG
+
+    @classmethod
+    def _get_log_calls(cls, output, watches=None):
+        logger = logging.Logger("for_testing")
+        logger.log = mock.MagicMock()
+
+        (read_fd, write_fd) = os.pipe()
+        multiplexed_pipe = _pipe.MultiplexedPipe(logger=logger, level=cls.LOG_LEVEL,
+                                                 pipe_out=os.fdopen(read_fd, "rb"),
+                                                 watches=watches)
+        os.write(write_fd, output)
+        os.close(write_fd)
+        multiplexed_pipe.wait_until_started()
+        multiplexed_pipe.wait_until_finished()
+
+        return logger.log.call_args_list
+
+    def test_logs_each_line(self):
+        calls = self._get_log_calls(b"a \r\nb\n\nc")
+        self.assertEqual(calls, [
+            mock.call(self.LOG_LEVEL, u"a"),
+            mock.call(self.LOG_LEVEL, u"b"),
+            mock.call(self.LOG_LEVEL, u""),
+            mock.call(self.LOG_LEVEL, u"c"),
+        ])
+
+    def test_handles_invalid_utf8_and_null_bytes(self):
+        calls = self._get_log_calls(b"a\x80b\0c\n")
+        self.assertEqual(calls, [mock.call(self.LOG_LEVEL, u"a�b\\0c")])
+
+    def test_reads_more_than_one_chunk(self):
+        lines = [b"x" * 1000] * (3 * _pipe.READ_SIZE // 1000)
+        calls = self._get_log_calls(b"\n".join(lines) + b"\n")
+        self.assertEqual(len(calls), len(lines))
+
+    def test_lines_split_across_chunks(self):
+        logger = logging.Logger("for_testing")
+        logger.log = mock.MagicMock()
+        multiplexed_pipe = _pipe.MultiplexedPipe(logger=logger, level=self.LOG_LEVEL,
+                                                 pipe_out=io.BytesIO(),
+                                                 multiplexer=mock.Mock())
+
+        multiplexed_pipe.handle_output(b"a\nb")
+        multiplexed_pipe.handle_output(b"c\xe2\x82")
+        multiplexed_pipe.handle_output(b"\xac\nd")
+        multiplexed_pipe.handle_eof()
+
+        self.assertEqual(logger.log.call_args_list, [
+            mock.call(self.LOG_LEVEL, u"a"),
+            mock.call(self.LOG_LEVEL, u"bc€"),
+            mock.call(self.LOG_LEVEL, u"d"),
+        ])
+
+    def test_watches(self):
+        ready = threading.Event()
+        other = threading.Event()
+        watches = [(re.compile("waiting for connections"), ready), (re.compile("never"), other)]
+
+        self._get_log_calls(b"starting\nwaiting for connections on port 20000\n", watches)
+        self.assertTrue(ready.is_set())
+        # Watches which never matched are set once the output is closed.
+        self.assertTrue(other.is_set())
@@ -1,9 +1,17 @@
 """Unit tests for the buildscripts.resmokelib.logging.buildlogger module."""
 
+import collections
+import gzip
+import http.server
 import json
+import logging
+import threading
 import unittest
 
+import mock
+
 from buildscripts.resmokelib.logging import buildlogger
+from buildscripts.resmokelib.logging import formatters
 
 # pylint: disable=missing-docstring,protected-access
 
@@ -64,3 +72,154 @@ class TestLogsSplitter(unittest.TestCase):
     def size(logs):
         """Returns the size of the log lines when represented in JSON."""
         return len(json.dumps(logs))
+
+
+class TestBuildloggerHandler(unittest.TestCase):
+    """Unit tests for the handling of batched records by the buildlogger handlers."""
+
+    def test_process_batched_record(self):
+        handler = buildlogger.BuildloggerGlobalHandler({"username": "u", "password": "p"},
+                                                       build_id="b")
+        handler.setFormatter(formatters.ISO8601Formatter(fmt="[%(name)s] %(message)s"))
+        record = logging.makeLogRecord({"name": "fixture", "lines": ["a", "b"], "created": 1.0})
+        self.assertEqual(
+            handler.process_batched_record(record), [(1.0, "[fixture] a"), (1.0, "[fixture] b")])
+
+
+class _FakeLogkeeperRequestHandler(http.server.BaseHTTPRequestHandler):
+    # Allow the connections to be kept alive.
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        server = self.server
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+
+        with server.lock:
+            server.connections.add(self.client_address)
+            if server.fail:
+                server.failed_request.set()
+                self._respond(500, {})
+            elif server.max_size is not None and len(body) > server.max_size:
+                self._respond(413, {"max_size": server.max_size})
+            else:
+                server.logs[self.path].extend(json.loads(body.decode("utf-8")))
+                self._respond(200, {})
+
+    def _respond(self, status, data):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class _FakeLogkeeper(http.server.ThreadingHTTPServer):
+    """A stand-in for the logkeeper server which records the log lines sent to each endpoint."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        http.server.ThreadingHTTPServer.__init__(self, ("localhost", 0),
+                                                 _FakeLogkeeperRequestHandler)
+        self.lock = threading.Lock()
+        self.logs = collections.defaultdict(list)
+        self.connections = set()
+        self.fail = False
+        self.failed_request = threading.Event()
+        self.max_size = None
+
+    @property
+    def url(self):
+        return "http://localhost:%d" % self.server_address[1]
+
+
+class TestBuildloggerSender(unittest.TestCase):
+    """Unit tests for sending the log lines to a stand-in logkeeper server."""
+
+    def setUp(self):
+        self.logkeeper = _FakeLogkeeper()
+        thread = threading.Thread(target=self.logkeeper.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.logkeeper.server_close)
+        self.addCleanup(self.logkeeper.shutdown)
+
+        patcher = mock.patch.object(buildlogger, "BUILDLOGGER_FALLBACK")
+        self.fallback_logger = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(buildlogger._INCOMPLETE_LOG_OUTPUT.clear)
+
+    def _make_handler(self, build_id):
+        with mock.patch.object(buildlogger._config, "BUILDLOGGER_URL", self.logkeeper.url):
+            return buildlogger.BuildloggerGlobalHandler({"username": "u", "password": "p"},
+                                                        build_id=build_id)
+
+    def test_sends_lines_in_order(self):
+        handlers = [self._make_handler("b%d" % i) for i in range(8)]
+        for i in range(10):
+            for handler in handlers:
+                handler._flush_buffer_with_lock([(float(i), "line %d" % i)], close_called=False)
+        for handler in handlers:
+            handler.close()
+
+        expected = [[float(i), "line %d" % i] for i in range(10)]
+        for i in range(len(handlers)):
+            self.assertEqual(self.logkeeper.logs["/build/b%d/" % i], expected)
+        # The connections are kept alive across handlers.
+        self.assertLessEqual(len(self.logkeeper.connections), buildlogger._Sender.NUM_THREADS)
+        self.assertFalse(buildlogger.is_log_output_incomplete())
+
+    def test_splits_requests_that_are_too_large(self):
+        self.logkeeper.max_size = 100
+        handler = self._make_handler("b")
+        log_lines = [(0.0, "line %d" % i) for i in range(20)]
+        handler._flush_buffer_with_lock(log_lines, close_called=False)
+        handler.close()
+
+        self.assertEqual(self.logkeeper.logs["/build/b/"], [list(line) for line in log_lines])
+        self.assertEqual(handler.max_size, 100)
+
+    def test_retries_lines_that_failed_to_be_sent(self):
+        self.logkeeper.fail = True
+        handler = self._make_handler("b")
+        handler._flush_buffer_with_lock([(0.0, "a")], close_called=False)
+        self.assertTrue(self.logkeeper.failed_request.wait(10))
+        self.logkeeper.fail = False
+        handler._flush_buffer_with_lock([(1.0, "b")], close_called=False)
+        handler.close()
+
+        self.assertEqual(self.logkeeper.logs["/build/b/"], [[0.0, "a"], [1.0, "b"]])
+        self.assertFalse(buildlogger.is_log_output_incomplete())
+
+    def test_spills_lines_to_disk_until_they_can_be_sent(self):
+        self.logkeeper.fail = True
+        with mock.patch.object(buildlogger, "_MAX_BUFFERED_BYTES", 50):
+            handler = self._make_handler("b")
+        log_lines = [(float(i), "line %d" % i) for i in range(20)]
+        for line in log_lines:
+            handler._flush_buffer_with_lock([line], close_called=False)
+        self.assertTrue(self.logkeeper.failed_request.wait(10))
+
+        # The log lines are sent once the endpoint recovers, even if no more lines are logged.
+        self.logkeeper.fail = False
+        handler.flush()
+        handler.close()
+
+        self.assertEqual(self.logkeeper.logs["/build/b/"], [list(line) for line in log_lines])
+        self.assertFalse(buildlogger.is_log_output_incomplete())
+
+    def test_discards_lines_on_close_if_they_cannot_be_sent(self):
+        self.logkeeper.fail = True
+        handler = self._make_handler("b")
+        handler._flush_buffer_with_lock([(0.0, "a")], close_called=False)
+        handler.close()
+
+        self.assertEqual(self.logkeeper.logs["/build/b/"], [])
+        self.assertTrue(buildlogger.is_log_output_incomplete())
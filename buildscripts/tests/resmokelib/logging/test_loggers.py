@@ -0,0 +1,74 @@
+"""Unit tests for the buildscripts.resmokelib.logging.loggers module."""
+
+import io
+import logging
+import unittest
+
+import mock
+
+from buildscripts.resmokelib.logging import formatters
+from buildscripts.resmokelib.logging import loggers
+
+# pylint: disable=missing-docstring
+
+
+class TestLogLines(unittest.TestCase):
+    def _make_logger(self, log_format):
+        logger = loggers.BaseLogger("fixture:job0")
+        stream = io.StringIO()
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(formatters.ISO8601Formatter(fmt=log_format))
+        logger.addHandler(handler)
+        return (logger, stream)
+
+    def test_formats_each_line(self):
+        (logger, stream) = self._make_logger("[%(name)s] %(message)s")
+        logger.log_lines(logging.INFO, ["a", "", "b %s"])
+        self.assertEqual(stream.getvalue(),
+                         "[fixture:job0] a\n[fixture:job0] \n[fixture:job0] b %s\n")
+
+    def test_formats_time_once_for_all_lines(self):
+        (logger, stream) = self._make_logger("%(asctime)s %(message)s!")
+        logger.log_lines(logging.INFO, ["a", "b"])
+        (line_a, line_b) = stream.getvalue().splitlines()
+        self.assertTrue(line_a.endswith(" a!"))
+        self.assertEqual(line_a[:-3], line_b[:-3])
+
+    def test_format_without_message(self):
+        (logger, stream) = self._make_logger("[%(name)s]")
+        logger.log_lines(logging.INFO, ["a", "b"])
+        self.assertEqual(stream.getvalue(), "[fixture:job0]\n")
+
+    def test_single_record_is_unchanged(self):
+        (logger, stream) = self._make_logger("[%(name)s] %(message)s")
+        logger.info("a\nb")
+        self.assertEqual(stream.getvalue(), "[fixture:job0] a\nb\n")
+
+    def test_skips_disabled_level(self):
+        (logger, stream) = self._make_logger("[%(name)s] %(message)s")
+        logger.setLevel(logging.INFO)
+        logger.log_lines(logging.DEBUG, ["a"])
+        logger.log_lines(logging.INFO, [])
+        self.assertEqual(stream.getvalue(), "")
+
+
+class TestFixtureLogger(unittest.TestCase):
+    def setUp(self):
+        logging_config = {loggers.FIXTURE_LOGGER_NAME: {"handlers": [{"class": "buildlogger"}]}}
+        self.server = mock.Mock()
+        self.server.get_global_handler.side_effect = lambda *_: logging.NullHandler()
+        root_logger = loggers.BaseLogger("fixture", logging_config=logging_config,
+                                         build_logger_server=self.server)
+        self.logger = loggers.FixtureLogger("MongoDFixture", 0, "build0", root_logger)
+
+    @mock.patch("buildscripts.resmokelib.logging.flush.close_later")
+    def test_reset_build_id(self, mock_close_later):
+        node_logger = self.logger.new_fixture_node_logger("primary")
+        [old_handler] = self.logger.handlers
+
+        self.logger.reset_build_id("build1")
+        mock_close_later.assert_called_once_with(old_handler)
+        self.assertEqual(len(self.logger.handlers), 1)
+        self.assertIsNot(self.logger.handlers[0], old_handler)
+        self.assertEqual(self.server.get_global_handler.call_args[0], ("build1", {}))
+        self.assertIs(node_logger.parent, self.logger)
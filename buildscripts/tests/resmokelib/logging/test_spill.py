@@ -0,0 +1,84 @@
+"""Unit tests for the buildscripts.resmokelib.logging.spill module."""
+
+import os
+import unittest
+
+from buildscripts.resmokelib.logging import spill
+
+# pylint: disable=missing-docstring,protected-access
+
+
+class TestSpillBuffer(unittest.TestCase):
+    def setUp(self):
+        self.stats = spill.SpillStats()
+
+    def _make_buffer(self, max_memory_bytes=4, max_disk_bytes=100):
+        buf = spill.SpillBuffer(max_memory_bytes, max_disk_bytes, stats=self.stats)
+        self.addCleanup(buf.clear)
+        return buf
+
+    def _patch_segment_bytes(self, segment_bytes):
+        original = spill.SpillBuffer.SEGMENT_BYTES
+        spill.SpillBuffer.SEGMENT_BYTES = segment_bytes
+        self.addCleanup(setattr, spill.SpillBuffer, "SEGMENT_BYTES", original)
+
+    def _take_all(self, buf):
+        lines = []
+        while buf:
+            lines.extend(buf.take())
+        return lines
+
+    def test_keeps_lines_in_memory(self):
+        buf = self._make_buffer()
+        self.assertFalse(buf)
+        self.assertEqual(buf.append([b"a", b"b"]), 0)
+        self.assertTrue(buf)
+        self.assertEqual(buf.take(), [b"a", b"b"])
+        self.assertFalse(buf)
+        self.assertEqual(self.stats.bytes_buffered, 2)
+        self.assertEqual(self.stats.bytes_spilled, 0)
+
+    def test_spills_lines_to_disk_in_order(self):
+        buf = self._make_buffer()
+        buf.append([b"aa", b"bb", b"cc"])
+        # Lines added after spilling are spilled too so they come after the spilled lines.
+        buf.append([b"d"])
+        self.assertEqual(self.stats.bytes_spilled, 3)
+
+        self.assertEqual(buf.take(), [b"aa", b"bb"])
+        self.assertEqual(buf.take(), [b"cc", b"d"])
+        self.assertFalse(buf)
+
+    def test_reads_back_one_segment_at_a_time(self):
+        self._patch_segment_bytes(4)
+        buf = self._make_buffer(max_memory_bytes=0)
+        buf.append([b"aa", b"bb", b"cc", b"dd", b"ee"])
+        self.assertEqual(len(buf._segments), 3)
+        pathname = buf._segments[0][0]
+
+        self.assertEqual(buf.take(), [b"aa", b"bb"])
+        self.assertFalse(os.path.exists(pathname))
+        self.assertEqual(self._take_all(buf), [b"cc", b"dd", b"ee"])
+
+    def test_put_back_returns_lines_to_the_start(self):
+        buf = self._make_buffer()
+        buf.append([b"aa", b"bb", b"cc"])
+        lines = buf.take()
+        buf.append([b"d"])
+        buf.put_back(lines[1:])
+        self.assertEqual(self._take_all(buf), [b"bb", b"cc", b"d"])
+
+    def test_drops_lines_that_do_not_fit_on_disk(self):
+        buf = self._make_buffer(max_memory_bytes=2, max_disk_bytes=2)
+        self.assertEqual(buf.append([b"aa", b"bb", b"cc"]), 2)
+        self.assertEqual(self.stats.bytes_dropped, 2)
+        self.assertEqual(self._take_all(buf), [b"aa", b"bb"])
+
+    def test_clear(self):
+        buf = self._make_buffer()
+        buf.append([b"aa", b"bb", b"cc"])
+        pathname = buf._segments[0][0]
+        self.assertEqual(buf.clear(), 3)
+        self.assertFalse(buf)
+        self.assertFalse(os.path.exists(pathname))
+        self.assertEqual(self.stats.bytes_dropped, 6)
@@ -0,0 +1,189 @@
+"""Unit tests for the resmokelib.reportfile module."""
+
+import json
+import os
+import tempfile
+import unittest
+
+import mock
+
+from buildscripts.resmokelib import config
+from buildscripts.resmokelib import reportfile
+from buildscripts.resmokelib.testing import report as _report
+
+# pylint: disable=missing-docstring
+
+
+def _result(test_file, status, exit_code=0):
+    return {"test_file": test_file, "status": status, "exit_code": exit_code, "start": 0, "end": 1}
+
+
+class TestLoadFailedTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.pathname = os.path.join(self.tmpdir.name, "report.json")
+
+    def test_failed_tests_and_hooks(self):
+        with open(self.pathname, "w") as fp:
+            json.dump({
+                "failures": 4,
+                "results": [
+                    _result("jstests/core/passed.js", "pass"),
+                    _result("jstests/core/failed.js", "fail", 1),
+                    _result("jstests\\core\\silent.js", "silentfail", 1),
+                    _result("jstests/core/hooked.js", "pass"),
+                    _result("hooked:ValidateCollections", "pass"),
+                    _result("hooked:CheckReplDBHash", "fail", 2),
+                    _result("job0_fixture_setup_0", "fail", 2),
+                ],
+            }, fp)
+
+        self.assertEqual({
+            "jstests/core/failed.js",
+            "jstests/core/silent.js",
+            "hooked:CheckReplDBHash",
+            "jstests/core/hooked.js",
+            "job0_fixture_setup_0",
+        }, reportfile.load_failed_tests(self.pathname))
+
+    def test_hook_is_attributed_to_the_test_it_ran_after(self):
+        hook_result = _result("basic:CheckReplDBHash", "fail", 2)
+        hook_result["after_test_file"] = "jstests/sharding/basic.js"
+        with open(self.pathname, "w") as fp:
+            json.dump({
+                "failures": 1,
+                "results": [
+                    # The results of another job can precede the hook in older reports.
+                    _result("jstests/parallel/basic.js", "pass"),
+                    hook_result,
+                ],
+            }, fp)
+
+        self.assertEqual({"basic:CheckReplDBHash", "jstests/sharding/basic.js"},
+                         reportfile.load_failed_tests(self.pathname))
+
+    def test_hook_after_a_test_of_another_job_is_not_attributed(self):
+        with open(self.pathname, "w") as fp:
+            json.dump({
+                "failures": 1,
+                "results": [
+                    _result("jstests/core/other.js", "pass"),
+                    _result("basic:CheckReplDBHash", "fail", 2),
+                ],
+            }, fp)
+
+        self.assertEqual({"basic:CheckReplDBHash"}, reportfile.load_failed_tests(self.pathname))
+
+
+class TestReportStream(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.report_file = os.path.join(self.tmpdir.name, "report.json")
+        self.stream_file = os.path.join(self.tmpdir.name, "report.jsonl")
+
+        patcher = mock.patch.object(config, "REPORT_FILE", self.report_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        reportfile.open_stream()
+        self.addCleanup(reportfile.close_stream)
+
+        self.report = _report.TestReport(mock.Mock(), mock.Mock(report_failure_status="fail"))
+
+    def _finish_test(self, test_file, status):
+        test_info = _report._TestInfo(test_file + "_id", test_file, False)
+        test_info.start_time = test_info.end_time = 1
+        test_info.status = test_info.evergreen_status = status
+        test_info.return_code = 0 if status == "pass" else 1
+        self.report.test_infos.append(test_info)
+        self.report._stream_result(test_info)
+
+    def _read_stream(self):
+        with open(self.stream_file, "r") as fp:
+            return [json.loads(line) for line in fp]
+
+    def test_get_stream_pathname(self):
+        self.assertEqual("dir/report.jsonl", reportfile.get_stream_pathname("dir/report.json"))
+        self.assertEqual("report.jsonl.jsonl", reportfile.get_stream_pathname("report.jsonl"))
+
+    def test_results_are_appended(self):
+        self._finish_test("jstests/core/a.js", "pass")
+        self.report.add_cached("jstests/core/b.js")
+        results = self._read_stream()
+        self.assertEqual(["jstests/core/a.js", "jstests/core/b.js"],
+                         [result["test_file"] for result in results])
+        self.assertEqual("jstests/core/a.js_id", results[0]["test_id"])
+        self.assertTrue(results[1]["cached"])
+
+    def test_changed_result_is_appended(self):
+        self._finish_test("jstests/core/a.js", "pass")
+        test = mock.Mock(**{"id.return_value": "jstests/core/a.js_id"})
+        self.report.setFailure(test, return_code=2)
+        self.assertEqual([("pass", 0), ("fail", 2)],
+                         [(result["status"], result["exit_code"])
+                          for result in self._read_stream()])
+
+    def test_load_failed_tests_from_stream(self):
+        self._finish_test("jstests/core/a.js", "pass")
+        self._finish_test("jstests/core/b.js", "pass")
+        self._finish_test("jstests/core/c.js", "fail")
+        self.report.setFailure(mock.Mock(**{"id.return_value": "jstests/core/b.js_id"}))
+        reportfile.close_stream()
+
+        # Simulate resmoke.py being killed while writing a result.
+        with open(self.stream_file, "a") as fp:
+            fp.write('{"test_file": "jstests/core/d.js", "sta')
+
+        self.assertEqual({"jstests/core/b.js", "jstests/core/c.js"},
+                         reportfile.load_failed_tests(self.stream_file))
+
+    def test_closed_stream_is_not_written(self):
+        reportfile.close_stream()
+        self._finish_test("jstests/core/a.js", "pass")
+        self.assertEqual([], self._read_stream())
+
+
+class TestAfterTestFile(unittest.TestCase):
+    @staticmethod
+    def _start_test(test_report, test_name, dynamic):
+        test = mock.Mock(test_name=test_name, dynamic=dynamic)
+        test.id.return_value = test_name
+        test.as_command.return_value = None
+        test_report.startTest(test)
+
+    def test_dynamic_test_records_the_test_it_ran_after(self):
+        test_report = _report.TestReport(mock.Mock(), mock.Mock())
+        self._start_test(test_report, "jstests/sharding/basic.js", False)
+        self._start_test(test_report, "basic:CheckReplDBHash", True)
+        self._start_test(test_report, "basic:ValidateCollections", True)
+
+        self.assertEqual([None, "jstests/sharding/basic.js", "jstests/sharding/basic.js"],
+                         [test_info.after_test_file for test_info in test_report.test_infos])
+
+
+class TestOrderFailedTestsFirst(unittest.TestCase):
+    TESTS = [
+        "jstests/core/a.js",
+        "jstests/core/failed.js",
+        ["jstests/concurrency/fsm_workloads/b.js", "jstests/concurrency/fsm_workloads/c.js"],
+        "jstests/core/hooked.js",
+        "jstests/parallel/failed.js",
+    ]
+    FAILED_TESTS = {"jstests/core/failed.js", "jstests/core/hooked.js"}
+
+    def test_only_failed_tests(self):
+        self.assertEqual((["jstests/core/failed.js", "jstests/core/hooked.js"], 2),
+                         reportfile.order_failed_tests_first(self.TESTS, self.FAILED_TESTS,
+                                                             include_remaining=False))
+
+    def test_failed_tests_then_remaining_tests(self):
+        (tests, num_failed) = reportfile.order_failed_tests_first(self.TESTS, self.FAILED_TESTS,
+                                                                  include_remaining=True)
+        self.assertEqual(2, num_failed)
+        self.assertEqual([
+            "jstests/core/failed.js", "jstests/core/hooked.js", "jstests/core/a.js",
+            ["jstests/concurrency/fsm_workloads/b.js", "jstests/concurrency/fsm_workloads/c.js"],
+            "jstests/parallel/failed.js"
+        ], tests)
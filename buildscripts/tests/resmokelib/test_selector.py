@@ -4,6 +4,8 @@ import fnmatch
 import os.path
 import unittest
 
+import mock
+
 import buildscripts.resmokelib.parser as parser
 import buildscripts.resmokelib.selector as selector
 import buildscripts.resmokelib.utils.globstar as globstar
@@ -88,6 +90,36 @@ class TestExpressions(unittest.TestCase):
         with self.assertRaises(ValueError):
             selector.make_expression({"$anyOf": ["tag1", "tag2"], "invalid": "tag3"})
 
+    def test_compiled_expression_matches_expression(self):
+        confs = [
+            "tag1",
+            {"$allOf": []},
+            {"$anyOf": []},
+            {"$allOf": ["tag1", "tag2"]},
+            {"$anyOf": ["tag1", "tag2"]},
+            {"$not": {"$anyOf": ["tag1", "tag3"]}},
+            {"$allOf": [{"$anyOf": ["tag1", "tag2"]}, "tag3", {"$not": "tag4"}]},
+            {"$anyOf": [{"$allOf": ["tag1", "tag2"]}, "tag3", {"$not": {"$allOf": []}}]},
+        ]
+        tag_lists = [[], ["tag1"], ["tag2"], ["tag1", "tag2"], ["tag1", "tag3"],
+                     ["tag2", "tag3", "tag4"], ["tag1", "tag2", "tag3"], ["other_tag"]]
+        for conf in confs:
+            expression = selector.make_expression(conf)
+            compiled = expression.compile()
+            for tags in tag_lists:
+                self.assertEqual(
+                    expression(tags), compiled(selector._TAG_BITS.get_mask(tags)),
+                    msg="{} with {}".format(conf, tags))
+
+    def test_tag_bits(self):
+        tag_bits = selector._TagBits()
+        self.assertEqual(0, tag_bits.get_mask([]))
+        self.assertEqual(tag_bits.get_bit("tag1"), tag_bits.get_mask(["tag1", "tag1"]))
+        self.assertEqual(
+            tag_bits.get_mask(["tag1", "tag2"]),
+            tag_bits.get_bit("tag1") | tag_bits.get_bit("tag2"))
+        self.assertNotEqual(tag_bits.get_bit("tag1"), tag_bits.get_bit("tag2"))
+
 
 class TestTestFileExplorer(unittest.TestCase):
     @classmethod
@@ -104,6 +136,44 @@ class TestTestFileExplorer(unittest.TestCase):
         self.assertFalse(self.test_file_explorer.fnmatchcase("other/file.js", pattern))
 
 
+class TestCachingTestFileExplorer(unittest.TestCase):
+    def setUp(self):
+        self.test_file_explorer = selector.CachingTestFileExplorer()
+
+    @mock.patch.object(globstar, "iglob")
+    def test_glob_pattern_is_expanded_once(self, mock_iglob):
+        mock_iglob.return_value = iter(["dir/test1.js", "dir/test2.js"])
+        for _ in range(2):
+            self.assertEqual(["dir/test1.js", "dir/test2.js"],
+                             self.test_file_explorer.iglob("dir/*.js"))
+        mock_iglob.assert_called_once_with("dir/*.js", self.test_file_explorer._dir_cache)
+
+    @mock.patch.object(globstar, "iglob")
+    def test_cached_paths_cannot_be_modified(self, mock_iglob):
+        mock_iglob.return_value = iter(["dir/test1.js"])
+        self.test_file_explorer.iglob("dir/*.js").append("dir/test2.js")
+        self.assertEqual(["dir/test1.js"], self.test_file_explorer.iglob("dir/*.js"))
+
+    @mock.patch.object(os.path, "isfile")
+    def test_isfile_is_cached(self, mock_isfile):
+        mock_isfile.return_value = True
+        self.assertTrue(self.test_file_explorer.isfile("dir/test1.js"))
+        self.assertTrue(self.test_file_explorer.isfile("dir/test1.js"))
+        mock_isfile.assert_called_once_with("dir/test1.js")
+
+    @mock.patch.object(selector.TestFileExplorer, "parse_tag_file")
+    def test_tag_file_is_parsed_once_per_test_kind(self, mock_parse_tag_file):
+        mock_parse_tag_file.return_value = {"dir/test1.js": ["tag1"]}
+        self.test_file_explorer.parse_tag_file("js_test")
+        self.test_file_explorer.parse_tag_file("js_test")
+        self.test_file_explorer.parse_tag_file("fsm_workload_test")
+        self.assertEqual(2, mock_parse_tag_file.call_count)
+
+        tagged_tests = self.test_file_explorer.parse_tag_file("js_test")
+        self.assertEqual(["tag1"], tagged_tests["dir/test1.js"])
+        self.assertEqual([], tagged_tests["dir/test2.js"])
+
+
 class MockTestFileExplorer(object):
     """Component giving access to mock test files data."""
 
@@ -147,6 +217,9 @@ class MockTestFileExplorer(object):
     def list_dbtests(self, binary):  # pylint: disable=no-self-use,unused-argument
         return ["dbtestA", "dbtestB", "dbtestC"]
 
+    def list_unittest_suites(self, binary):  # pylint: disable=no-self-use,unused-argument
+        return ["suite1", "suite2", "suite3", "suite4", "suite5"]
+
     def parse_tag_file(self, test_kind):
         if test_kind == "js_test":
             return self.jstest_tag_file
@@ -471,6 +544,25 @@ class TestFilterTests(unittest.TestCase):
         self.assertEqual(["build/testA", "build/testB", "build/testC"], selected)
         self.assertEqual([], excluded)
 
+    def test_cpp_split_by_suite(self):
+        config = {"root": "unittest.txt", "split_by_suite": ["build/testB"]}
+        selected, excluded = selector.filter_tests("cpp_unit_test", config, self.test_file_explorer)
+        self.assertEqual([
+            "build/testA", ["build/testB", "suite1"], ["build/testB", "suite2"],
+            ["build/testB", "suite3"], ["build/testB", "suite4"], ["build/testB", "suite5"]
+        ], selected)
+        self.assertEqual([], excluded)
+
+    def test_cpp_split_by_suite_groups(self):
+        config = {
+            "roots": ["build/test*"], "split_by_suite": ["build/testB"], "num_suite_groups": 2
+        }
+        selected, _ = selector.filter_tests("cpp_unit_test", config, self.test_file_explorer)
+        self.assertEqual([
+            "build/testA", ["build/testB", "suite1", "suite3", "suite5"],
+            ["build/testB", "suite2", "suite4"], "build/testC"
+        ], selected)
+
     def test_cpp_with_any_tags(self):
         buildscripts.resmokelib.config.INCLUDE_WITH_ANY_TAGS = ["tag1"]
         try:
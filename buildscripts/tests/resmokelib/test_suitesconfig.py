@@ -6,6 +6,7 @@ import mock
 
 from buildscripts.resmokelib import suitesconfig
 from buildscripts.resmokelib import parser
+from buildscripts.resmokelib import selector
 parser.set_options()
 
 # pylint: disable=missing-docstring
@@ -50,3 +51,16 @@ class TestSuitesConfig(unittest.TestCase):
             test_kind=("fsm_workload_test", "js_test"))
         self.assertEqual(membership_map, dict(test1=all_suites, test2=all_suites))
         self.assertEqual(mock_suite_class.call_count, 2)
+
+    @mock.patch(RESMOKELIB + ".testing.suite.Suite")
+    @mock.patch(RESMOKELIB + ".suitesconfig.get_named_suites")
+    def test_suites_share_test_file_explorer(self, mock_get_named_suites, mock_suite_class):
+        mock_get_named_suites.return_value = ["core", "replica_sets_jscore_passthrough"]
+        mock_suite_class.return_value.tests = ["test1"]
+
+        suitesconfig.create_test_membership_map(test_kind="js_test")
+        explorers = [
+            call[1]["test_file_explorer"] for call in mock_suite_class.call_args_list
+        ]
+        self.assertIsInstance(explorers[0], selector.CachingTestFileExplorer)
+        self.assertIs(explorers[0], explorers[1])
@@ -1,7 +1,11 @@
 """Unit tests for the resmokelib.testing.fixtures.interface module."""
 import logging
+import threading
+import time
 import unittest
 
+import mock
+
 from buildscripts.resmokelib import errors
 from buildscripts.resmokelib.testing.fixtures import interface
 
@@ -18,6 +22,41 @@ class TestFixture(unittest.TestCase):
         with self.assertRaises(errors.ServerFailure):
             raising_fixture.teardown()
 
+    def test_clear_data_keeps_internal_databases(self):
+        fixture = UnitTestFixture()
+        client = mock.Mock()
+        client.list_database_names.return_value = ["admin", "config", "local", "test", "fsmdb0"]
+        fixture.mongo_client = mock.Mock(return_value=client)
+        fixture.clear_data()
+        self.assertEqual(client.drop_database.call_args_list,
+                         [mock.call("test"), mock.call("fsmdb0")])
+
+
+class TestRunConcurrently(unittest.TestCase):
+    def test_returns_results_in_order(self):
+        funcs = [lambda i=i: i * i for i in range(5)]
+        self.assertEqual(interface.run_concurrently(funcs), [0, 1, 4, 9, 16])
+
+    def test_functions_run_concurrently(self):
+        barrier = threading.Barrier(3, timeout=10)
+        # Each call to wait() only returns once all three functions are running at the same time.
+        results = interface.run_concurrently([barrier.wait] * 3)
+        self.assertEqual(sorted(results), [0, 1, 2])
+
+    def test_raises_first_error_after_all_finish(self):
+        finished = []
+
+        def fail(msg):
+            raise errors.ServerFailure(msg)
+
+        def slow():
+            time.sleep(0.1)
+            finished.append(True)
+
+        with self.assertRaisesRegex(errors.ServerFailure, "first"):
+            interface.run_concurrently([slow, lambda: fail("first"), lambda: fail("second")])
+        self.assertEqual(finished, [True])
+
 
 class TestFixtureTeardownHandler(unittest.TestCase):
     def test_teardown_ok(self):
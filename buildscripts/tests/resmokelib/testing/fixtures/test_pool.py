@@ -0,0 +1,81 @@
+"""Unit tests for the resmokelib.testing.fixtures.pool module."""
+import logging
+import unittest
+
+import mock
+
+from buildscripts.resmokelib import errors
+from buildscripts.resmokelib.testing.fixtures import pool
+
+# pylint: disable=missing-docstring
+
+
+def mock_fixture(running=True):
+    fixture = mock.Mock()
+    fixture.is_running.return_value = running
+    return fixture
+
+
+class TestFixturePool(unittest.TestCase):
+    def setUp(self):
+        self.pool = pool.FixturePool(logging.getLogger("pool_unittests"))
+        self.key = pool.FixturePool.make_key("ReplicaSetFixture", {"num_nodes": 2})
+
+    def test_make_key_is_independent_of_option_order(self):
+        key_a = pool.FixturePool.make_key("MongoDFixture", {"a": 1, "b": {"c": 2, "d": 3}})
+        key_b = pool.FixturePool.make_key("MongoDFixture", {"b": {"d": 3, "c": 2}, "a": 1})
+        self.assertEqual(key_a, key_b)
+        self.assertNotEqual(key_a, pool.FixturePool.make_key("MongoDFixture", {"a": 2}))
+
+    def test_acquire_empty(self):
+        self.assertIsNone(self.pool.acquire(0, self.key))
+
+    def test_acquire_released_fixture(self):
+        fixture = mock_fixture()
+        self.pool.release(0, self.key, fixture)
+        self.assertIs(self.pool.acquire(0, self.key), fixture)
+        # The fixture is no longer in the pool once acquired.
+        self.assertIsNone(self.pool.acquire(0, self.key))
+        fixture.teardown.assert_not_called()
+
+    def test_acquire_other_job(self):
+        fixture = mock_fixture()
+        self.pool.release(0, self.key, fixture)
+        self.assertIsNone(self.pool.acquire(1, self.key))
+        fixture.teardown.assert_not_called()
+
+    def test_acquire_different_config_tears_down(self):
+        fixture = mock_fixture()
+        self.pool.release(0, self.key, fixture)
+        other_key = pool.FixturePool.make_key("ReplicaSetFixture", {"num_nodes": 3})
+        self.assertIsNone(self.pool.acquire(0, other_key))
+        fixture.teardown.assert_called_once_with(finished=True)
+
+    def test_acquire_crashed_fixture_tears_down(self):
+        fixture = mock_fixture(running=False)
+        self.pool.release(0, self.key, fixture)
+        self.assertIsNone(self.pool.acquire(0, self.key))
+        fixture.teardown.assert_called_once_with(finished=True)
+
+    def test_evict_unused_job_numbers(self):
+        fixtures = [mock_fixture(), mock_fixture(), mock_fixture()]
+        for (job_num, fixture) in enumerate(fixtures):
+            self.pool.release(job_num, self.key, fixture)
+
+        self.assertTrue(self.pool.evict(1))
+        fixtures[0].teardown.assert_not_called()
+        fixtures[1].teardown.assert_called_once_with(finished=True)
+        fixtures[2].teardown.assert_called_once_with(finished=True)
+        self.assertIs(self.pool.acquire(0, self.key), fixtures[0])
+        self.assertIsNone(self.pool.acquire(1, self.key))
+
+    def test_teardown_all(self):
+        fixtures = [mock_fixture(), mock_fixture()]
+        fixtures[1].teardown.side_effect = errors.ServerFailure("failed")
+        for (job_num, fixture) in enumerate(fixtures):
+            self.pool.release(job_num, self.key, fixture)
+
+        self.assertFalse(self.pool.teardown_all())
+        for fixture in fixtures:
+            fixture.teardown.assert_called_once_with(finished=True)
+        self.assertTrue(self.pool.teardown_all())
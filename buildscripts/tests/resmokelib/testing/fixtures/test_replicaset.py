@@ -0,0 +1,82 @@
+"""Unit tests for the resmokelib.testing.fixtures.replicaset module."""
+import logging
+import unittest
+
+import mock
+import pymongo.errors
+
+from buildscripts.resmokelib import config
+from buildscripts.resmokelib.testing.fixtures import replicaset
+
+# pylint: disable=missing-docstring,protected-access
+
+
+def mock_node(port):
+    node = mock.Mock(port=port, preserve_dbpath=False)
+    node.mongod_options = {"dbpath": "/data/db/node{}".format(port)}
+    return node
+
+
+class TestReplicaSetSnapshotRestore(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(config, "FIXTURE_SNAPSHOT_DIR", "/data/snapshots")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.object(replicaset._backoff.Backoff, "sleep")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.fixture = replicaset.ReplicaSetFixture(
+            logging.getLogger("replicaset_unittests"), 0, num_nodes=2)
+        self.nodes = [mock_node(20000), mock_node(20001)]
+        patcher = mock.patch.object(self.fixture, "_new_mongod", side_effect=self.nodes)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.snapshot = mock.Mock()
+        patcher = mock.patch.object(self.fixture, "_get_snapshot", return_value=self.snapshot)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # The first node starts up with the replica set config restored from the snapshot.
+        self.client = self.nodes[0].mongo_client.return_value
+        self.client.local.system.replset.count.return_value = 1
+        self.commands = []
+
+    def _run_setup(self, step_up_failures=0):
+        state = {"is_primary": False, "step_up_failures": step_up_failures}
+
+        def command(cmd):
+            self.commands.append(cmd)
+            if cmd == "isMaster":
+                return {"ismaster": state["is_primary"]}
+            if cmd == "replSetStepUp":
+                if state["step_up_failures"] > 0:
+                    state["step_up_failures"] -= 1
+                    raise pymongo.errors.OperationFailure("Not enough votes yet")
+                state["is_primary"] = True
+            return {"ok": 1}
+
+        self.client.admin.command.side_effect = command
+        self.fixture.setup()
+
+    def test_restored_primary_is_stepped_up(self):
+        self.snapshot.exists.return_value = True
+        self._run_setup()
+
+        self.assertEqual(2, self.snapshot.restore_dbpath.call_count)
+        self.assertIn("replSetStepUp", self.commands)
+        self.assertNotIn("replSetInitiate", str(self.commands))
+
+    def test_step_up_is_retried(self):
+        self.snapshot.exists.return_value = True
+        self._run_setup(step_up_failures=2)
+        self.assertEqual(3, self.commands.count("replSetStepUp"))
+
+    def test_primary_is_not_stepped_up_without_restore(self):
+        self.snapshot.exists.return_value = False
+        self._run_setup()
+
+        self.snapshot.restore_dbpath.assert_not_called()
+        self.assertNotIn("replSetStepUp", self.commands)
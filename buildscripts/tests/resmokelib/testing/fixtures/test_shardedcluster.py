@@ -0,0 +1,33 @@
+"""Unit tests for the resmokelib.testing.fixtures.shardedcluster module."""
+import logging
+import unittest
+
+import mock
+
+from buildscripts.resmokelib.testing.fixtures import replicaset
+from buildscripts.resmokelib.testing.fixtures import shardedcluster
+from buildscripts.resmokelib.testing.fixtures import standalone
+
+# pylint: disable=missing-docstring,protected-access
+
+
+class TestAddShard(unittest.TestCase):
+    def setUp(self):
+        self.fixture = shardedcluster.ShardedClusterFixture(
+            logging.getLogger("shardedcluster_unittests"), 0, mongod_options={})
+        self.client = mock.Mock()
+
+    def test_standalone_shard_is_named_after_its_index(self):
+        shard = mock.Mock(spec=standalone.MongoDFixture)
+        shard.get_internal_connection_string.return_value = "localhost:20001"
+        self.fixture._add_shard(self.client, 3, shard)
+        self.client.admin.command.assert_called_once_with({
+            "addShard": "localhost:20001", "name": "shard0003"
+        })
+
+    def test_replica_set_shard_is_named_after_its_replica_set(self):
+        shard = mock.Mock(spec=replicaset.ReplicaSetFixture)
+        shard.get_internal_connection_string.return_value = "shard-rs1/localhost:20001"
+        self.fixture._add_shard(self.client, 1, shard)
+        self.client.admin.command.assert_called_once_with(
+            {"addShard": "shard-rs1/localhost:20001"})
@@ -0,0 +1,72 @@
+"""Unit tests for the resmokelib.testing.fixtures.snapshot module."""
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from buildscripts.resmokelib.testing.fixtures import snapshot
+
+# pylint: disable=missing-docstring
+
+
+def write_file(pathname, contents):
+    os.makedirs(os.path.dirname(pathname), exist_ok=True)
+    with open(pathname, "w") as fp:
+        fp.write(contents)
+
+
+def read_file(pathname):
+    with open(pathname, "r") as fp:
+        return fp.read()
+
+
+class TestDbpathSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.logger = logging.getLogger("snapshot_unittests")
+        self.snapshot_dir = os.path.join(self.tmpdir, "snapshots", "job0", "rs")
+        self.dbpath = os.path.join(self.tmpdir, "db", "node0")
+        write_file(os.path.join(self.dbpath, "collection-0.wt"), "data")
+        write_file(os.path.join(self.dbpath, "journal", "WiredTigerLog.1"), "journal")
+        write_file(os.path.join(self.dbpath, "mongod.lock"), "1234")
+        write_file(os.path.join(self.dbpath, "diagnostic.data", "metrics.1"), "ftdc")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_save_and_restore(self):
+        saved = snapshot.DbpathSnapshot(self.logger, self.snapshot_dir, "key")
+        self.assertFalse(saved.exists())
+        saved.save_dbpath(0, self.dbpath)
+        # The snapshot is incomplete until it is committed.
+        self.assertFalse(saved.exists())
+        saved.commit()
+
+        # Tests write more data before the fixture is restarted.
+        write_file(os.path.join(self.dbpath, "collection-2.wt"), "test data")
+
+        restored = snapshot.DbpathSnapshot(self.logger, self.snapshot_dir, "key")
+        self.assertTrue(restored.exists())
+        restored.restore_dbpath(0, self.dbpath)
+        self.assertEqual(read_file(os.path.join(self.dbpath, "collection-0.wt")), "data")
+        self.assertEqual(
+            read_file(os.path.join(self.dbpath, "journal", "WiredTigerLog.1")), "journal")
+        self.assertFalse(os.path.exists(os.path.join(self.dbpath, "collection-2.wt")))
+        self.assertFalse(os.path.exists(os.path.join(self.dbpath, "mongod.lock")))
+        self.assertFalse(os.path.exists(os.path.join(self.dbpath, "diagnostic.data")))
+
+    def test_snapshot_with_other_key_does_not_exist(self):
+        saved = snapshot.DbpathSnapshot(self.logger, self.snapshot_dir, "key")
+        saved.save_dbpath(0, self.dbpath)
+        saved.commit()
+        self.assertFalse(snapshot.DbpathSnapshot(self.logger, self.snapshot_dir, "other").exists())
+
+    def test_clear(self):
+        saved = snapshot.DbpathSnapshot(self.logger, self.snapshot_dir, "key")
+        saved.clear()
+        saved.save_dbpath(0, self.dbpath)
+        saved.commit()
+        saved.clear()
+        self.assertFalse(saved.exists())
+        self.assertFalse(os.path.exists(self.snapshot_dir))
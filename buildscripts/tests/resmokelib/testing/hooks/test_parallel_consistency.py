@@ -0,0 +1,285 @@
+"""Unit tests for buildscripts/resmokelib/testing/hooks/parallel_consistency.py."""
+
+import unittest
+
+import mock
+
+from buildscripts.resmokelib.logging import loggers
+from buildscripts.resmokelib.testing.hooks import parallel_consistency as _parallel_consistency
+
+# pylint: disable=missing-docstring,protected-access
+
+
+def _snapshot(collections, capped=(), md5="dbmd5", uuids=None):
+    uuids = uuids or {}
+    dbhash = {"collections": dict(collections), "capped": list(capped), "md5": md5}
+    coll_infos = {
+        name: {"name": name, "type": "collection", "options": {},
+               "info": {"uuid": uuids.get(name, name + "-uuid")}}
+        for name in collections
+    }
+    indexes = {name: [{"v": 2, "key": {"_id": 1}, "name": "_id_"}] for name in collections}
+    return _parallel_consistency.DatabaseSnapshot(dbhash, coll_infos, indexes)
+
+
+class TestCompareDBSnapshots(unittest.TestCase):
+    def _compare(self, primary_snapshot, secondary_snapshot):
+        return _parallel_consistency.compare_db_snapshots("test", primary_snapshot,
+                                                          secondary_snapshot)
+
+    def test_matching_snapshots(self):
+        self.assertEqual([], self._compare(_snapshot({"a": "1"}), _snapshot({"a": "1"})))
+
+    def test_different_collection_hashes(self):
+        messages = self._compare(_snapshot({"a": "1", "b": "2"}), _snapshot({"a": "1", "b": "3"}))
+        self.assertEqual(1, len(messages))
+        self.assertIn("test.b has a different hash", messages[0])
+
+    def test_capped_collections_hashes_are_ignored(self):
+        self.assertEqual([],
+                         self._compare(
+                             _snapshot({"a": "1"}, capped=["a"]),
+                             _snapshot({"a": "2"}, capped=["a"], md5="other")))
+
+    def test_different_database_hashes(self):
+        messages = self._compare(_snapshot({"a": "1"}), _snapshot({"a": "1"}, md5="other"))
+        self.assertEqual(1, len(messages))
+        self.assertIn("test database has a different hash", messages[0])
+
+    def test_missing_collections(self):
+        messages = self._compare(_snapshot({"a": "1", "b": "2"}), _snapshot({"a": "1", "c": "3"}))
+        self.assertEqual([
+            "the collection test.b doesn't exist on the secondary",
+            "the collection test.c doesn't exist on the primary",
+        ], messages)
+
+    def test_missing_database(self):
+        self.assertEqual(["the collection test.a doesn't exist on the secondary"],
+                         self._compare(_snapshot({"a": "1"}), None))
+        self.assertEqual([], self._compare(_snapshot({}, md5="empty"), None))
+
+    def test_different_uuids(self):
+        messages = self._compare(_snapshot({"a": "1"}), _snapshot({"a": "1"}, uuids={"a": "x"}))
+        self.assertEqual(1, len(messages))
+        self.assertIn("test.a has different attributes", messages[0])
+
+    def test_removed_fields_are_ignored(self):
+        primary_snapshot = _snapshot({"a": "1"})
+        secondary_snapshot = _snapshot({"a": "1"})
+        primary_snapshot.coll_infos["a"]["options"]["flags"] = 1
+        primary_snapshot.coll_infos["a"]["idIndex"] = {"name": "_id_", "ns": "test.a"}
+        secondary_snapshot.coll_infos["a"]["idIndex"] = {"name": "_id_"}
+        self.assertEqual([], self._compare(primary_snapshot, secondary_snapshot))
+
+    def test_different_indexes(self):
+        secondary_snapshot = _snapshot({"a": "1"})
+        secondary_snapshot.indexes["a"].append({"v": 2, "key": {"x": 1}, "name": "x_1"})
+        messages = self._compare(_snapshot({"a": "1"}), secondary_snapshot)
+        self.assertEqual(1, len(messages))
+        self.assertIn("test.a has different indexes", messages[0])
+
+
+class TestCheckReplDBHashInParallel(unittest.TestCase):
+    def setUp(self):
+        self.primary = mock.Mock(port=20000)
+        self.secondary = mock.Mock(port=20001)
+        self.rs_fixture = mock.Mock(replset_name="rs", nodes=[self.primary, self.secondary],
+                                    auth_options=None)
+        self.rs_fixture.get_primary.return_value = self.primary
+
+        self.hook = _parallel_consistency.CheckReplDBHashInParallel(
+            mock.Mock(spec=loggers.HookLogger), mock.Mock(), excluded_dbs=["excluded"])
+        self.clients = {node.port: mock.Mock() for node in self.rs_fixture.nodes}
+        for client in self.clients.values():
+            client.list_database_names.return_value = ["local", "excluded", "test"]
+        self.hook._clients = mock.Mock()
+        self.hook._clients.get.side_effect = lambda node, auth_options: self.clients[node.port]
+
+        patcher = mock.patch.object(_parallel_consistency, "get_replica_sets",
+                                    return_value=[self.rs_fixture])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _check(self, secondary_snapshot):
+        snapshots = {
+            id(self.clients[self.primary.port]): _snapshot({"a": "1"}),
+            id(self.clients[self.secondary.port]): secondary_snapshot,
+        }
+        with mock.patch.object(_parallel_consistency, "take_db_snapshot") as mock_snapshot:
+            mock_snapshot.side_effect = lambda client, db_name: snapshots[id(client)]
+            messages = self.hook.check(mock.Mock())
+
+        self.rs_fixture.await_last_op_committed.assert_called_once_with()
+        # The local database and the excluded databases aren't hashed.
+        self.assertEqual(["test", "test"],
+                         sorted(call[0][1] for call in mock_snapshot.call_args_list))
+        return messages
+
+    def test_check_passes(self):
+        self.assertEqual([], self._check(_snapshot({"a": "1"})))
+
+    def test_check_fails(self):
+        messages = self._check(_snapshot({"a": "2"}))
+        self.assertEqual(1, len(messages))
+        self.assertIn("secondary on port 20001", messages[0])
+
+    def test_one_node_replica_sets_are_skipped(self):
+        self.rs_fixture.nodes = [self.primary]
+        with mock.patch.object(_parallel_consistency, "take_db_snapshot") as mock_snapshot:
+            self.assertEqual([], self.hook.check(mock.Mock()))
+        mock_snapshot.assert_not_called()
+        self.rs_fixture.await_last_op_committed.assert_not_called()
+
+
+class TestIncrementalCheckReplDBHashInParallel(unittest.TestCase):
+    def setUp(self):
+        self.primary = mock.Mock(port=20000)
+        self.secondary = mock.Mock(port=20001)
+        self.rs_fixture = mock.Mock(replset_name="rs", nodes=[self.primary, self.secondary],
+                                    auth_options=None)
+        self.rs_fixture.get_primary.return_value = self.primary
+        self.rs_fixture.pids.return_value = [1, 2]
+
+        self.hook = _parallel_consistency.CheckReplDBHashInParallel(
+            mock.Mock(spec=loggers.HookLogger), mock.Mock(), incremental=True)
+        self.client = mock.Mock()
+        self.client.list_database_names.return_value = ["local", "a", "b"]
+        self.hook._clients = mock.Mock()
+        self.hook._clients.get.return_value = self.client
+
+        for (name, kwargs) in [("get_replica_sets", {"return_value": [self.rs_fixture]}),
+                               ("get_last_oplog_ts", {"return_value": 10}),
+                               ("find_changed_dbs", {"return_value": set()})]:
+            patcher = mock.patch.object(_parallel_consistency, name, **kwargs)
+            setattr(self, "mock_" + name, patcher.start())
+            self.addCleanup(patcher.stop)
+
+    def _check(self):
+        with mock.patch.object(_parallel_consistency, "take_db_snapshot",
+                               return_value=_snapshot({"c": "1"})) as mock_snapshot:
+            self.assertEqual([], self.hook.check(mock.Mock()))
+        # Each database is hashed on both nodes.
+        db_names = sorted(call[0][1] for call in mock_snapshot.call_args_list)
+        self.assertEqual(db_names[::2], db_names[1::2])
+        return db_names[::2]
+
+    def test_only_changed_databases_are_hashed(self):
+        self.assertEqual(["a", "b"], self._check())
+        self.mock_find_changed_dbs.assert_not_called()
+
+        self.mock_get_last_oplog_ts.return_value = 20
+        self.mock_find_changed_dbs.return_value = {"b", "dropped"}
+        self.assertEqual(["b"], self._check())
+        self.mock_find_changed_dbs.assert_called_once_with(self.client, 10)
+
+        self.mock_find_changed_dbs.return_value = set()
+        self.assertEqual([], self._check())
+        self.mock_find_changed_dbs.assert_called_with(self.client, 20)
+
+    def test_new_databases_are_hashed(self):
+        self._check()
+        self.client.list_database_names.return_value = ["local", "a", "b", "c"]
+        self.assertEqual(["c"], self._check())
+
+    def test_all_databases_are_hashed_after_a_restart(self):
+        self._check()
+        self.rs_fixture.pids.return_value = [1, 3]
+        self.assertEqual(["a", "b"], self._check())
+
+    def test_all_databases_are_hashed_after_the_oplog_was_truncated(self):
+        self._check()
+        self.mock_find_changed_dbs.return_value = None
+        self.assertEqual(["a", "b"], self._check())
+
+    def test_all_databases_are_hashed_after_a_mismatch(self):
+        self._check()
+        self.mock_find_changed_dbs.return_value = {"a"}
+        with mock.patch.object(_parallel_consistency, "take_db_snapshot"), \
+             mock.patch.object(_parallel_consistency, "compare_db_snapshots",
+                               return_value=["mismatch"]):
+            self.assertEqual(1, len(self.hook.check(mock.Mock())))
+        self.assertEqual(["a", "b"], self._check())
+
+
+class TestOplogEntries(unittest.TestCase):
+    def test_get_oplog_entry_dbs(self):
+        get_dbs = _parallel_consistency.get_oplog_entry_dbs
+        self.assertEqual({"test"}, get_dbs({"op": "i", "ns": "test.coll", "o": {"_id": 1}}))
+        self.assertEqual(set(), get_dbs({"op": "n", "ns": "", "o": {"msg": "periodic noop"}}))
+        self.assertEqual({"a", "b"},
+                         get_dbs({
+                             "op": "c", "ns": "a.$cmd",
+                             "o": {"renameCollection": "a.x", "to": "b.y", "dropTarget": False}
+                         }))
+        self.assertEqual({"admin", "a", "b"},
+                         get_dbs({
+                             "op": "c", "ns": "admin.$cmd",
+                             "o": {"applyOps": [{"op": "i", "ns": "a.x"}, {"op": "d", "ns": "b.y"}]}
+                         }))
+
+    def test_find_changed_dbs(self):
+        client = mock.Mock()
+        oplog = client.local.oplog.rs
+        oplog.find_one.return_value = {"ts": 5}
+        oplog.find.return_value = [{"ns": "a.x"}, {"ns": "b.$cmd"}]
+        self.assertEqual({"a", "b"}, _parallel_consistency.find_changed_dbs(client, 10))
+        self.assertEqual({"ts": {"$gt": 10}}, oplog.find.call_args[0][0])
+
+        oplog.find_one.return_value = {"ts": 15}
+        self.assertIsNone(_parallel_consistency.find_changed_dbs(client, 10))
+
+
+class TestValidateCollectionsInParallel(unittest.TestCase):
+    def setUp(self):
+        self.node = mock.Mock(port=20000)
+        self.hook = _parallel_consistency.ValidateCollectionsInParallel(
+            mock.Mock(spec=loggers.HookLogger), mock.Mock(), skip_namespaces=["test.skipped"])
+        self.client = mock.Mock()
+        self.client.list_database_names.return_value = ["test"]
+        self.hook._clients = mock.Mock()
+        self.hook._clients.get.return_value = self.client
+        self.validate_res = {"valid": True}
+        self.client.get_database.return_value.command.side_effect = \
+            lambda *args, **kwargs: self.validate_res
+
+        patcher = mock.patch.object(_parallel_consistency, "get_data_nodes",
+                                    return_value=[(self.node, None)])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _check(self, db_snapshot):
+        self.client.get_database.return_value.command.reset_mock()
+        with mock.patch.object(_parallel_consistency, "take_db_snapshot",
+                               return_value=db_snapshot):
+            messages = self.hook.check(mock.Mock())
+        validated = [
+            call[0][1] for call in self.client.get_database.return_value.command.call_args_list
+        ]
+        return (messages, sorted(validated))
+
+    def test_unchanged_collections_are_skipped(self):
+        self.assertEqual(([], ["a", "b"]), self._check(_snapshot({"a": "1", "b": "2"})))
+        self.assertEqual(([], []), self._check(_snapshot({"a": "1", "b": "2"})))
+        self.assertEqual(([], ["b"]), self._check(_snapshot({"a": "1", "b": "3"})))
+        self.assertEqual(([], ["a"]), self._check(_snapshot({"a": "1", "b": "3"},
+                                                            uuids={"a": "recreated"})))
+
+    def test_collections_without_a_hash_are_always_validated(self):
+        db_snapshot = _snapshot({"a": "1"})
+        db_snapshot.coll_infos["system.profile"] = {"name": "system.profile", "type": "collection"}
+        db_snapshot.indexes["system.profile"] = []
+        self.assertEqual(([], ["a", "system.profile"]), self._check(db_snapshot))
+        self.assertEqual(([], ["system.profile"]), self._check(db_snapshot))
+
+    def test_skipped_namespaces(self):
+        self.assertEqual(([], ["a"]), self._check(_snapshot({"a": "1", "skipped": "2"})))
+
+    def test_invalid_collections_are_validated_again(self):
+        self.validate_res = {"valid": False, "errors": ["corrupt"]}
+        (messages, validated) = self._check(_snapshot({"a": "1"}))
+        self.assertEqual(["a"], validated)
+        self.assertEqual(1, len(messages))
+        self.assertIn("test.a isn't valid", messages[0])
+
+        self.validate_res = {"valid": True}
+        self.assertEqual(([], ["a"]), self._check(_snapshot({"a": "1"})))
@@ -0,0 +1,109 @@
+"""Unit tests for buildscripts/resmokelib/testing/hooks/resource_profile.py."""
+
+import json
+import os
+import tempfile
+import unittest
+
+import mock
+
+from buildscripts.resmokelib.logging import loggers
+from buildscripts.resmokelib.testing.hooks import resource_profile as _resource_profile
+
+# pylint: disable=missing-docstring,protected-access
+
+
+def _sample(cpu_secs, rss_bytes, read_bytes=0, write_bytes=0, num_fds=10):
+    return _resource_profile.ResourceSample(cpu_secs, rss_bytes, read_bytes, write_bytes, num_fds)
+
+
+class TestResourceUsage(unittest.TestCase):
+    def test_deltas_and_peaks(self):
+        usage = _resource_profile.ResourceUsage()
+        usage.add({1: _sample(1.0, 100, read_bytes=10), 2: _sample(2.0, 200)})
+        usage.add({1: _sample(1.5, 500, read_bytes=30), 2: _sample(4.0, 100, write_bytes=8)})
+        # A process started by the test only contributes the difference between its own samples.
+        usage.add({1: _sample(2.0, 100, read_bytes=30), 3: _sample(7.0, 50, num_fds=5)})
+
+        self.assertEqual({
+            "cpu_secs": 3.0,
+            "peak_rss_bytes": 600,
+            "read_bytes": 20,
+            "write_bytes": 8,
+            "peak_num_fds": 20,
+            "num_samples": 3,
+        }, usage.as_dict())
+
+    def test_unknown_io(self):
+        usage = _resource_profile.ResourceUsage()
+        usage.add({1: _sample(1.0, 100, read_bytes=None, write_bytes=None)})
+        self.assertIsNone(usage.as_dict()["read_bytes"])
+        self.assertIsNone(usage.as_dict()["write_bytes"])
+
+
+@unittest.skipIf(_resource_profile.psutil is None, "requires the psutil module")
+class TestProfileFixtureResources(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.timeseries_file = os.path.join(self.tmpdir.name, "profile", "resources.jsonl")
+
+        self.fixture = mock.Mock(job_num=0)
+        # Profile the process running the unit tests in place of a mongod.
+        self.fixture.pids.return_value = [os.getpid()]
+        self.hook = _resource_profile.ProfileFixtureResources(
+            mock.Mock(spec=loggers.HookLogger), self.fixture, interval_secs=0.01,
+            timeseries_file=self.timeseries_file)
+
+        self.test = mock.Mock(test_name="jstests/core/a.js")
+        self.test_report = mock.Mock()
+
+    def test_resource_usage_is_reported(self):
+        self.hook.before_test(self.test, self.test_report)
+        self.hook.after_test(self.test, self.test_report)
+
+        self.test_report.set_resource_usage.assert_called_once()
+        (test, usage) = self.test_report.set_resource_usage.call_args[0]
+        self.assertIs(self.test, test)
+        self.assertGreater(usage["peak_rss_bytes"], 0)
+        self.assertGreater(usage["peak_num_fds"], 0)
+        self.assertGreaterEqual(usage["num_samples"], 2)
+
+        with open(self.timeseries_file) as fp:
+            records = [json.loads(line) for line in fp]
+        self.assertEqual(usage["num_samples"], len(records))
+        self.assertEqual("jstests/core/a.js", records[0]["test_file"])
+        self.assertEqual(os.getpid(), records[0]["pid"])
+
+    def test_processes_which_exited_are_skipped(self):
+        with mock.patch.object(_resource_profile, "sample_process", return_value=None):
+            self.hook.before_test(self.test, self.test_report)
+            self.hook.after_test(self.test, self.test_report)
+
+        usage = self.test_report.set_resource_usage.call_args[0][1]
+        self.assertEqual(0, usage["peak_rss_bytes"])
+        self.assertEqual(0, usage["cpu_secs"])
+
+    def test_sampling_is_stopped_when_after_test_is_skipped(self):
+        self.hook.before_test(self.test, self.test_report)
+        thread = self.hook._thread
+
+        other_test = mock.Mock(test_name="jstests/core/b.js")
+        self.hook.before_test(other_test, self.test_report)
+        self.assertFalse(thread.is_alive())
+        self.assertIs(self.test, self.test_report.set_resource_usage.call_args[0][0])
+
+        thread = self.hook._thread
+        self.hook.after_suite(self.test_report)
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(self.hook._thread)
+        self.assertIs(other_test, self.test_report.set_resource_usage.call_args[0][0])
+        self.assertEqual(2, self.test_report.set_resource_usage.call_count)
+
+    def test_usage_is_reported_when_fixture_crashed(self):
+        self.hook.before_test(self.test, self.test_report)
+        self.fixture.pids.side_effect = OSError("The fixture crashed")
+        self.hook.after_suite(self.test_report)
+
+        usage = self.test_report.set_resource_usage.call_args[0][1]
+        self.assertGreaterEqual(usage["num_samples"], 1)
@@ -144,10 +144,151 @@ class TestMakeTestQueue(unittest.TestCase):
             element = test_queue.get()
             self.assertIn(element, self.suite.tests)
 
+    @mock.patch(ns("_config"))
+    @mock.patch(ns("_runtimes.load_runtimes"))
+    def test_longest_tests_are_queued_first(self, load_runtimes_mock, config_mock):
+        config_mock.RERUN_FAILED_FROM = None
+        config_mock.TEST_RUNTIMES_FILE = "runtimes.json"
+        load_runtimes_mock.return_value = {
+            "jstests/core/and0.js": 1,
+            "jstests/core/and1.js": 100,
+            "jstests/core/and2.js": 10,
+        }
+        test_queue = self.ut_executor._make_test_queue()
+        self.assertEqual([test_queue.get() for _ in range(test_queue.qsize())], [
+            "jstests/core/and1.js",
+            "jstests/core/and2.js",
+            "jstests/core/and0.js",
+        ])
+
+    @mock.patch(ns("_config"))
+    @mock.patch(ns("_runtimes.get_runtime_history"))
+    def test_runtime_history_is_used_without_runtimes_file(self, history_mock, config_mock):
+        config_mock.RERUN_FAILED_FROM = None
+        config_mock.TEST_RUNTIMES_FILE = None
+        config_mock.RUNTIME_HISTORY_DIR = "history_dir"
+        self.suite.get_name.return_value = "core"
+        history_mock.return_value.get_runtimes.return_value = {
+            "jstests/core/and0.js": 1,
+            "jstests/core/and2.js": 10,
+        }
+        test_queue = self.ut_executor._make_test_queue()
+        history_mock.return_value.get_runtimes.assert_called_once_with("core", "MongoDFixture")
+        self.assertEqual(test_queue.get(), "jstests/core/and2.js")
+
+    @mock.patch(ns("_config"))
+    @mock.patch(ns("_runtimes.load_runtimes"))
+    def test_suite_order_is_kept_when_rerunning_failed_tests(self, load_runtimes_mock,
+                                                             config_mock):
+        config_mock.RERUN_FAILED_FROM = "report.json"
+        config_mock.TEST_RUNTIMES_FILE = "runtimes.json"
+        test_queue = self.ut_executor._make_test_queue()
+        self.assertEqual([test_queue.get() for _ in range(test_queue.qsize())], self.suite.tests)
+        load_runtimes_mock.assert_not_called()
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.suite = mock_suite(3)
+        self.suite.get_name.return_value = "core"
+        self.ut_executor = UnitTestExecutor(self.suite, None)
+        self.ut_executor._create_queue_elem_for_test_name = lambda x: x
+
+        self.result_cache = mock.Mock()
+        self.result_cache.make_test_key.side_effect = lambda suite_key, test: "key:" + test
+        self.result_cache.has_passed.side_effect = lambda key: key == "key:jstests/core/and1.js"
+        self.ut_executor._result_cache = self.result_cache
+
+    def test_cached_tests_are_reported_instead_of_queued(self):
+        (self.ut_executor._tests_to_run,
+         self.ut_executor._cached_tests) = self.ut_executor._partition_cached_tests()
+        self.assertEqual(["jstests/core/and1.js"], self.ut_executor._cached_tests)
+
+        test_queue = self.ut_executor._make_test_queue()
+        self.assertEqual([test_queue.get() for _ in range(test_queue.qsize())],
+                         ["jstests/core/and0.js", "jstests/core/and2.js"])
+        self.ut_executor._cached_report.add_cached.assert_called_once_with("jstests/core/and1.js")
+
+    def test_results_are_recorded_with_their_keys(self):
+        self.ut_executor._partition_cached_tests()
+        report = mock.Mock()
+        self.ut_executor._record_results(report)
+        self.result_cache.record.assert_called_once_with({
+            "jstests/core/and0.js": "key:jstests/core/and0.js",
+            "jstests/core/and1.js": "key:jstests/core/and1.js",
+            "jstests/core/and2.js": "key:jstests/core/and2.js",
+        }, report)
+
+
+class TestResourceWeight(unittest.TestCase):
+    @mock.patch(ns("_resources.get_test_weight"))
+    def test_weight_is_computed_once_per_test(self, get_test_weight_mock):
+        ut_executor = UnitTestExecutor(mock_suite(1), None)
+        get_test_weight_mock.return_value = 4
+        for _ in range(2):
+            self.assertEqual(ut_executor._get_test_weight("jstests/core/and0.js"), 4)
+        get_test_weight_mock.assert_called_once_with(
+            "jstests/core/and0.js", test_file_explorer=ut_executor._test_file_explorer)
+
+
+class TestFixturePool(unittest.TestCase):
+    def setUp(self):
+        self.suite = mock_suite(1)
+        self.ut_executor = UnitTestExecutor(self.suite, None)
+        self.ut_executor._fixture_pool = mock.Mock()
+
+    def test_no_pool_key_without_pool(self):
+        self.ut_executor._fixture_pool = None
+        self.assertIsNone(self.ut_executor._get_fixture_pool_key())
+
+    def test_no_pool_key_for_external_fixture(self):
+        self.ut_executor.fixture_config = {"class": executor.fixtures.EXTERNAL_FIXTURE_CLASS}
+        self.assertIsNone(self.ut_executor._get_fixture_pool_key())
+
+    def test_running_fixtures_are_released_to_pool(self):
+        running_job = mock.Mock()
+        running_job.manager.job_num = 0
+        running_job.fixture.is_running.return_value = True
+        crashed_job = mock.Mock()
+        crashed_job.manager.job_num = 1
+        crashed_job.fixture.is_running.return_value = False
+        self.ut_executor._jobs = [running_job, crashed_job]
+
+        self.assertTrue(self.ut_executor._teardown_fixtures())
+        pool_key = self.ut_executor._fixture_pool.make_key.return_value
+        self.ut_executor._fixture_pool.release.assert_called_once_with(
+            0, pool_key, running_job.fixture)
+        running_job.manager.teardown_fixture.assert_not_called()
+        crashed_job.manager.teardown_fixture.assert_called_once_with(self.ut_executor.logger)
+
+    def test_unused_job_numbers_are_evicted(self):
+        self.suite.options.num_jobs = 2
+        self.ut_executor._make_job = mock.Mock()
+        self.ut_executor._create_jobs(1)
+        self.ut_executor._fixture_pool.evict.assert_called_once_with(1)
+
+    def test_reused_fixture_logs_to_new_job(self):
+        fixture = self.ut_executor._fixture_pool.acquire.return_value
+        self.ut_executor._make_hooks = mock.Mock(return_value=[])
+        self.ut_executor.archival = None
+        job = self.ut_executor._make_job(0)
+        self.assertIs(job.fixture, fixture)
+        job_logger = self.ut_executor.logger.new_job_logger.return_value
+        fixture.logger.reset_build_id.assert_called_once_with(job_logger.build_id)
+
 
 class UnitTestExecutor(executor.TestSuiteExecutor):
     def __init__(self, suite, config):  # pylint: disable=super-init-not-called
         self._suite = suite
         self.test_queue_logger = logging.getLogger("executor_unittest")
         self.test_config = config
+        self.fixture_config = {"class": "MongoDFixture"}
+        self._fixture_pool = None
+        self._resource_budget = None
+        self._test_file_explorer = mock.Mock()
+        self._test_weights = {}
         self.logger = mock.MagicMock()
+        self._result_cache = None
+        self._result_cache_keys = {}
+        (self._tests_to_run, self._cached_tests) = self._partition_cached_tests()
+        self._cached_report = mock.Mock()
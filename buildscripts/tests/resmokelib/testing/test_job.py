@@ -175,6 +175,30 @@ class TestJob(unittest.TestCase):
             self.assertLess(job_object.tests[test], expected_time_repeat_tests)
 
 
+    def test__run_with_resource_budget(self):
+        queue = _queue.Queue()
+        suite_options = self.get_suite_options(num_repeat_tests=1)
+        job_object = UnitJob(suite_options)
+        job_object.resource_budget = mock.Mock()
+        job_object.resource_budget.acquire.side_effect = lambda weight, _: weight
+        self.queue_tests(self.TESTS, queue, queue_element.QueueElem, suite_options)
+        job_object._run(queue, self.mock_interrupt_flag())
+        self.assertEqual(job_object.total_test_num, len(self.TESTS))
+        self.assertEqual(job_object.resource_budget.release.call_args_list,
+                         [mock.call(1)] * len(self.TESTS))
+
+    def test__run_interrupted_waiting_for_resources(self):
+        queue = _queue.Queue()
+        suite_options = self.get_suite_options(num_repeat_tests=1)
+        job_object = UnitJob(suite_options)
+        job_object.resource_budget = mock.Mock()
+        job_object.resource_budget.acquire.return_value = 0
+        self.queue_tests(self.TESTS, queue, queue_element.QueueElem, suite_options)
+        job_object._run(queue, self.mock_interrupt_flag())
+        self.assertEqual(job_object.total_test_num, 0)
+        job_object.resource_budget.release.assert_not_called()
+
+
 class MockTime(object):
     """Class to mock time.time."""
 
@@ -199,6 +223,7 @@ class UnitJob(job.Job):  # pylint: disable=too-many-instance-attributes
         self.report = None
         self.archival = None
         self.suite_options = suite_options
+        self.resource_budget = None
         self.test_queue_logger = logging.getLogger("job_unittest")
         self.total_test_num = 0
         self.tests = {}
@@ -0,0 +1,142 @@
+"""Unit tests for the resmokelib.testing.resources module."""
+import os
+import tempfile
+import threading
+import unittest
+
+import mock
+
+from buildscripts.resmokelib.testing import resources
+
+# pylint: disable=missing-docstring
+
+
+class TestGetTestWeight(unittest.TestCase):
+    def setUp(self):
+        self.test_file_explorer = mock.Mock()
+        fd, self.test_file = tempfile.mkstemp(suffix=".js")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.test_file)
+
+    def test_untagged_test(self):
+        self.test_file_explorer.jstest_tags.return_value = []
+        self.assertEqual(
+            resources.get_test_weight(self.test_file, test_file_explorer=self.test_file_explorer),
+            resources.DEFAULT_WEIGHT)
+
+    def test_largest_tag_weight(self):
+        self.test_file_explorer.jstest_tags.return_value = ["requires_sharding", "other"]
+        self.assertEqual(
+            resources.get_test_weight(self.test_file, {"requires_sharding": 2, "other": 3},
+                                      test_file_explorer=self.test_file_explorer), 3)
+
+    def test_non_js_test(self):
+        self.assertEqual(
+            resources.get_test_weight("build/unittests/foo_test",
+                                      test_file_explorer=self.test_file_explorer),
+            resources.DEFAULT_WEIGHT)
+        self.test_file_explorer.jstest_tags.assert_not_called()
+
+
+class TestMachineCapacity(unittest.TestCase):
+    @mock.patch("buildscripts.resmokelib.testing.resources.psutil")
+    @mock.patch("buildscripts.resmokelib.testing.resources.os.cpu_count")
+    def test_limited_by_memory(self, cpu_count_mock, psutil_mock):
+        cpu_count_mock.return_value = 16
+        psutil_mock.virtual_memory.return_value.available = 4 * resources.MEMORY_PER_UNIT
+        self.assertEqual(resources.machine_capacity(), 4)
+
+    @mock.patch("buildscripts.resmokelib.testing.resources.psutil", None)
+    @mock.patch("buildscripts.resmokelib.testing.resources.os.cpu_count")
+    def test_without_psutil(self, cpu_count_mock):
+        cpu_count_mock.return_value = 8
+        self.assertEqual(resources.machine_capacity(), 8)
+
+
+class TestResourceBudget(unittest.TestCase):
+    def test_acquire_and_release(self):
+        budget = resources.ResourceBudget(4)
+        interrupt_flag = threading.Event()
+        self.assertEqual(budget.acquire(3, interrupt_flag), 3)
+
+        acquired = []
+        thread = threading.Thread(target=lambda: acquired.append(budget.acquire(2, interrupt_flag)))
+        thread.start()
+        thread.join(0.1)
+        # The second test must wait for the first one to finish.
+        self.assertEqual(acquired, [])
+
+        budget.release(3)
+        thread.join(10)
+        self.assertEqual(acquired, [2])
+
+    def test_weight_is_limited_to_capacity(self):
+        budget = resources.ResourceBudget(2)
+        self.assertEqual(budget.acquire(5, threading.Event()), 2)
+
+    def test_acquire_interrupted(self):
+        budget = resources.ResourceBudget(1)
+        interrupt_flag = threading.Event()
+        budget.acquire(1, interrupt_flag)
+        interrupt_flag.set()
+        self.assertEqual(budget.acquire(1, interrupt_flag), 0)
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            resources.ResourceBudget(0)
+
+    def test_lower_capacity_while_tests_run(self):
+        budget = resources.ResourceBudget(4)
+        interrupt_flag = threading.Event()
+        budget.acquire(1, interrupt_flag)
+        budget.acquire(1, interrupt_flag)
+        budget.set_capacity(2)
+
+        acquired = []
+        thread = threading.Thread(target=lambda: acquired.append(budget.acquire(1, interrupt_flag)))
+        thread.start()
+        thread.join(0.1)
+        self.assertEqual(acquired, [])
+
+        budget.release(1)
+        thread.join(10)
+        self.assertEqual(acquired, [1])
+
+
+def host_load(load_per_cpu=None, available_memory_fraction=None, iowait_percent=None):
+    return resources.HostLoad(load_per_cpu, available_memory_fraction, iowait_percent)
+
+
+class TestLoadMonitor(unittest.TestCase):
+    def setUp(self):
+        self.budget = resources.ResourceBudget(8)
+        self.monitor = resources.LoadMonitor(mock.Mock(), self.budget, min_capacity=2,
+                                             max_capacity=8)
+
+    def test_starts_at_min_capacity(self):
+        self.assertEqual(self.budget.capacity, 2)
+
+    def test_ramps_up_to_max_capacity(self):
+        for _ in range(10):
+            self.monitor.adjust(host_load(0.5, 0.5, 1))
+        self.assertEqual(self.budget.capacity, 8)
+
+    def test_halves_when_overloaded(self):
+        self.budget.set_capacity(8)
+        self.monitor.adjust(host_load(load_per_cpu=2.0))
+        self.assertEqual(self.budget.capacity, 4)
+        self.monitor.adjust(host_load(available_memory_fraction=0.05))
+        self.assertEqual(self.budget.capacity, 2)
+        self.monitor.adjust(host_load(iowait_percent=50))
+        self.assertEqual(self.budget.capacity, 2)
+
+    def test_holds_between_thresholds(self):
+        self.budget.set_capacity(4)
+        self.monitor.adjust(host_load(load_per_cpu=1.2))
+        self.assertEqual(self.budget.capacity, 4)
+
+    def test_unknown_load_has_spare_resources(self):
+        self.monitor.adjust(host_load())
+        self.assertEqual(self.budget.capacity, 3)
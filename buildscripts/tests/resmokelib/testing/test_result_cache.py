@@ -0,0 +1,132 @@
+"""Unit tests for the resmokelib.testing.result_cache module."""
+
+import os
+import tempfile
+import unittest
+
+import mock
+
+from buildscripts.resmokelib.testing import report as _report
+from buildscripts.resmokelib.testing import result_cache
+
+# pylint: disable=missing-docstring,protected-access
+
+
+def _test_info(test_file, status="pass", dynamic=False):
+    return mock.Mock(test_file=test_file, status=status, dynamic=dynamic)
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.dirname = os.path.join(self.tmpdir.name, "cache")
+
+        # The tests and the files they load are resolved relative to the current working directory.
+        cwd = os.getcwd()
+        os.chdir(self.tmpdir.name)
+        self.addCleanup(os.chdir, cwd)
+
+        self._write("jstests/core/a.js", "load('jstests/libs/lib1.js');\nrun();\n")
+        self._write("jstests/libs/lib1.js", 'load("jstests/libs/lib2.js");')
+        self._write("jstests/libs/lib2.js", "load('jstests/libs/lib1.js');")
+
+    def _write(self, pathname, contents):
+        os.makedirs(os.path.dirname(pathname), exist_ok=True)
+        with open(pathname, "w") as fp:
+            fp.write(contents)
+        # Give each version of a file a different modification time.
+        stat = os.stat(pathname)
+        os.utime(pathname, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+    def _key(self, cache, test_file="jstests/core/a.js", executor_config=None):
+        suite_key = cache.make_suite_key("core", executor_config or {"fixture": {}})
+        return cache.make_test_key(suite_key, test_file)
+
+    def _record(self, cache, key, *test_infos):
+        cache.record({"jstests/core/a.js": key}, mock.Mock(test_infos=list(test_infos)))
+
+    def test_find_load_dependencies(self):
+        self.assertEqual(["jstests/libs/lib1.js", "jstests/libs/lib2.js"],
+                         result_cache.find_load_dependencies("jstests/core/a.js"))
+
+    def test_passes_are_persisted(self):
+        cache = result_cache.ResultCache(self.dirname)
+        key = self._key(cache)
+        self.assertFalse(cache.has_passed(key))
+
+        self._record(cache, key, _test_info("jstests/core/a.js"))
+        reloaded = result_cache.ResultCache(self.dirname)
+        self.assertEqual(key, self._key(reloaded))
+        self.assertTrue(reloaded.has_passed(key))
+
+    def test_last_outcome_wins(self):
+        cache = result_cache.ResultCache(self.dirname)
+        key = self._key(cache)
+        self._record(cache, key, _test_info("jstests/core/a.js"))
+        self._record(cache, key, _test_info("jstests/core/a.js", status="fail"))
+        self.assertFalse(result_cache.ResultCache(self.dirname).has_passed(key))
+
+    def test_passes_are_not_recorded_after_a_failed_dynamic_test(self):
+        cache = result_cache.ResultCache(self.dirname)
+        key = self._key(cache)
+        self._record(cache, key, _test_info("jstests/core/a.js"),
+                     _test_info("a:CheckReplDBHash", status="fail", dynamic=True))
+        self.assertFalse(cache.has_passed(key))
+
+    def test_key_depends_on_loaded_files(self):
+        cache = result_cache.ResultCache(self.dirname)
+        key = self._key(cache)
+        self._write("jstests/libs/lib2.js", "// Changed.")
+        self.assertNotEqual(key, self._key(cache))
+
+    def test_key_depends_on_suite_config(self):
+        cache = result_cache.ResultCache(self.dirname)
+        self.assertNotEqual(
+            self._key(cache), self._key(cache, executor_config={"fixture": {"num_nodes": 3}}))
+
+    def test_key_depends_on_binaries(self):
+        self._write("bin/mongod", "version 1")
+        with mock.patch.object(result_cache._config, "MONGOD_EXECUTABLE", "bin/mongod"):
+            cache = result_cache.ResultCache(self.dirname)
+            key = self._key(cache)
+            self._write("bin/mongod", "version 2")
+            self.assertNotEqual(key, self._key(cache))
+
+
+class TestFileDigests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.pathname = os.path.join(self.tmpdir.name, "mongod")
+        with open(self.pathname, "w") as fp:
+            fp.write("binary")
+
+    def test_digests_are_saved(self):
+        digests = result_cache.FileDigests(self.tmpdir.name)
+        digest = digests.get(self.pathname)
+        self.assertIsNone(digests.get(os.path.join(self.tmpdir.name, "missing")))
+        digests.save()
+
+        reloaded = result_cache.FileDigests(self.tmpdir.name)
+        with mock.patch.object(result_cache.hashlib, "sha1") as sha1_mock:
+            self.assertEqual(digest, reloaded.get(self.pathname))
+        sha1_mock.assert_not_called()
+
+
+class TestCachedReport(unittest.TestCase):
+    def test_cached_tests_are_listed_in_report(self):
+        report = _report.TestReport(mock.Mock(), mock.Mock())
+        report.add_cached("jstests/core/a.js")
+
+        report_dict = report.as_dict()
+        self.assertEqual(0, report_dict["failures"])
+        self.assertEqual("pass", report_dict["results"][0]["status"])
+        self.assertTrue(report_dict["results"][0]["cached"])
+
+        combined = _report.TestReport.combine(report)
+        self.assertEqual(1, combined.num_cached)
+        self.assertEqual(0, combined.num_succeeded)
+        self.assertTrue(combined.wasSuccessful())
+
+        self.assertEqual(1, _report.TestReport.from_dict(report_dict).num_cached)
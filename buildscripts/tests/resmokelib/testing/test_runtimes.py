@@ -0,0 +1,157 @@
+"""Unit tests for the resmokelib.testing.runtimes module."""
+
+import json
+import os
+import tempfile
+import unittest
+
+import mock
+
+from buildscripts.resmokelib.testing import runtimes
+
+# pylint: disable=missing-docstring
+
+
+class TestLoadRuntimes(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.pathname = os.path.join(self.tmpdir.name, "runtimes.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, doc):
+        with open(self.pathname, "w") as fp:
+            json.dump(doc, fp)
+
+    def test_load_mapping(self):
+        self._write({"jstests/core/a.js": 10, "jstests\\core\\b.js": 2.5})
+        self.assertEqual(
+            runtimes.load_runtimes(self.pathname), {
+                "jstests/core/a.js": 10.0,
+                "jstests/core/b.js": 2.5,
+            })
+
+    def test_load_test_runtime_pairs(self):
+        self._write([["jstests/core/a.js", 10], ["jstests/core/b.js", 3]])
+        self.assertEqual(
+            runtimes.load_runtimes(self.pathname), {
+                "jstests/core/a.js": 10.0,
+                "jstests/core/b.js": 3.0,
+            })
+
+    def test_load_report_averages_and_skips_hooks(self):
+        self._write({
+            "failures": 0,
+            "results": [
+                {"test_file": "jstests/core/a.js", "elapsed": 4},
+                {"test_file": "jstests/core/a.js", "elapsed": 6},
+                {"test_file": "a:CheckReplDBHash", "elapsed": 100},
+            ],
+        })
+        self.assertEqual(runtimes.load_runtimes(self.pathname), {"jstests/core/a.js": 5.0})
+
+
+class TestOrderLongestFirst(unittest.TestCase):
+    def test_orders_by_decreasing_runtime(self):
+        tests = ["a.js", "b.js", "c.js"]
+        ordered = runtimes.order_longest_first(tests, {"a.js": 1, "b.js": 30, "c.js": 5})
+        self.assertEqual(ordered, ["b.js", "c.js", "a.js"])
+
+    def test_unknown_tests_use_average_runtime(self):
+        tests = ["a.js", "b.js", "unknown.js"]
+        ordered = runtimes.order_longest_first(tests, {"a.js": 1, "b.js": 9})
+        self.assertEqual(ordered, ["b.js", "unknown.js", "a.js"])
+
+    def test_no_known_runtimes_keeps_order(self):
+        tests = ["c.js", "a.js", "b.js"]
+        self.assertEqual(runtimes.order_longest_first(tests, {}), tests)
+
+
+def _test_info(test_file, elapsed, status="pass", dynamic=False):
+    return mock.Mock(test_file=test_file, start_time=100.0, end_time=100.0 + elapsed, status=status,
+                     dynamic=dynamic)
+
+
+class TestRuntimeHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dirname = os.path.join(self.tmpdir.name, "history")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _record(self, history, *test_infos):
+        report = mock.Mock(test_infos=list(test_infos))
+        history.record("core", "MongoDFixture", report)
+
+    def test_empty_history(self):
+        history = runtimes.RuntimeHistory(self.dirname)
+        self.assertIsNone(history.get_stats("core", "a.js"))
+        self.assertEqual(history.get_runtimes("core"), {})
+
+    def test_records_are_persisted(self):
+        history = runtimes.RuntimeHistory(self.dirname)
+        self._record(history, _test_info("a.js", 2), _test_info("b.js", 4))
+
+        reloaded = runtimes.RuntimeHistory(self.dirname)
+        self.assertEqual(reloaded.get_runtimes("core"), {"a.js": 2.0, "b.js": 4.0})
+        self.assertEqual(reloaded.get_runtimes("core", "MongoDFixture"), {"a.js": 2.0, "b.js": 4.0})
+        self.assertEqual(reloaded.get_runtimes("core", "ReplicaSetFixture"), {})
+        self.assertEqual(reloaded.get_runtimes("other_suite"), {})
+
+    def test_failed_and_dynamic_tests_are_ignored(self):
+        history = runtimes.RuntimeHistory(self.dirname)
+        self._record(history, _test_info("a.js", 2, status="fail"),
+                     _test_info("job0_fixture_setup_0", 30, dynamic=True))
+        self.assertEqual(runtimes.RuntimeHistory(self.dirname).get_runtimes("core"), {})
+
+    def test_rolling_mean_and_p95(self):
+        history = runtimes.RuntimeHistory(self.dirname, window=20)
+        for elapsed in range(1, 26):
+            self._record(history, _test_info("a.js", elapsed))
+
+        stats = runtimes.RuntimeHistory(self.dirname, window=20).get_stats("core", "a.js")
+        # Only the last 20 runtimes (6 through 25) are kept.
+        self.assertEqual(stats.num_run, 20)
+        self.assertEqual(stats.mean, 15.5)
+        self.assertEqual(stats.p95, 24)
+
+    def test_compact(self):
+        history = runtimes.RuntimeHistory(self.dirname, window=2)
+        for elapsed in range(1, 6):
+            self._record(history, _test_info("a.js", elapsed))
+        self.assertTrue(history.needs_compaction())
+
+        history.compact()
+        self.assertFalse(history.needs_compaction())
+        with open(history.pathname) as fp:
+            self.assertEqual(len(fp.readlines()), 2)
+        self.assertEqual(runtimes.RuntimeHistory(self.dirname).get_runtimes("core"), {"a.js": 4.5})
+
+    def test_as_test_stats(self):
+        history = runtimes.RuntimeHistory(self.dirname)
+        self._record(history, _test_info("a.js", 2), _test_info("a.js", 4))
+        self.assertEqual(
+            history.as_test_stats("core"),
+            [runtimes.HistoricTestStats(test_file="a.js", avg_duration_pass=3.0, num_pass=2)])
+
+
+class TestGetRuntimeHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        patcher = mock.patch.object(runtimes, "_RUNTIME_HISTORY", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_history_is_shared(self):
+        history = runtimes.get_runtime_history(self.tmpdir.name)
+        self.assertIs(history, runtimes.get_runtime_history(self.tmpdir.name))
+
+    def test_new_history_for_other_dir(self):
+        history = runtimes.get_runtime_history(self.tmpdir.name)
+        other = runtimes.get_runtime_history(os.path.join(self.tmpdir.name, "other"))
+        self.assertIsNot(history, other)
+        self.assertEqual(other.pathname,
+                         os.path.join(self.tmpdir.name, "other", runtimes.RuntimeHistory.FILENAME))
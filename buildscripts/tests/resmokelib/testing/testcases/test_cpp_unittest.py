@@ -0,0 +1,35 @@
+"""Unit tests for the buildscripts.resmokelib.testing.testcases.cpp_unittest module."""
+import logging
+import unittest
+
+from buildscripts.resmokelib.testing.testcases import cpp_unittest
+from buildscripts.util import testname
+
+# pylint: disable=missing-docstring,protected-access
+
+
+class TestCPPUnitTestCase(unittest.TestCase):
+    def test__make_process(self):
+        logger = logging.getLogger("cpp_unit_test")
+        test_case = cpp_unittest.CPPUnitTestCase(logger, "build/db_unittest")
+        self.assertEqual(test_case.test_name, "build/db_unittest")
+        self.assertEqual(test_case._make_process().args, ["build/db_unittest"])
+
+    def test__make_process_suites(self):
+        logger = logging.getLogger("cpp_unit_test")
+        test_case = cpp_unittest.CPPUnitTestCase(logger, ["build/db_unittest", "SuiteA", "SuiteC"])
+        self.assertEqual(test_case.test_name, "build/db_unittest[SuiteA,SuiteC]")
+        self.assertEqual(test_case.short_name(), "db_unittest[SuiteA,SuiteC]")
+        self.assertEqual(test_case._make_process().args,
+                         ["build/db_unittest", "--suite", "SuiteA", "--suite", "SuiteC"])
+
+    def test_suites_are_not_a_hook(self):
+        logger = logging.getLogger("cpp_unit_test")
+        test_case = cpp_unittest.CPPUnitTestCase(logger, ["build/db_unittest", "SuiteA", "SuiteC"])
+        self.assertFalse(testname.is_resmoke_hook(test_case.test_name))
+        self.assertFalse(testname.is_resmoke_hook(test_case.short_name()))
+
+    def test_short_name_windows_executable(self):
+        logger = logging.getLogger("cpp_unit_test")
+        test_case = cpp_unittest.CPPUnitTestCase(logger, ["build/db_unittest.exe", "SuiteA"])
+        self.assertEqual(test_case.short_name(), "db_unittest[SuiteA]")
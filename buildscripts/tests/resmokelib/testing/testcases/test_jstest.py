@@ -0,0 +1,111 @@
+"""Unit tests for the buildscripts.resmokelib.testing.testcases.jstest module."""
+import logging
+import unittest
+
+import mock
+
+from buildscripts.resmokelib import config
+from buildscripts.resmokelib.testing.testcases import jstest
+
+# pylint: disable=missing-docstring,protected-access
+
+
+class _TestLogger(logging.Logger):
+    def new_test_thread_logger(self, test_kind, thread_id):
+        return _TestLogger("%s:%s" % (test_kind, thread_id))
+
+
+def _make_test_case(num_clients):
+    logger = _TestLogger("js_test")
+    shell_options = {"global_vars": {"TestData": {"someOption": True}}}
+    test_case = jstest.JSTestCase(logger, "jstests/core/find.js", shell_executable="mongo",
+                                  shell_options=shell_options)
+
+    # Configure the test case without calling configure_shell(), which creates the data directory.
+    fixture = mock.Mock()
+    fixture.get_driver_connection_url.return_value = "mongodb://localhost:20000"
+    test_case.fixture = fixture
+    test_case.num_clients = num_clients
+    test_case.test_case_template.fixture = fixture
+    return test_case
+
+
+def _make_client_process(return_code):
+    process = mock.Mock()
+    process.wait.return_value = return_code
+    process.as_command.return_value = "mongo jstests/core/find.js"
+    return (_TestLogger("js_test"), process)
+
+
+class TestJSTestCaseSupervisor(unittest.TestCase):
+    def setUp(self):
+        self._stagger_ms = config.CLIENT_STARTUP_STAGGER_MS
+        config.CLIENT_STARTUP_STAGGER_MS = 50
+
+    def tearDown(self):
+        config.CLIENT_STARTUP_STAGGER_MS = self._stagger_ms
+
+    def test_make_client_processes(self):
+        test_case = _make_test_case(num_clients=3)
+        client_processes = test_case._make_client_processes()
+        self.assertEqual(3, len(client_processes))
+
+        eval_strs = []
+        for (client_id, (logger, process)) in enumerate(client_processes):
+            self.assertEqual("JSTest:%d" % (client_id), logger.name)
+            self.assertIs(logger, process.logger)
+            self.assertEqual("jstests/core/find.js", process.args[-1])
+            eval_strs.append(process.args[process.args.index("--eval") + 1])
+
+        self.assertIn('TestData["isMainTest"] = true', eval_strs[0])
+        self.assertIn('TestData["numTestClients"] = 3', eval_strs[0])
+        self.assertIn('TestData["someOption"] = true', eval_strs[0])
+        for eval_str in eval_strs[1:]:
+            self.assertEqual(eval_strs[0].replace("isMainTest\"] = true", "isMainTest\"] = false"),
+                             eval_str)
+
+    def test_run_supervised_copies(self):
+        test_case = _make_test_case(num_clients=3)
+        client_processes = [_make_client_process(0) for _ in range(3)]
+
+        with mock.patch.object(test_case, "_make_client_processes") as mock_make, \
+             mock.patch.object(jstest.time, "sleep") as mock_sleep:
+            mock_make.return_value = client_processes
+            test_case._run_supervised_copies()
+
+        self.assertEqual(0, test_case.return_code)
+        self.assertEqual([mock.call(0.05), mock.call(0.05)], mock_sleep.call_args_list)
+        for (_, process) in client_processes:
+            process.start.assert_called_once_with()
+            process.wait.assert_called_once_with()
+
+    def test_run_supervised_copies_failure(self):
+        test_case = _make_test_case(num_clients=3)
+        client_processes = [_make_client_process(code) for code in (0, -9, 1)]
+
+        with mock.patch.object(test_case, "_make_client_processes") as mock_make, \
+             mock.patch.object(jstest.time, "sleep"):
+            mock_make.return_value = client_processes
+            with self.assertRaises(test_case.failureException):
+                test_case._run_supervised_copies()
+
+        # All of the clients are waited on and the first nonzero return code is reported.
+        self.assertEqual(-9, test_case.return_code)
+        for (_, process) in client_processes:
+            process.wait.assert_called_once_with()
+
+    def test_run_supervised_copies_start_error(self):
+        test_case = _make_test_case(num_clients=3)
+        client_processes = [_make_client_process(0) for _ in range(3)]
+        client_processes[1][1].start.side_effect = OSError("fork failed")
+
+        with mock.patch.object(test_case, "_make_client_processes") as mock_make, \
+             mock.patch.object(jstest.time, "sleep"):
+            mock_make.return_value = client_processes
+            with self.assertRaises(OSError):
+                test_case._run_supervised_copies()
+
+        # The clients which were already started are stopped and waited on.
+        client_processes[0][1].stop.assert_called_once_with()
+        client_processes[0][1].wait.assert_called_once_with()
+        client_processes[2][1].start.assert_not_called()
@@ -0,0 +1,38 @@
+"""Unit tests for buildscripts/resmokelib/utils/backoff.py."""
+
+import unittest
+
+import mock
+
+from buildscripts.resmokelib.utils import backoff as _backoff
+
+# pylint: disable=missing-docstring
+
+
+class TestBackoff(unittest.TestCase):
+    def test_intervals_grow_until_max(self):
+        backoff = _backoff.Backoff(initial_secs=0.1, max_secs=0.5, multiplier=2)
+        bounds = [0.1, 0.2, 0.4, 0.5, 0.5]
+        for bound in bounds:
+            interval = backoff.next_interval()
+            self.assertGreaterEqual(interval, bound / 2)
+            self.assertLessEqual(interval, bound)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            _backoff.Backoff(initial_secs=0)
+        with self.assertRaises(ValueError):
+            _backoff.Backoff(initial_secs=2, max_secs=1)
+        with self.assertRaises(ValueError):
+            _backoff.Backoff(multiplier=0.5)
+
+    @mock.patch("buildscripts.resmokelib.utils.backoff.time")
+    def test_sleep_does_not_pass_deadline(self, time_mock):
+        time_mock.time.return_value = 100.0
+        backoff = _backoff.Backoff(initial_secs=1, max_secs=1)
+        backoff.sleep(deadline=100.25)
+        (interval, ), _ = time_mock.sleep.call_args
+        self.assertLessEqual(interval, 0.25)
+
+        backoff.sleep(deadline=99)
+        time_mock.sleep.assert_called_with(0.0)
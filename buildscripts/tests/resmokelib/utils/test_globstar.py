@@ -0,0 +1,116 @@
+"""Unit tests for the resmokelib.utils.globstar module."""
+
+import glob
+import os
+import tempfile
+import unittest
+
+import mock
+
+from buildscripts.resmokelib.utils import globstar
+
+# pylint: disable=missing-docstring,protected-access
+
+FILES = [
+    "a.js",
+    "jstests/core/a.js",
+    "jstests/core/b.txt",
+    "jstests/core/.hidden.js",
+    "jstests/core/txns/c.js",
+    "jstests/core/txns/deep/d.js",
+    "jstests/noPassthrough/e.js",
+    "jstests/.hidden/f.js",
+]
+
+PATTERNS = [
+    "**",
+    "**/*.js",
+    "*.js",
+    "jstests/**",
+    "jstests/**/*.js",
+    "jstests/core/**/*.js",
+    "jstests/core/*.js",
+    "jstests/core/.*.js",
+    "jstests/*/[a-c].js",
+    "jstests/*/[!a].js",
+    "jstests/core/?.js",
+    "jstests/**/deep/*.js",
+    "jstests/**/",
+    "./jstests/core/*.js",
+    "jstests/core/a.js",
+    "jstests/missing/*.js",
+]
+
+
+class TestGlobstar(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+
+        cwd = os.getcwd()
+        self.addCleanup(os.chdir, cwd)
+        os.chdir(tmpdir.name)
+
+        for pathname in FILES:
+            pathname = os.path.normpath(pathname)
+            os.makedirs(os.path.dirname(pathname) or os.curdir, exist_ok=True)
+            with open(pathname, "w"):
+                pass
+
+    @staticmethod
+    def _files(pathnames):
+        return sorted(pathname for pathname in pathnames if os.path.isfile(pathname))
+
+    def test_iglob(self):
+        self.assertEqual(
+            sorted(os.path.normpath(pathname) for pathname in glob.glob("jstests/*/*.js")),
+            sorted(globstar.iglob("jstests/*/*.js")))
+        self.assertEqual([
+            os.path.normpath("jstests/core/a.js"),
+            os.path.normpath("jstests/core/txns/c.js"),
+            os.path.normpath("jstests/core/txns/deep/d.js"),
+        ], sorted(globstar.iglob("jstests/core/**/*.js")))
+
+    def test_cached_iglob_matches_iglob(self):
+        dir_cache = globstar.DirectoryCache()
+        for pattern in PATTERNS:
+            self.assertEqual(
+                sorted(globstar.iglob(pattern)), sorted(globstar.iglob(pattern, dir_cache)),
+                msg=pattern)
+
+    def test_directories_are_scanned_once(self):
+        dir_cache = globstar.DirectoryCache()
+        with mock.patch.object(globstar.os, "scandir", wraps=os.scandir) as mock_scandir:
+            first = globstar.glob("jstests/**/*.js", dir_cache)
+            scans = mock_scandir.call_count
+            second = globstar.glob("jstests/core/**/*.js", dir_cache)
+            self.assertEqual(scans, mock_scandir.call_count)
+        self.assertTrue(set(second) < set(first))
+
+        dir_cache.clear()
+        with mock.patch.object(globstar.os, "scandir", wraps=os.scandir) as mock_scandir:
+            globstar.glob("jstests/core/*.js", dir_cache)
+        self.assertEqual(1, mock_scandir.call_count)
+
+    def test_translate_matches_iglob(self):
+        all_files = self._files(globstar.iglob("**"))
+        for pattern in PATTERNS:
+            regex = globstar.compile_patterns([pattern])
+            self.assertEqual(
+                self._files(globstar.iglob(pattern)),
+                [pathname for pathname in all_files if regex.match(pathname)], msg=pattern)
+
+    def test_compile_patterns(self):
+        regex = globstar.compile_patterns(["jstests/core/txns/**/*.js", "jstests/*/e.js"])
+        self.assertTrue(regex.match(os.path.normpath("jstests/core/txns/deep/d.js")))
+        self.assertTrue(regex.match(os.path.normpath("jstests/noPassthrough/e.js")))
+        self.assertFalse(regex.match(os.path.normpath("jstests/core/a.js")))
+
+        regex = globstar.compile_patterns([])
+        self.assertFalse(regex.match("a.js"))
+        self.assertFalse(regex.match(""))
+
+    def test_unclosed_character_set(self):
+        regex = globstar.compile_patterns(["jstests/[core/*.js"])
+        self.assertTrue(regex.match(os.path.normpath("jstests/[core/a.js")))
+        self.assertFalse(regex.match(os.path.normpath("jstests/core/a.js")))
@@ -0,0 +1,88 @@
+"""Unit tests for the resmokelib.utils.tagindex module."""
+
+import os
+import tempfile
+import unittest
+
+import mock
+
+from buildscripts.resmokelib.utils import jscomment
+from buildscripts.resmokelib.utils import tagindex
+
+# pylint: disable=missing-docstring,protected-access
+
+
+class TestTagIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.test_file = os.path.join(self.tmpdir.name, "jstests", "core", "a.js")
+        self.index_file = os.path.join(self.tmpdir.name, "index", "tag_index.json")
+        self._write("/**\n * @tags: [requires_fcv_44,\n *   uses_transactions]\n */\n")
+
+    def _write(self, contents):
+        os.makedirs(os.path.dirname(self.test_file), exist_ok=True)
+        with open(self.test_file, "w") as fp:
+            fp.write(contents)
+        # Give each version of the file a different modification time.
+        stat = os.stat(self.test_file)
+        os.utime(self.test_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+    def test_tags_are_parsed_once(self):
+        index = tagindex.TagIndex()
+        with mock.patch.object(tagindex.jscomment, "get_tags",
+                               wraps=jscomment.get_tags) as mock_get_tags:
+            self.assertEqual(["requires_fcv_44", "uses_transactions"],
+                             index.get_tags(self.test_file))
+            self.assertEqual(["requires_fcv_44", "uses_transactions"],
+                             index.get_tags(self.test_file))
+        self.assertEqual(1, mock_get_tags.call_count)
+
+    def test_changed_files_are_parsed_again(self):
+        index = tagindex.TagIndex()
+        index.get_tags(self.test_file)
+        self._write("// @tags: [requires_sharding]\n")
+        self.assertEqual(["requires_sharding"], index.get_tags(self.test_file))
+
+    def test_index_is_persisted(self):
+        index = tagindex.TagIndex(self.index_file)
+        index.get_tags(self.test_file)
+        index.save()
+
+        reloaded = tagindex.TagIndex(self.index_file)
+        with mock.patch.object(tagindex.jscomment, "get_tags") as mock_get_tags:
+            self.assertEqual(["requires_fcv_44", "uses_transactions"],
+                             reloaded.get_tags(self.test_file))
+        mock_get_tags.assert_not_called()
+
+    def test_index_from_another_version_is_ignored(self):
+        index = tagindex.TagIndex(self.index_file)
+        index.get_tags(self.test_file)
+        index.save()
+
+        with mock.patch.object(tagindex.TagIndex, "VERSION", tagindex.TagIndex.VERSION + 1):
+            reloaded = tagindex.TagIndex(self.index_file)
+        self.assertEqual({}, reloaded._entries)
+
+    def test_unchanged_index_isnt_written(self):
+        index = tagindex.TagIndex(self.index_file)
+        index.save()
+        self.assertFalse(os.path.exists(self.index_file))
+
+    def test_shared_index(self):
+        self.assertIs(tagindex.get_tag_index(), tagindex.get_tag_index())
+        self.assertEqual(self.index_file, tagindex.get_tag_index(self.index_file).pathname)
+
+
+class TestGetTags(unittest.TestCase):
+    def test_last_definition_is_used(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".js") as fp:
+            fp.write("// @tags: [first]\nfunction f() {}\n// @tags: [\n//   second\n// ]\n")
+            fp.flush()
+            self.assertEqual(["second"], jscomment.get_tags(fp.name))
+
+    def test_no_tags(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".js") as fp:
+            fp.write("// No tags.\n")
+            fp.flush()
+            self.assertEqual([], jscomment.get_tags(fp.name))
@@ -800,6 +800,7 @@ class GenerateSubSuitesTest(unittest.TestCase):
         options.target_resmoke_time = 10
         options.fallback_num_sub_suites = 2
         options.max_tests_per_suite = None
+        options.runtime_history_dir = None
         return options
 
     @staticmethod
@@ -828,6 +829,28 @@ class GenerateSubSuitesTest(unittest.TestCase):
             for suite in suites:
                 self.assertEqual(10, len(suite.tests))
 
+    def test_calculate_suites_from_runtime_history(self):
+        evg = MagicMock()
+        config_options = self.get_mock_options()
+        config_options.max_sub_suites = 1000
+        config_options.selected_tests_to_run = None
+        config_options.runtime_history_dir = "history_dir"
+
+        gen_sub_suites = under_test.GenerateSubSuites(evg, config_options)
+
+        with patch("os.path.exists") as exists_mock, patch(ns("suitesconfig")) as suitesconfig_mock,\
+                patch(ns("runtimes.RuntimeHistory")) as history_mock:
+            exists_mock.return_value = True
+            history_mock.return_value.as_test_stats.return_value = [
+                tst_stat_mock(f"test{i}.js", 60, 1) for i in range(100)
+            ]
+            suitesconfig_mock.get_suite.return_value.tests = self.get_test_list(100)
+            suites = gen_sub_suites.calculate_suites(_DATE, _DATE)
+
+            history_mock.assert_called_once_with("history_dir")
+            evg.test_stats_by_project.assert_not_called()
+            self.assertEqual(10, len(suites))
+
     def test_calculate_suites_fallback(self):
         n_tests = 100
         evg = mock_test_stats_unavailable(MagicMock())
@@ -0,0 +1,60 @@
+"""Unit tests for buildscripts/resmoke.py."""
+
+import json
+import os
+import tempfile
+import unittest
+
+import mock
+
+from buildscripts import resmoke
+from buildscripts.resmokelib import config
+from buildscripts.resmokelib import reportfile
+
+# pylint: disable=missing-docstring,protected-access
+
+
+class TestRerunFailedFromStream(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        report_file = os.path.join(self.tmpdir.name, "report.json")
+        self.stream_file = reportfile.get_stream_pathname(report_file)
+
+        for (name, value) in [("REPORT_FILE", report_file),
+                              ("RERUN_FAILED_FROM", self.stream_file),
+                              ("EVERGREEN_TASK_ID", None), ("SPAWN_USING", None)]:
+            patcher = mock.patch.object(config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(reportfile.close_stream)
+
+        # The stream file left by an earlier invocation of resmoke.py which was killed.
+        with open(self.stream_file, "w") as fp:
+            for (test_file, status) in [("jstests/core/a.js", "fail"), ("jstests/core/b.js",
+                                                                          "pass")]:
+                fp.write(json.dumps({
+                    "test_id": test_file, "test_file": test_file, "status": status,
+                    "exit_code": 0, "start": 0, "end": 1
+                }) + "\n")
+
+    def test_failed_tests_are_loaded_before_the_stream_is_truncated(self):
+        instance = resmoke.Resmoke()
+        instance._resmoke_logger = mock.Mock()
+        suite = mock.Mock(return_code=0)
+        suite.options.fail_fast = False
+
+        with mock.patch.multiple(instance, _get_suites=mock.Mock(return_value=[suite]),
+                                 _setup_archival=mock.DEFAULT, _exit_archival=mock.DEFAULT,
+                                 _setup_fixture_pool=mock.DEFAULT,
+                                 _exit_fixture_pool=mock.DEFAULT,
+                                 _setup_signal_handler=mock.DEFAULT,
+                                 _log_resmoke_summary=mock.DEFAULT, exit=mock.DEFAULT,
+                                 _run_suite=mock.Mock(return_value=False)), \
+                mock.patch.object(reportfile, "write"):
+            instance.run_tests()
+
+        self.assertEqual({"jstests/core/a.js"}, instance._failed_tests)
+        # The stream file is reused for the results of this invocation.
+        with open(self.stream_file, "r") as fp:
+            self.assertEqual("", fp.read())